@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     bench_command.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Benchmark of command creation and writing
+
+Measures commands per second processed by
+- functions of characteristics writing to DummyCube (write)
+  with a varying speed (control loop) and with repeated commands
+- bytes() of commands (serialize), and CommandCache lookups
+  with varying and repeated arguments (cache)
+
+Usage:
+    python benchmarks/bench_command.py
+    python benchmarks/bench_command.py --save benchmarks/baseline_command.json
+    python benchmarks/bench_command.py --compare benchmarks/baseline_command.json
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_notification import main  # noqa: E402
+
+from toio.cube.api.base_class import CommandCache  # noqa: E402
+from toio.cube.api.indicator import Indicator  # noqa: E402
+from toio.cube.api.motor import (  # noqa: E402
+    Motor,
+    MotorControl,
+    MotorControlMultipleTargets,
+    MovementType,
+    Speed,
+    TargetPosition,
+    WriteMode,
+)
+from toio.cube.api.sound import MidiNote, Note, PlayMidi, Sound  # noqa: E402
+from toio.device_interface.dummy import DummyCube  # noqa: E402
+
+MULTIPLE_TARGETS = MotorControlMultipleTargets(
+    5,
+    MovementType.Linear,
+    Speed.from_int(80),
+    WriteMode.Overwrite,
+    [TargetPosition.from_int(i, i, i) for i in range(29)],
+)
+MIDI = PlayMidi(1, [MidiNote(100, Note.C5, 255) for _ in range(59)])
+
+
+def varying_speed(n: int) -> Tuple[int, int]:
+    """
+    Speeds of a control loop (201 x 201 combinations, which do not fit in the cache)
+    """
+    return n % 201 - 100, n // 201 % 201 - 100
+
+
+async def bench_write(name: str, number: int) -> float:
+    """
+    Returns written commands per second
+    """
+    motor = Motor(DummyCube(), None)
+    indicator = Indicator(DummyCube(), None)
+    sound = Sound(DummyCube(), None)
+    start = time.perf_counter()
+    if name == "motor_control:varying":
+        for n in range(number):
+            await motor.motor_control(*varying_speed(n))
+    elif name == "motor_control:stop":
+        for _ in range(number):
+            await motor.motor_control(0, 0)
+    elif name == "indicator.turn_off_all":
+        for _ in range(number):
+            await indicator.turn_off_all()
+    elif name == "sound.stop":
+        for _ in range(number):
+            await sound.stop()
+    else:
+        raise ValueError(name)
+    elapsed = time.perf_counter() - start
+    return number / elapsed
+
+
+def bench_serialize(factory: Callable[[int], bytes], number: int) -> float:
+    """
+    Returns serialized commands per second
+    """
+    start = time.perf_counter()
+    for n in range(number):
+        factory(n)
+    elapsed = time.perf_counter() - start
+    return number / elapsed
+
+
+CACHE = CommandCache()
+
+SERIALIZERS: Dict[str, Callable[[int], bytes]] = {
+    "serialize:motor_control:varying": lambda n: bytes(
+        MotorControl(*varying_speed(n), None)
+    ),
+    "cache:motor_control:varying": lambda n: bytes(
+        CACHE.get(MotorControl, *varying_speed(n), None)
+    ),
+    "cache:motor_control:stop": lambda n: bytes(CACHE.get(MotorControl, 0, 0, None)),
+    "serialize:multiple_targets:29": lambda n: bytes(MULTIPLE_TARGETS),
+    "serialize:play_midi:59": lambda n: bytes(MIDI),
+}
+
+WRITES = (
+    "motor_control:varying",
+    "motor_control:stop",
+    "indicator.turn_off_all",
+    "sound.stop",
+)
+
+
+def run(number: int, repeat: int) -> Dict[str, float]:
+    """
+    Returns the best result of each benchmark in 'repeat' times
+    """
+    results: Dict[str, float] = {}
+    for name in WRITES:
+        results["write:" + name] = max(
+            asyncio.run(bench_write(name, number)) for _ in range(repeat)
+        )
+    for name, factory in SERIALIZERS.items():
+        results[name] = max(bench_serialize(factory, number) for _ in range(repeat))
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main(run, __doc__, "commands/s"))
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     bench_notification.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Benchmark of notification decoding and dispatching
+
+Measures notifications per second processed by
+- is_my_data() of each characteristic (decode)
+- CubeCharacteristic._root_notification_handler() (dispatch)
+  with sync / async handlers (with / without NotificationHandlerInfo)
+  and 1 / 10 / 100 registered handlers
+
+Usage:
+    python benchmarks/bench_notification.py
+    python benchmarks/bench_notification.py --save benchmarks/baseline.json
+    python benchmarks/bench_notification.py --compare benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import struct
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from toio.cube.api.base_class import CubeCharacteristic  # noqa: E402
+from toio.cube.api.battery import Battery  # noqa: E402
+from toio.cube.api.button import Button  # noqa: E402
+from toio.cube.api.id_information import IdInformation, PositionId  # noqa: E402
+from toio.cube.api.motor import Motor  # noqa: E402
+from toio.cube.api.sensor import Sensor  # noqa: E402
+from toio.cube.notification_handler_info import NotificationHandlerInfo  # noqa: E402
+from toio.device_interface.dummy import DummyCube  # noqa: E402
+
+POSITION_ID = bytearray(struct.pack("<BHHHHHH", 0x01, 100, 200, 90, 101, 201, 91))
+
+DECODE_PAYLOADS: Dict[str, Tuple[Callable, bytearray]] = {
+    "id_information.position_id": (IdInformation.is_my_data, POSITION_ID),
+    "id_information.position_id_raw": (PositionId.unpack, POSITION_ID),
+    "id_information.standard_id": (
+        IdInformation.is_my_data,
+        bytearray(struct.pack("<BLH", 0x02, 3670016, 0)),
+    ),
+    "id_information.position_id_missed": (
+        IdInformation.is_my_data,
+        bytearray((0x03,)),
+    ),
+    "sensor.motion": (
+        Sensor.is_my_data,
+        bytearray((0x01, 0x01, 0x00, 0x00, 0x01, 0x00)),
+    ),
+    "sensor.posture_euler": (
+        Sensor.is_my_data,
+        bytearray(struct.pack("<BBhhh", 0x03, 0x01, 0, 0, 90)),
+    ),
+    "sensor.posture_quaternions": (
+        Sensor.is_my_data,
+        bytearray(struct.pack("<BBffff", 0x03, 0x02, 1.0, 0.0, 0.0, 0.0)),
+    ),
+    "sensor.magnetic": (
+        Sensor.is_my_data,
+        bytearray(struct.pack("<BBBbbb", 0x02, 0x01, 0x10, 1, 2, 3)),
+    ),
+    "motor.response_target": (Motor.is_my_data, bytearray((0x83, 0x00, 0x00))),
+    "motor.speed": (Motor.is_my_data, bytearray((0xE0, 0x32, 0x32))),
+    "button": (Button.is_my_data, bytearray((0x01, 0x80))),
+    "battery": (Battery.is_my_data, bytearray((80,))),
+}
+
+NUM_OF_HANDLERS = (1, 10, 100)
+HANDLER_KINDS = ("sync", "async", "sync_info", "async_info")
+
+
+def bench_decode(decoder: Callable, payload: bytearray, number: int) -> float:
+    """
+    Returns decoded notifications per second
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        decoder(payload)
+    elapsed = time.perf_counter() - start
+    return number / elapsed
+
+
+def _make_sync_handler(counter: List[int]):
+    def handler(payload: bytearray):
+        counter[0] += 1
+
+    return handler
+
+
+def _make_async_handler(counter: List[int]):
+    async def handler(payload: bytearray):
+        counter[0] += 1
+
+    return handler
+
+
+def _make_sync_handler_with_info(counter: List[int]):
+    def handler(payload: bytearray, info: NotificationHandlerInfo):
+        counter[0] += 1
+
+    return handler
+
+
+def _make_async_handler_with_info(counter: List[int]):
+    async def handler(payload: bytearray, info: NotificationHandlerInfo):
+        counter[0] += 1
+
+    return handler
+
+
+HANDLER_FACTORIES = {
+    "sync": _make_sync_handler,
+    "async": _make_async_handler,
+    "sync_info": _make_sync_handler_with_info,
+    "async_info": _make_async_handler_with_info,
+}
+
+
+async def bench_dispatch(kind: str, num_of_handlers: int, number: int) -> float:
+    """
+    Returns dispatched notifications per second
+    """
+    characteristic: CubeCharacteristic = IdInformation(DummyCube(), None)
+    counter = [0]
+    for _ in range(num_of_handlers):
+        handler = HANDLER_FACTORIES[kind](counter)
+        await characteristic.register_notification_handler(handler)
+
+    root_handler = characteristic._root_notification_handler
+    start = time.perf_counter()
+    for _ in range(number):
+        await root_handler(None, POSITION_ID)  # type: ignore
+    elapsed = time.perf_counter() - start
+    assert counter[0] == number * num_of_handlers
+    return number / elapsed
+
+
+def run(number: int, repeat: int) -> Dict[str, float]:
+    """
+    Returns the best result of each benchmark in 'repeat' times
+    """
+    results: Dict[str, float] = {}
+    for name, (decoder, payload) in DECODE_PAYLOADS.items():
+        results["decode:" + name] = max(
+            bench_decode(decoder, payload, number) for _ in range(repeat)
+        )
+    for kind in HANDLER_KINDS:
+        for num_of_handlers in NUM_OF_HANDLERS:
+            name = "dispatch:%s:%d" % (kind, num_of_handlers)
+            results[name] = max(
+                asyncio.run(
+                    bench_dispatch(kind, num_of_handlers, number // num_of_handlers)
+                )
+                for _ in range(repeat)
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], tolerance: float, unit: str
+) -> int:
+    """
+    Prints the results compared with the baseline
+
+    Results without baseline and baseline entries without results are reported,
+    so that they are not skipped silently.
+
+    Returns the number of regressions
+    """
+    regressions = 0
+    print("%-42s %14s %14s" % ("benchmark", unit, "baseline"))
+    for name, value in results.items():
+        line = "%-42s %14.0f" % (name, value)
+        if name in baseline:
+            ratio = value / baseline[name]
+            line += " %14.0f (%+.0f%%)" % (baseline[name], (ratio - 1) * 100)
+            if ratio < 1 - tolerance:
+                line += " REGRESSION"
+                regressions += 1
+        elif baseline:
+            line += " %14s" % "NO BASELINE"
+        print(line)
+    for name in baseline:
+        if name not in results:
+            print("%-42s %14s %14.0f" % (name, "NOT MEASURED", baseline[name]))
+    return regressions
+
+
+def save(path: str, results: Dict[str, float], number: int, repeat: int) -> None:
+    """
+    Saves the results to a JSON file
+    """
+    with open(path, "w") as wf:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "number": number,
+                "repeat": repeat,
+                "results": {k: round(v) for k, v in results.items()},
+            },
+            wf,
+            indent=2,
+        )
+        wf.write("\n")
+
+
+def main(
+    run_benchmarks: Callable[[int, int], Dict[str, float]] = run,
+    description: str = __doc__,
+    unit: str = "notifications/s",
+) -> int:
+    parser = argparse.ArgumentParser(description=description.split("\n")[1])
+    parser.add_argument("--number", type=int, default=100000, help="iterations")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions")
+    parser.add_argument("--save", help="save the results to a JSON file")
+    parser.add_argument("--compare", help="compare the results with a JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed slowdown ratio to the compared results (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.number, args.repeat)
+
+    baseline: Dict[str, float] = {}
+    if args.compare:
+        with open(args.compare, "r") as rf:
+            baseline = json.load(rf)["results"]
+
+    regressions = compare(results, baseline, args.tolerance, unit)
+
+    if args.save:
+        save(args.save, results, args.number, args.repeat)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,9 @@ autodoc_default_options = {
     "undoc-members": True,
 }
 
+# NumPy is optional (required only by toio.decode) and is not installed with toio.py
+autodoc_mock_imports = ["numpy"]
+
 templates_path = ["_templates"]
 exclude_patterns = ["_build", "Thumbs.db", ".DS_Store"]
 
@@ -63,4 +66,3 @@ autosummary_generate = True
 
 smv_tag_whitelist = r"^api_\d+\.\d+\.(\d+|\d(a|b|rc)*\d+|\d+\.post\d+)$"
 smv_branch_whitelist = "__DOCUMENT_FOR_BRANCH_IS_NOT_GENERATED__"
-
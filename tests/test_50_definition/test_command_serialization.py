@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_command_serialization.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from toio.cube.api.indicator import IndicatorParam, RepeatedTurningOnAndOff
+from toio.cube.api.motor import (
+    MotorControlMultipleTargets,
+    MovementType,
+    Speed,
+    TargetPosition,
+    WriteMode,
+)
+from toio.cube.api.sound import MidiNote, Note, PlayMidi
+
+
+def test_motor_control_multiple_targets():
+    targets = [TargetPosition.from_int(100 + i, 200 - i, 90 * i, 1) for i in range(5)]
+    command = MotorControlMultipleTargets(
+        5, MovementType.Linear, Speed.from_int(80, 1), WriteMode.Append, targets
+    )
+    assert bytes(command) == bytes.fromhex(
+        "0400050250010001"
+        "6400c8000020"
+        "6500c7005a20"
+        "6600c600b420"
+        "6700c5000e21"
+        "6800c4006821"
+    )
+    empty = MotorControlMultipleTargets(
+        5, MovementType.Linear, Speed.from_int(80, 1), WriteMode.Append, []
+    )
+    assert bytes(empty) == bytes.fromhex("0400050250010001")
+
+    # 29 targets (maximum) are serialized in one buffer
+    targets = [TargetPosition.from_int(i, i, i) for i in range(29)]
+    command = MotorControlMultipleTargets(
+        5, MovementType.Linear, Speed.from_int(80), WriteMode.Overwrite, targets
+    )
+    data = bytes(command)
+    assert len(data) == 8 + 6 * 29
+    assert data[-6:] == bytes.fromhex("1c001c001c00")
+
+
+def test_play_midi():
+    notes = [MidiNote(100 * i, Note.C5, 255 - i) for i in range(5)]
+    assert bytes(PlayMidi(2, notes)) == bytes.fromhex(
+        "030205" "003cff" "0a3cfe" "143cfd" "1e3cfc" "283cfb"
+    )
+    assert bytes(PlayMidi(0, [])) == bytes.fromhex("030000")
+
+
+def test_repeated_turning_on_and_off():
+    params = [IndicatorParam.from_int(100, i, 2 * i, 3 * i) for i in range(4)]
+    assert bytes(RepeatedTurningOnAndOff(3, params)) == bytes.fromhex(
+        "040304" "0a0101000000" "0a0101010203" "0a0101020406" "0a0101030609"
+    )
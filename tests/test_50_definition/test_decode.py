@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_decode.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import struct
+
+import pytest
+
+from toio.cube import IdInformation, PositionId, PostureAngleQuaternionsData
+
+np = pytest.importorskip("numpy")
+
+
+def _position_id(x: int, y: int, angle: int) -> bytearray:
+    return bytearray(struct.pack("<BHHHHHH", 0x01, x, y, angle, x, y, angle))
+
+
+PAYLOADS = [
+    _position_id(100, 200, 90),
+    bytearray((0x03,)),
+    _position_id(110, 210, 180),
+    bytearray(struct.pack("<BLH", 0x02, 3670016, 0)),
+    _position_id(120, 220, 270),
+]
+
+
+def test_batch_payload_list():
+    from toio.decode import batch
+
+    records, index = batch(PositionId, PAYLOADS, return_index=True)
+    assert len(records) == 3
+    assert list(index) == [0, 2, 4]
+    for record, i in zip(records, index):
+        position_id = IdInformation.is_my_data(PAYLOADS[i])
+        assert isinstance(position_id, PositionId)
+        assert record["center_x"] == position_id.center.point.x
+        assert record["center_y"] == position_id.center.point.y
+        assert record["sensor_angle"] == position_id.sensor.angle
+
+
+def test_batch_concatenated_payloads():
+    from toio.decode import batch
+
+    buffer = b"".join(PAYLOADS)
+    offsets = np.cumsum([0] + [len(x) for x in PAYLOADS[:-1]])
+    records = batch(PositionId, buffer, offsets)
+    assert (records == batch(PositionId, PAYLOADS)).all()
+
+    # offsets must be strictly increasing within the buffer
+    for wrong_offsets in (offsets[::-1], [0, 0, 13], [-1, 13], [0, len(buffer)]):
+        with pytest.raises(ValueError):
+            batch(PositionId, buffer, wrong_offsets)
+
+
+def test_batch_posture_angle():
+    from toio.decode import batch, dtype
+
+    payloads = [
+        bytearray(struct.pack("<BBffff", 0x03, 0x02, 1.0, 0.5, 0.25, 0.125)),
+        bytearray(struct.pack("<BBhhh", 0x03, 0x01, 1, 2, 3)),
+    ]
+    records = batch(PostureAngleQuaternionsData, payloads)
+    assert records.dtype == dtype(PostureAngleQuaternionsData)
+    assert len(records) == 1
+    assert records["w"][0] == 1.0 and records["z"][0] == 0.125
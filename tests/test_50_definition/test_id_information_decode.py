@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_id_information_decode.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import struct
+
+import pytest
+
+from toio.cube import (
+    IdInformation,
+    PositionId,
+    PositionIdMissed,
+    PositionIdRawData,
+    StandardId,
+    StandardIdMissed,
+)
+from toio.position import CubeLocation, Point
+
+POSITION_ID = bytearray(struct.pack("<BHHHHHH", 0x01, 100, 200, 90, 101, 201, 91))
+
+
+def test_position_id_unpack():
+    raw = PositionId.unpack(POSITION_ID)
+    assert raw == PositionIdRawData(100, 200, 90, 101, 201, 91)
+    assert raw.center_x == 100 and raw.sensor_angle == 91
+    with pytest.raises(TypeError):
+        PositionId.unpack(bytearray((0x02, 0, 0, 0, 0, 0, 0)))
+
+
+def test_position_id_location():
+    position_id = PositionId(POSITION_ID)
+    assert position_id.raw == PositionId.unpack(POSITION_ID)
+    assert position_id.center == CubeLocation(point=Point(100, 200), angle=90)
+    assert position_id.sensor == CubeLocation(point=Point(101, 201), angle=91)
+    assert "center" in str(position_id)
+
+
+def test_id_information_dispatch():
+    assert isinstance(IdInformation.is_my_data(POSITION_ID), PositionId)
+    standard_id = bytearray(struct.pack("<BLH", 0x02, 3670016, 0))
+    assert isinstance(IdInformation.is_my_data(standard_id), StandardId)
+    assert isinstance(IdInformation.is_my_data(bytearray((0x03,))), PositionIdMissed)
+    assert isinstance(IdInformation.is_my_data(bytearray((0x04,))), StandardIdMissed)
+    assert IdInformation.is_my_data(bytearray((0x05,))) is None
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_packed_command.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from logging import getLogger
+
+import pytest
+
+from toio.cube import CommandCache, PackedCommand, SoundId
+from toio.cube.api.indicator import IndicatorParam, TurningOnAndOff, TurnOffAll
+from toio.cube.api.motor import MotorControl
+from toio.cube.api.sound import PlaySoundEffect
+
+logger = getLogger(__name__)
+
+
+def test_packed_command():
+    command = MotorControl(50, -50, 100)
+    packed = PackedCommand(command)
+    logger.info(repr(packed))
+    assert bytes(packed) == bytes(command)
+    assert bytes(packed) is bytes(packed)
+    assert len(packed) == len(bytes(command))
+    assert packed.command_type is MotorControl
+    assert PackedCommand(packed) == packed
+    assert PackedCommand(packed).command_type is MotorControl
+    assert packed == PackedCommand(MotorControl(50, -50, 100))
+    assert packed != PackedCommand(MotorControl(50, -50, None))
+    assert len({packed, PackedCommand(MotorControl(50, -50, 100))}) == 1
+    with pytest.raises(AttributeError):
+        packed._data = b"\x01"  # type: ignore
+
+
+def test_command_cache():
+    cache = CommandCache(maxsize=2)
+    stop = cache.get(MotorControl, 0, 0, None)
+    assert stop is cache.get(MotorControl, 0, 0, None)
+    assert bytes(stop) == bytes(MotorControl(0, 0, None))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    red = cache.get(TurningOnAndOff.from_int, 0, 255, 0, 0)
+    assert bytes(red) == bytes(TurningOnAndOff(IndicatorParam.from_int(0, 255, 0, 0)))
+    assert red.command_type is TurningOnAndOff
+    assert cache.get(MotorControl, 0, 0, None) is stop
+
+    # red is the least recently used
+    cache.get(TurnOffAll)
+    assert len(cache) == 2
+    assert cache.get(MotorControl, 0, 0, None) is stop
+    assert cache.get(TurningOnAndOff.from_int, 0, 255, 0, 0) is not red
+    assert bytes(cache.get(PlaySoundEffect, SoundId.Enter, 255)) == bytes(
+        PlaySoundEffect(SoundId.Enter, 255)
+    )
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
+    with pytest.raises(ValueError):
+        CommandCache(maxsize=0)
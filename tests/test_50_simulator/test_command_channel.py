@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_command_channel.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from toio.cube import CommandChannel, MovementType, ToioCoreCube, WriteMode
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+class SlowWriter:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.written = []
+
+    async def write(self, data):
+        loop = asyncio.get_running_loop()
+        self.written.append((loop.time(), bytes(data)))
+        await asyncio.sleep(self.latency)
+
+
+@pytest.mark.asyncio
+async def test_latest_wins():
+    writer = SlowWriter(0.02)
+    channel = CommandChannel(writer.write)
+    for n in range(50):
+        channel.put("speed", bytes((n,)))
+        await asyncio.sleep(0.001)
+    channel.put("target", b"T")
+    await channel.flush()
+    logger.info("sent: %d, replaced: %d", channel.sent, channel.replaced)
+    assert channel.sent + channel.replaced == 51
+    assert channel.sent < 20
+    assert writer.written[-2][1] == bytes((49,))
+    assert writer.written[-1][1] == b"T"
+    assert channel.qsize() == 0
+    channel.close()
+
+
+@pytest.mark.asyncio
+async def test_replaced_command_is_written_last():
+    writer = SlowWriter(0.02)
+    channel = CommandChannel(writer.write)
+    channel.put("busy", b"0")
+    await asyncio.sleep(0)
+    channel.put("speed", b"go")
+    channel.put("target", b"T")
+    channel.put("speed", b"stop")
+    assert channel.qsize() == 2
+    await channel.flush()
+    assert [data for _, data in writer.written] == [b"0", b"T", b"stop"]
+    assert channel.replaced == 1
+    channel.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_cap():
+    writer = SlowWriter(0.0)
+    channel = CommandChannel(writer.write, min_interval=0.05)
+    for kind in ("a", "b", "c"):
+        channel.put(kind, kind.encode())
+    await channel.flush()
+    assert [data for _, data in writer.written] == [b"a", b"b", b"c"]
+    times = [t for t, _ in writer.written]
+    assert all(t2 - t1 >= 0.045 for t1, t2 in zip(times, times[1:]))
+    channel.close()
+
+
+@pytest.mark.asyncio
+async def test_motor_command_channel():
+    interface = SimulatedCube()
+    async with ToioCoreCube(interface=interface) as cube:
+        channel = await cube.enable_motor_command_channel()
+        assert channel.min_interval == pytest.approx(0.015)
+        for n in range(100):
+            await cube.api.motor.motor_control(n % 50, -(n % 50))
+        await channel.flush()
+        assert channel.sent + channel.replaced == 100
+        assert channel.replaced > 0
+        assert interface.motor_speed == (49, -49)
+
+        # the latest motor command wins over the other kinds of motor commands
+        await cube.api.motor.motor_control(60, 60)
+        await cube.api.motor.motor_control_target(
+            timeout=5,
+            movement_type=MovementType.Linear,
+            speed=(80, 0),
+            target=(200, 200, 0),
+        )
+        await cube.api.motor.motor_control(0, 0)
+        await channel.flush()
+        assert interface.motor_speed == (0, 0)
+
+        # appended targets are never replaced
+        for _ in range(3):
+            await cube.api.motor.motor_control_multiple_targets(
+                timeout=5,
+                movement_type=MovementType.Linear,
+                speed=(50, 0),
+                mode=WriteMode.Append,
+                target_list=[(200, 200, 0)],
+            )
+        assert channel.qsize() == 3
+        await cube.api.motor.disable_command_channel()
+        assert cube.api.motor.command_channel is None
+        assert channel.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_with_stalled_write(monkeypatch):
+    interface = SimulatedCube()
+    cube = ToioCoreCube(interface=interface)
+    assert not hasattr(cube, "api")
+    cube.COMMAND_CHANNEL_FLUSH_TIMEOUT = 0.1
+    await cube.connect()
+    channel = await cube.enable_motor_command_channel(limit_rate=False)
+    stalled = asyncio.Event()
+
+    async def stalled_write(char_uuid, data, response=False):
+        await stalled.wait()
+
+    monkeypatch.setattr(interface, "write", stalled_write)
+    await cube.api.motor.motor_control(10, 10)
+    await cube.api.motor.motor_control(20, 20)
+    await asyncio.wait_for(cube.disconnect(), timeout=1.0)
+    assert not cube.is_connect()
+    assert cube.api.motor.command_channel is None
+    assert channel.qsize() == 0
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_command_scheduler.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from logging import getLogger
+
+import pytest
+
+from toio.cube import CommandScheduler, MultipleToioCoreCubes
+from toio.cube.api.base_class import CubeCommand
+from toio.cube.api.indicator import TurnOffAll
+from toio.cube.api.motor import MotorControl
+from toio.cube.api.sensor import RequestMotionDetection
+from toio.device_interface.simulator import SimulatedScanner
+
+logger = getLogger(__name__)
+
+
+class SlowMotorControl(MotorControl):
+    pass
+
+
+class UserCommand(CubeCommand):
+    def __bytes__(self) -> bytes:
+        return b"\x03\x00"
+
+
+@pytest.mark.asyncio
+async def test_scheduled_commands():
+    cube_info_list = await SimulatedScanner().scan(4)
+    interfaces = [info.interface for info in cube_info_list]
+    cubes = MultipleToioCoreCubes(cube_info_list, names=("a", "b", "c", "d"))
+    assert all(await cubes.connect())
+
+    written = []
+
+    async def recording_write(char_uuid, data, response=False):
+        written.append((data, response))
+
+    interfaces[3].write = recording_write  # type: ignore
+
+    scheduler = CommandScheduler(cubes)
+    scheduler.extend(
+        [(0.2, n, MotorControl(10 * n, -10 * n, None)) for n in range(4)]
+        + [(0.1, "d", TurnOffAll())]
+    )
+    scheduler.add(0.3, cubes[0], b"\x01\x01\x01\x05\x02\x01\x05", "motor")
+    assert len(scheduler) == 6
+    with pytest.raises(ValueError):
+        scheduler.add(0.3, 0, b"\x01")
+    with pytest.raises(ValueError):
+        scheduler.add(0.3, 0, b"\x00", "battery")
+    with pytest.raises(ValueError):
+        scheduler.add(0.3, 0, UserCommand())
+
+    # commands are written to the characteristic of the command class
+    lookup_scheduler = CommandScheduler(cubes)
+    lookup_scheduler.add(0.0, 0, RequestMotionDetection())
+    lookup_scheduler.add(0.0, 1, SlowMotorControl(5, 5, None))
+    lookup_scheduler.add(0.0, 2, UserCommand(), "sound")
+    assert [entry.char for entry in lookup_scheduler._entries] == [
+        cubes[0].api.sensor,
+        cubes[1].api.motor,
+        cubes[2].api.sound,
+    ]
+
+    records = await scheduler.run()
+    for record in records:
+        logger.info(
+            "t=%.3f sent=%.4f lateness=%.4f",
+            record.t_offset,
+            record.sent,
+            record.lateness,
+        )
+    assert [r.t_offset for r in records] == [0.2, 0.2, 0.2, 0.2, 0.1, 0.3]
+    assert all(r.error is None for r in records)
+    assert all(0.0 <= r.lateness < 0.05 for r in records)  # type: ignore
+    sent = [r.sent for r in records[:4]]
+    assert max(sent) - min(sent) < 0.01  # type: ignore
+
+    assert written == [(bytes(TurnOffAll()), True), (bytes(records[3].data), False)]
+    assert interfaces[1].motor_speed == (10, -10)  # type: ignore
+    assert interfaces[2].motor_speed == (20, -20)  # type: ignore
+    assert interfaces[0].motor_speed == (5, 5)  # type: ignore
+    await cubes.disconnect()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_concurrent_dispatch.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from toio.cube import NotificationHandlerInfo, ToioCoreCube
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+async def _count_notifications(mode: str):
+    counts = {"slow": 0, "fast": 0, "sync": 0}
+
+    async def slow_handler(payload: bytearray):
+        await asyncio.sleep(0.1)
+        counts["slow"] += 1
+
+    async def fast_handler(payload: bytearray, info: NotificationHandlerInfo):
+        counts["fast"] += 1
+
+    def sync_handler(payload: bytearray):
+        counts["sync"] += 1
+
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        id_information = cube.api.id_information
+        await id_information.set_dispatch_mode(mode, max_pending=2)
+        await id_information.register_notification_handler(slow_handler)
+        await id_information.register_notification_handler(fast_handler)
+        await id_information.register_notification_handler(sync_handler)
+        await asyncio.sleep(0.5)
+        result = dict(counts)
+        await id_information.unregister_notification_handler(slow_handler)
+        await id_information.unregister_notification_handler(fast_handler)
+        await id_information.unregister_notification_handler(sync_handler)
+        assert len(id_information._handler_workers) == 0
+    return result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch():
+    sequential = await _count_notifications("sequential")
+    concurrent = await _count_notifications("concurrent")
+    logger.info("sequential: %s, concurrent: %s", sequential, concurrent)
+    assert concurrent["fast"] > sequential["fast"] * 2
+    assert concurrent["sync"] > sequential["sync"] * 2
+    assert concurrent["slow"] <= 6
+
+
+@pytest.mark.asyncio
+async def test_join_notification_handlers():
+    received = []
+
+    async def handler(payload: bytearray):
+        await asyncio.sleep(0.01)
+        received.append(payload)
+
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        button = cube.api.button
+        await button.set_dispatch_mode("concurrent", max_pending=4)
+        await button.register_notification_handler(handler)
+        assert isinstance(cube.interface, SimulatedCube)
+        for _ in range(3):
+            cube.interface.press_button()
+            cube.interface.release_button()
+        await asyncio.sleep(0.01)
+        await button.join_notification_handlers()
+        assert len(received) == 4
+        assert button._handler_workers[handler].dropped == 2
+        with pytest.raises(ValueError):
+            await button.set_dispatch_mode("parallel")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_register_while_dispatching():
+    received = []
+
+    def second_handler(payload: bytearray, info: NotificationHandlerInfo):
+        received.append(info.misc)
+
+    async def first_handler(payload: bytearray):
+        await cube.api.id_information.register_notification_handler(
+            second_handler, misc="second"
+        )
+        await cube.api.id_information.unregister_notification_handler(first_handler)
+
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        id_information = cube.api.id_information
+        await id_information.register_notification_handler(first_handler)
+        await asyncio.wait_for(asyncio.sleep(0.2), timeout=1.0)
+        assert len(id_information._handler_calls) == 1
+        assert len(id_information._async_handler_calls) == 0
+        assert len(received) > 0 and received[0] == "second"
+
+
+@pytest.mark.asyncio
+async def test_handler_workers_stopped_by_disconnect():
+    async def slow_handler(payload: bytearray):
+        await asyncio.sleep(1.0)
+
+    def worker_tasks():
+        return [
+            task
+            for task in asyncio.all_tasks()
+            if task.get_coro().__qualname__ == "HandlerWorker._run"  # type: ignore
+        ]
+
+    cube = ToioCoreCube(interface=SimulatedCube())
+    await cube.connect()
+    await cube.api.id_information.set_dispatch_mode("concurrent")
+    await cube.api.id_information.register_notification_handler(slow_handler)
+    await asyncio.sleep(0.2)
+    assert len(worker_tasks()) == 1
+    await cube.disconnect()
+    assert len(worker_tasks()) == 0
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_configuration_request.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from toio.cube import ToioCoreCube
+from toio.cube.api.configuration import (
+    GetCurrentConnectionIntervalValue,
+    MagneticSensorCondition,
+    MagneticSensorFunction,
+    NotificationCondition,
+    RequestConnectionInterval,
+    ResponseConnectionIntervalRequest,
+    ResponseGettingCurrentConnectionInterval,
+    ResponseGettingRequestedConnectionInterval,
+    ResponseIdNotificationSettings,
+    ResponseMagneticSensorSettings,
+    SetCollisionDetectionThreshold,
+    SetIdNotification,
+    SetMagneticSensor,
+)
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_get_connection_interval_value():
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        configuration = cube.api.configuration
+        response = await configuration.request(RequestConnectionInterval(16, 32))
+        assert isinstance(response, ResponseConnectionIntervalRequest)
+        assert response.result
+        requested = await configuration.get_requested_connection_interval_value()
+        assert isinstance(requested, ResponseGettingRequestedConnectionInterval)
+        assert requested.min_interval.value == 16
+        assert requested.max_interval.value == 32
+        current = await configuration.get_current_connection_interval_value()
+        assert isinstance(current, ResponseGettingCurrentConnectionInterval)
+
+
+@pytest.mark.asyncio
+async def test_pipelined_requests():
+    interface = SimulatedCube()
+    async with ToioCoreCube(interface=interface) as cube:
+        configuration = cube.api.configuration
+        response_list = await asyncio.gather(
+            configuration.request(SetIdNotification(100, NotificationCondition.Always)),
+            configuration.request(
+                SetMagneticSensor(
+                    MagneticSensorFunction.MagnetState,
+                    100,
+                    MagneticSensorCondition.Always,
+                )
+            ),
+            configuration.request(GetCurrentConnectionIntervalValue()),
+            configuration.request(GetCurrentConnectionIntervalValue()),
+        )
+        assert isinstance(response_list[0], ResponseIdNotificationSettings)
+        assert isinstance(response_list[1], ResponseMagneticSensorSettings)
+        assert isinstance(response_list[2], ResponseGettingCurrentConnectionInterval)
+        assert isinstance(response_list[3], ResponseGettingCurrentConnectionInterval)
+        assert interface.id_notification_interval == pytest.approx(0.1)
+        assert len(configuration._response_waiters) == 0
+        with pytest.raises(ValueError):
+            await configuration.request(SetCollisionDetectionThreshold(5))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_connection_state.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+import threading
+from logging import getLogger
+
+import pytest
+
+from toio.cube import ToioCoreCube
+from toio.device_interface.ble import BleCube
+from toio.device_interface.dummy import DummyCube
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_wait_connection_state():
+    cube = ToioCoreCube(interface=SimulatedCube())
+    assert await cube.wait_disconnected(timeout=0)
+    assert not await cube.wait_connected(timeout=0.05)
+
+    waiter = asyncio.ensure_future(cube.wait_connected(timeout=1.0))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await cube.connect()
+    assert await waiter
+    assert not await cube.wait_disconnected(timeout=0.05)
+
+    waiter = asyncio.ensure_future(cube.wait_disconnected(timeout=1.0))
+    await cube.disconnect()
+    assert await waiter
+    assert not cube.is_connect()
+
+
+@pytest.mark.asyncio
+async def test_wait_connection_state_by_polling():
+    interface = DummyCube()
+    assert await interface.wait_connected(timeout=0)
+    assert not await interface.wait_disconnected(timeout=0.2)
+
+
+class StubBleakClient:
+    """
+    BleakClient whose disconnected_callback is called from another thread
+    (as some backends do)
+    """
+
+    def __init__(self, address, disconnected_callback):
+        self.address = address
+        self.is_connected = False
+        self._disconnected_callback = disconnected_callback
+
+    async def connect(self):
+        self.is_connected = True
+        return True
+
+    async def disconnect(self):
+        self.is_connected = False
+        self._disconnected_callback(self)
+        return True
+
+    def lose_connection(self):
+        def _lose_connection():
+            self.is_connected = False
+            self._disconnected_callback(self)
+
+        thread = threading.Thread(target=_lose_connection)
+        thread.start()
+        thread.join()
+
+
+@pytest.mark.asyncio
+async def test_disconnected_callback_from_another_thread(monkeypatch):
+    address = "00:00:00:00:FF:10"
+    interface = BleCube(address)
+    monkeypatch.setattr(
+        interface,
+        "_create_client",
+        lambda: StubBleakClient(address, interface._on_disconnected),
+    )
+    assert await interface.connect()
+    assert await interface.wait_connected(timeout=0)
+    assert interface.is_connect()
+
+    waiter = asyncio.ensure_future(interface.wait_disconnected(timeout=1.0))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    interface.device.lose_connection()
+    assert await waiter
+    assert not interface.is_connect()
+    assert not interface.connected
+    assert not await interface.wait_connected(timeout=0)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_cube_profile.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from logging import getLogger
+
+import pytest
+
+from toio.cube import (
+    CubeProfile,
+    MotorSpeedInformationAcquisitionState,
+    MultipleToioCoreCubes,
+    NotificationCondition,
+    PostureAngleDetectionType,
+    ToioCoreCube,
+)
+from toio.device_interface.simulator import SimulatedCube, SimulatedScanner
+
+logger = getLogger(__name__)
+
+PROFILE = CubeProfile(
+    id_notification_interval_ms=50,
+    id_notification_condition=NotificationCondition.ChangeDetection,
+    id_missed_sensitivity_ms=200,
+    posture_angle_detection_type=PostureAngleDetectionType.Euler,
+    posture_angle_detection_interval_ms=100,
+    motor_speed_information_acquisition=MotorSpeedInformationAcquisitionState.Enable,
+    connection_interval=(16, 32),
+    horizontal_detection_threshold=30,
+    collision_detection_threshold=3,
+)
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_to_cubes():
+    cube_info_list = await SimulatedScanner().scan(3)
+    async with MultipleToioCoreCubes(cube_info_list) as cubes:
+        result_list = await PROFILE.apply(cubes, max_concurrency=2)
+        assert result_list == [True, True, True]
+    for info in cube_info_list:
+        interface = info.interface
+        assert isinstance(interface, SimulatedCube)
+        assert interface.id_notification_interval == pytest.approx(0.05)
+        assert interface.id_notification_condition == 0x01
+        assert interface.id_missed_sensitivity == pytest.approx(0.2)
+        assert interface.posture_angle_type == 0x01
+        assert interface.motor_speed_enabled
+        assert interface.connection_interval == (16, 32)
+        assert interface.horizontal_detection_threshold == 30
+        assert interface.collision_detection_threshold == 3
+        assert interface.magnetic_sensor_function == 0x00
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_without_response():
+    interface = SimulatedCube()
+    write_configuration = interface._write_configuration
+
+    def drop_motor_speed_setting(payload: bytes) -> None:
+        if payload[0] != 0x1C:
+            write_configuration(payload)
+
+    interface._write_configuration = drop_motor_speed_setting  # type: ignore
+    async with ToioCoreCube(interface=interface) as cube:
+        assert await PROFILE.apply(cube, timeout=0.2) == [False]
+        assert await CubeProfile(id_missed_sensitivity_ms=100).apply(cube) == [True]
+        assert await CubeProfile().apply(cube) == [True]
+        assert len(cube.api.configuration._response_waiters) == 0
+    assert interface.id_missed_sensitivity == pytest.approx(0.1)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_discover.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+import toio.device_interface.ble as ble
+from toio.cube import ToioCoreCube
+from toio.device_interface.rssi import RssiPolicy, RssiStatistics
+from toio.device_interface.simulator import SimulatedCube, SimulatedScanner
+from toio.scanner import ScanCache, UniversalBleScanner
+from toio.toio_uuid import TOIO_UUID_SERVICE
+
+logger = getLogger(__name__)
+
+ADVERTISEMENTS = [
+    ("00:00:00:00:00:01", "toio Core Cube-A01", -50),
+    ("00:00:00:00:00:02", "toio Core Cube-B02", -60),
+    ("00:00:00:00:00:01", "toio Core Cube-A01", -50),
+    ("00:00:00:00:00:01", "toio Core Cube-A01", -45),
+    ("00:00:00:00:00:03", "toio Core Cube-C03", -70),
+]
+
+
+def create_simulated_cube(device: BLEDevice) -> SimulatedCube:
+    return SimulatedCube(name=device.name, address=device.address)
+
+
+class FakeBleakScanner:
+    """Replays ADVERTISEMENTS to the detection callback"""
+
+    def __init__(self, detection_callback, backend=None):
+        self._callback = detection_callback
+        self._task = None
+        self.stopped = False
+
+    async def _advertise(self):
+        for address, name, rssi in ADVERTISEMENTS:
+            await asyncio.sleep(0.01)
+            device = BLEDevice(address, name, None, rssi=rssi)
+            advertisement = AdvertisementData(
+                local_name=name,
+                manufacturer_data={},
+                service_data={},
+                service_uuids=[str(TOIO_UUID_SERVICE)],
+                tx_power=None,
+                rssi=rssi,
+                platform_data=(),
+            )
+            self._callback(device, advertisement)
+
+    async def __aenter__(self):
+        self._task = asyncio.ensure_future(self._advertise())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._task.cancel()
+        self.stopped = True
+
+
+@pytest.mark.asyncio
+async def test_discover_deduplicated(monkeypatch):
+    monkeypatch.setattr(ble, "BleakScanner", FakeBleakScanner)
+    monkeypatch.setattr(ble, "BleCube", create_simulated_cube)
+    scanner = ble.BaseBleScanner()
+    found = [info async for info in scanner.discover(timeout=0.5)]
+    assert [info.name for info in found] == [
+        "toio Core Cube-A01",
+        "toio Core Cube-B02",
+        "toio Core Cube-C03",
+    ]
+
+    found = [info async for info in scanner.discover(num=2, timeout=0.5)]
+    assert len(found) == 2
+
+    found = [info async for info in scanner.discover(cube_id={"C03"}, timeout=0.5)]
+    assert [info.name for info in found] == ["toio Core Cube-C03"]
+
+    found = [
+        info
+        async for info in scanner.discover(address={"00:00:00:00:00:02"}, timeout=None)
+    ]
+    assert [info.device.address for info in found] == ["00:00:00:00:00:02"]
+
+
+@pytest.mark.asyncio
+async def test_discover_rssi_updates(monkeypatch):
+    monkeypatch.setattr(ble, "BleakScanner", FakeBleakScanner)
+    monkeypatch.setattr(ble, "BleCube", create_simulated_cube)
+    scanner = ble.BaseBleScanner()
+    found = [
+        info
+        async for info in scanner.discover(
+            cube_id={"A01"}, timeout=0.5, rssi_updates=True
+        )
+    ]
+    assert [info.advertisement.rssi for info in found] == [-50, -45]
+    assert found[0].interface is found[1].interface
+
+
+@pytest.mark.asyncio
+async def test_discover_saves_cache_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(ble, "BleakScanner", FakeBleakScanner)
+    monkeypatch.setattr(ble, "BleCube", create_simulated_cube)
+    cache = ScanCache(tmp_path / "cubes.json")
+    saves = []
+    monkeypatch.setattr(cache, "save", lambda: saves.append(len(cache)))
+    scanner = UniversalBleScanner(cache=cache)
+    found = [info async for info in scanner.discover(timeout=0.5)]
+    assert len(found) == 3
+    assert saves == [3]
+
+
+@pytest.mark.asyncio
+async def test_discover_and_connect():
+    cubes = []
+    async for info in SimulatedScanner().discover(num=2):
+        cube = ToioCoreCube.create(info)
+        assert await cube.connect()
+        cubes.append(cube)
+    assert len(cubes) == 2
+    for cube in cubes:
+        await cube.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_scan_creates_interface_once(monkeypatch):
+    created = []
+
+    def create_cube(device: BLEDevice) -> SimulatedCube:
+        created.append(device.address)
+        return create_simulated_cube(device)
+
+    monkeypatch.setattr(ble, "BleakScanner", FakeBleakScanner)
+    monkeypatch.setattr(ble, "BleCube", create_cube)
+    found = await ble.BaseBleScanner()._scan(sort="rssi", timeout=0.3)
+    assert created == [
+        "00:00:00:00:00:01",
+        "00:00:00:00:00:02",
+        "00:00:00:00:00:03",
+    ]
+    assert [info.advertisement.rssi for info in found] == [-45, -60, -70]
+
+    found = await ble.BaseBleScanner()._scan(
+        address={"00:00:00:00:00:0a", "00:00:00:00:00:01"}, timeout=0.3
+    )
+    assert [info.device.address for info in found] == ["00:00:00:00:00:01"]
+
+
+def test_cube_filter():
+    device = BLEDevice("00:00:00:00:00:0A", "toio Core Cube-A1b", None, rssi=-50)
+    assert ble.CubeFilter().match(device)
+    assert ble.CubeFilter().target_count is None
+    assert ble.CubeFilter(address={"00:00:00:00:00:0a"}).match(device)
+    assert not ble.CubeFilter(address={"00:00:00:00:00:0B"}).match(device)
+    assert ble.CubeFilter(cube_id={"x", "A1b"}).match(device)
+    assert ble.CubeFilter(cube_id={"x", "A1b"}).target_count == 2
+    assert not ble.CubeFilter(cube_id={"A1c", "."}).match(device)
+    assert not ble.CubeFilter(cube_id=set()).match(device)
+    unnamed = BLEDevice("00:00:00:00:00:0A", None, None, rssi=-50)
+    assert not ble.CubeFilter(cube_id={"A1b"}).match(unnamed)
+
+
+@pytest.mark.asyncio
+async def test_ble_cube_creates_client_lazily(monkeypatch):
+    monkeypatch.setattr(ble, "BleakScanner", FakeBleakScanner)
+    found = await ble.BaseBleScanner()._scan(num=2, sort="rssi", timeout=0.3)
+    assert len(found) == 2
+    for info in found:
+        interface = info.interface
+        assert isinstance(interface, ble.BleCube)
+        assert interface._client is None
+        assert interface.get_address() == info.device.address
+        assert not interface.is_connect()
+    assert ble.BleCube("00:00:00:00:00:0A").get_address() == "00:00:00:00:00:0A"
+
+
+@pytest.mark.asyncio
+async def test_scan_with_rssi_policy(monkeypatch):
+    monkeypatch.setattr(ble, "BleakScanner", FakeBleakScanner)
+    monkeypatch.setattr(ble, "BleCube", create_simulated_cube)
+    scanner = ble.BaseBleScanner()
+    found = await scanner._scan(sort="rssi", timeout=0.3)
+    assert [info.name for info in found] == [
+        "toio Core Cube-A01",
+        "toio Core Cube-B02",
+        "toio Core Cube-C03",
+    ]
+    stats = scanner.rssi_statistics["00:00:00:00:00:01"]
+    assert stats.count == 3
+    assert stats.median == -50.0
+    assert stats.latest == -45
+
+    found = await scanner._scan(
+        sort="rssi", timeout=0.3, rssi_policy=RssiPolicy(min_samples=2)
+    )
+    assert [info.name for info in found] == ["toio Core Cube-A01"]
+
+    found = await scanner._scan(
+        num=1, sort="rssi", timeout=0.3, rssi_policy=RssiPolicy(min_rssi=-65)
+    )
+    assert [info.name for info in found] == ["toio Core Cube-A01"]
+
+    found = await scanner._scan(
+        cube_id={"A01"}, timeout=1.0, rssi_policy=RssiPolicy(min_samples=3)
+    )
+    assert [info.name for info in found] == ["toio Core Cube-A01"]
+    assert scanner.rssi_statistics["00:00:00:00:00:01"].count == 3
+
+
+def test_rssi_statistics():
+    stats = RssiStatistics(window=3, alpha=0.5)
+    assert stats.median is None
+    for rssi in (-40, None, -60, -50, -80):
+        stats.add(rssi)
+    assert stats.count == 4
+    assert stats.samples == (-60, -50, -80)
+    assert stats.median == -60.0
+    assert stats.ewma == pytest.approx(-65.0)
+    assert RssiPolicy(key="ewma", min_rssi=-70).accepts(stats)
+    assert not RssiPolicy(key="latest", min_rssi=-70).accepts(stats)
+    assert not RssiPolicy(min_samples=5).accepts(stats)
+    with pytest.raises(ValueError):
+        RssiStatistics(window=0)
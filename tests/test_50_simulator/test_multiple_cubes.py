@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_multiple_cubes.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import time
+from logging import getLogger
+
+import pytest
+
+from toio.cube import MultipleToioCoreCubes
+from toio.cube.api.motor import MotorControl
+from toio.device_interface.simulator import SimulatedCube, SimulatedScanner
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_connect_concurrently():
+    cube_info_list = await SimulatedScanner(connect_latency=0.2).scan(8)
+    cubes = MultipleToioCoreCubes(cube_info_list)
+    start = time.monotonic()
+    result_list = await cubes.connect(max_concurrency=4)
+    elapsed = time.monotonic() - start
+    logger.info("connected in %.2f sec", elapsed)
+    assert result_list == [True] * 8
+    assert all(cube.protocol_version is not None for cube in cubes)
+    assert elapsed < 8 * MultipleToioCoreCubes.OPERATION_INTERVAL
+    await cubes.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_connect_retry(monkeypatch):
+    monkeypatch.setattr(MultipleToioCoreCubes, "RETRY_BACKOFF", 0.01)
+    cube_info_list = await SimulatedScanner().scan(3)
+    interfaces = [info.interface for info in cube_info_list]
+    assert all(isinstance(x, SimulatedCube) for x in interfaces)
+    interfaces[1].connect_failures = 2  # type: ignore
+    interfaces[2].connect_failures = 10  # type: ignore
+    cubes = MultipleToioCoreCubes(cube_info_list)
+    result_list = await cubes.connect(max_retry=2)
+    assert result_list == [True, True, False]
+    assert interfaces[2].connect_failures == 7  # type: ignore
+    await cubes.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_in_context_manager(monkeypatch):
+    monkeypatch.setattr(MultipleToioCoreCubes, "RETRY_BACKOFF", 0.01)
+    cube_info_list = await SimulatedScanner().scan(2)
+    cube_info_list[0].interface.connect_failures = 10  # type: ignore
+    with pytest.raises(ConnectionError):
+        async with MultipleToioCoreCubes(cube_info_list):
+            pass
+    assert not any(info.interface.is_connect() for info in cube_info_list)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_with_deadline():
+    cube_info_list = await SimulatedScanner(disconnect_latency=0.2).scan(8)
+    cube_info_list[3].interface.disconnect_latency = 5.0  # type: ignore
+    cubes = MultipleToioCoreCubes(cube_info_list)
+    assert all(await cubes.connect())
+    start = time.monotonic()
+    result_list = await cubes.disconnect(max_concurrency=8, timeout=1.0)
+    elapsed = time.monotonic() - start
+    logger.info("disconnected in %.2f sec", elapsed)
+    assert result_list == [True, True, True, False, True, True, True, True]
+    assert elapsed < 1.5
+    cube_info_list[3].interface.disconnect_latency = 0.0  # type: ignore
+    await cube_info_list[3].interface.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_broadcast():
+    cube_info_list = await SimulatedScanner().scan(4)
+    interfaces = [info.interface for info in cube_info_list]
+    cubes = MultipleToioCoreCubes(cube_info_list)
+    assert all(await cubes.connect())
+
+    written = []
+
+    async def failing_write(char_uuid, data, response=False):
+        raise ConnectionError("disconnected")
+
+    async def recording_write(char_uuid, data, response=False):
+        written.append((data, response))
+
+    interfaces[2].write = failing_write  # type: ignore
+    interfaces[3].write = recording_write  # type: ignore
+    command = MotorControl(40, -30, None)
+    errors = await cubes.broadcast("motor", command, max_concurrency=2)
+    assert errors[:2] == [None, None]
+    assert isinstance(errors[2], ConnectionError)
+    assert errors[3] is None
+    assert interfaces[0].motor_speed == (40, -30)  # type: ignore
+    assert interfaces[1].motor_speed == (40, -30)  # type: ignore
+    assert written == [(bytes(command), False)]
+
+    errors = await cubes.broadcast("sound", b"\x01")
+    assert errors[3] is None and written[-1] == (b"\x01", True)
+    with pytest.raises(ValueError):
+        await cubes.broadcast("battery", b"\x00")
+    await cubes.disconnect()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_notification_buffer.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+import time
+from logging import getLogger
+
+import pytest
+
+from toio.cube import NotificationBuffer, PositionId, ToioCoreCube
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+def test_notification_buffer():
+    buffer = NotificationBuffer(3)
+    assert buffer.latest() is None
+    for n in range(5):
+        buffer.append(bytearray((n,)), timestamp=float(n))
+    assert len(buffer) == 3
+    assert buffer.count == 5
+    assert [x.payload[0] for x in buffer] == [2, 3, 4]
+    assert [x.payload[0] for x in buffer.since(3.0)] == [3, 4]
+    assert [x.payload[0] for x in buffer.window(1.5, now=4.0)] == [3, 4]
+    latest = buffer.latest()
+    assert latest is not None and latest.timestamp == 4.0
+    with pytest.raises(ValueError):
+        NotificationBuffer(0)
+
+
+@pytest.mark.asyncio
+async def test_latest_position_id():
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        with pytest.raises(RuntimeError):
+            cube.api.id_information.latest()
+        await cube.api.id_information.enable_notification_buffer(capacity=16)
+        await asyncio.sleep(0.5)
+        position_id = cube.api.id_information.latest()
+        assert isinstance(position_id, PositionId)
+        assert position_id is cube.api.id_information.latest()
+        buffer = cube.api.id_information.notification_buffer
+        assert buffer is not None
+        assert len(buffer) == 16
+        assert len(buffer.window(0.5)) > 0
+        assert buffer.snapshot()[-1].timestamp <= time.monotonic()
+        await cube.api.id_information.disable_notification_buffer()
+        assert cube.api.id_information.notification_buffer is None
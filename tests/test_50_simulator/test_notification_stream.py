@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_notification_stream.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from toio.cube import PositionId, ToioCoreCube
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_stream_position_id():
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        id_information = cube.api.id_information
+        num = 0
+        async for msg in id_information.stream(maxsize=8):
+            assert isinstance(msg.response, PositionId)
+            assert msg.response is msg.response
+            num += 1
+            if num >= 5:
+                break
+        await asyncio.sleep(0.1)
+        assert len(id_information._notification_streams) == 0
+        assert not id_information.notification_handler_is_registered
+
+
+@pytest.mark.asyncio
+async def test_stream_overflow():
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        id_information = cube.api.id_information
+        async with id_information.stream(maxsize=4) as oldest:
+            async with id_information.stream(
+                maxsize=4, overflow="drop_newest"
+            ) as newest:
+                await asyncio.sleep(0.3)
+                assert oldest.qsize() == 4 and newest.qsize() == 4
+                assert oldest.dropped > 0 and newest.dropped > 0
+                first_of_oldest = await oldest.get()
+                first_of_newest = await newest.get(timeout=1.0)
+                assert first_of_oldest.timestamp > first_of_newest.timestamp
+        assert not oldest.is_open and not newest.is_open
+        assert not id_information.notification_handler_is_registered
+        with pytest.raises(ValueError):
+            id_information.stream(maxsize=0)
+        with pytest.raises(ValueError):
+            id_information.stream(overflow="block")  # type: ignore
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_protocol_version.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from toio.cube import ProtocolVersion, ToioCoreCube
+from toio.device_interface.simulator import SimulatedCube
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_get_protocol_version():
+    async with ToioCoreCube(interface=SimulatedCube()) as cube:
+        protocol_version = await cube.api.configuration.get_protocol_version()
+        assert isinstance(protocol_version, ProtocolVersion)
+        assert protocol_version.version == "2.4.0"
+        assert len(cube.api.configuration._response_waiters) == 0
+        # the root notification handler is registered only while waiting
+        assert not cube.api.configuration.notification_handler_is_registered
+
+
+@pytest.mark.asyncio
+async def test_get_protocol_version_timeout(monkeypatch):
+    interface = SimulatedCube()
+    async with ToioCoreCube(interface=interface) as cube:
+        monkeypatch.setattr(interface, "_write_configuration", lambda payload: None)
+        protocol_version = await cube.api.configuration.get_protocol_version(
+            timeout=0.1
+        )
+        assert protocol_version is None
+        assert len(cube.api.configuration._response_waiters) == 0
+        assert not cube.api.configuration.notification_handler_is_registered
+
+
+@pytest.mark.asyncio
+async def test_connect_without_protocol_version(monkeypatch):
+    interface = SimulatedCube(address="00:00:00:00:FF:02")
+    requests = []
+    registrations = []
+    register = interface.register_notification_handler
+    monkeypatch.setattr(interface, "_write_configuration", requests.append)
+
+    async def counting_register(char_uuid, handler):
+        registrations.append(char_uuid)
+        return await register(char_uuid, handler)
+
+    monkeypatch.setattr(interface, "register_notification_handler", counting_register)
+    cube = ToioCoreCube(interface=interface)
+    cube.cache_protocol_version = True
+    cube.protocol_version_timeout = 0.2
+    cube.protocol_version_total_timeout = 0.5
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async with cube:
+        # the retries are limited by protocol_version_total_timeout
+        assert loop.time() - start < 1.0
+        assert cube.protocol_version is None
+        assert len(requests) == 3
+        # the notification is enabled only once for all the retries
+        assert len(registrations) == 1
+        assert not cube.api.configuration.notification_handler_is_registered
+    assert "00:00:00:00:FF:02" not in ToioCoreCube._PROTOCOL_VERSION_CACHE
+
+
+@pytest.mark.asyncio
+async def test_late_protocol_version_response(monkeypatch):
+    interface = SimulatedCube()
+    write_configuration = interface._write_configuration
+
+    def late_write_configuration(payload):
+        asyncio.get_running_loop().call_later(0.3, write_configuration, payload)
+
+    monkeypatch.setattr(interface, "_write_configuration", late_write_configuration)
+    cube = ToioCoreCube(interface=interface)
+    cube.protocol_version_timeout = 0.2
+    async with cube:
+        # the response to the first request is received while waiting for a retry
+        assert cube.protocol_version is not None
+        assert cube.protocol_version.version == "2.4.0"
+
+
+@pytest.mark.asyncio
+async def test_protocol_version_cache(monkeypatch):
+    address = "00:00:00:00:FF:01"
+    cube = ToioCoreCube(interface=SimulatedCube(address=address))
+    async with cube:
+        assert cube.protocol_version is not None
+    # not cached unless cache_protocol_version is True
+    assert address not in ToioCoreCube._PROTOCOL_VERSION_CACHE
+
+    cube = ToioCoreCube(interface=SimulatedCube(address=address))
+    cube.cache_protocol_version = True
+    async with cube:
+        assert cube.protocol_version is not None
+    assert address in ToioCoreCube._PROTOCOL_VERSION_CACHE
+
+    requests = []
+    interface = SimulatedCube(address=address)
+    monkeypatch.setattr(interface, "_write_configuration", requests.append)
+    cube = ToioCoreCube(interface=interface)
+    cube.cache_protocol_version = True
+    async with cube:
+        assert cube.get_address() == address
+        assert cube.protocol_version is not None
+        assert cube.protocol_version.version == "2.4.0"
+    assert len(requests) == 0
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_scan_cache.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+import time
+from logging import getLogger
+
+import pytest
+
+import toio.scanner.ble as scanner_ble
+from toio.cube import MultipleToioCoreCubes
+from toio.device_interface.simulator import SimulatedCube, SimulatedScanner
+from toio.scanner import ScanCache
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_scan_cache(tmp_path):
+    path = tmp_path / "cubes.json"
+    cache = ScanCache(path)
+    assert len(cache) == 0
+    cube_info_list = await SimulatedScanner().scan(3)
+    cache.update(cube_info_list)
+    assert path.exists()
+
+    loaded = ScanCache(path)
+    assert len(loaded) == 3
+    for info in cube_info_list:
+        cached = loaded.get(info.device.address.lower())
+        assert cached is not None
+        assert cached.name == info.name
+        assert cached.rssi == info.advertisement.rssi
+        assert info.device.address in loaded
+
+    cubes = loaded.cubes()
+    assert all(a.last_seen >= b.last_seen for a, b in zip(cubes, cubes[1:]))
+    info = cubes[0].to_cube_info(SimulatedCube())
+    assert info.device.address == cubes[0].address
+    assert info.advertisement.rssi == cubes[0].rssi
+
+    loaded.remove(cubes[0].address)
+    assert len(ScanCache(path)) == 2
+
+
+def test_scan_cache_max_age(tmp_path):
+    path = tmp_path / "cubes.json"
+    path.write_text(
+        '{"version": 1, "cubes": {'
+        '"00:00:00:00:00:01": {"name": "a", "rssi": -50, "last_seen": %f},'
+        '"00:00:00:00:00:02": {"name": "b", "rssi": -60, "last_seen": 0.0}}}'
+        % time.time()
+    )
+    cache = ScanCache(path, max_age=3600.0)
+    assert len(cache) == 2
+    assert [x.address for x in cache.cubes()] == ["00:00:00:00:00:01"]
+    assert cache.get("00:00:00:00:00:02") is None
+
+
+def test_scan_cache_broken_file(tmp_path):
+    path = tmp_path / "cubes.json"
+    path.write_text("{broken")
+    cache = ScanCache(path)
+    assert len(cache) == 0
+    cache.clear()
+    assert len(ScanCache(path)) == 0
+
+
+@pytest.mark.asyncio
+async def test_scan_cached(tmp_path, monkeypatch):
+    path = tmp_path / "cubes.json"
+    cache = ScanCache(path)
+    cache.update(await SimulatedScanner().scan(2))
+    addresses = [x.address for x in cache.cubes()]
+    assert len(addresses) == 2
+
+    def create_cube(address):
+        # the second cached cube is out of range
+        failures = 10 if address == addresses[1] else 0
+        return SimulatedCube(address=address, connect_failures=failures)
+
+    scan_args = []
+
+    async def fake_scan(self, **kwargs):
+        scan_args.append(kwargs)
+        return await SimulatedScanner().scan(kwargs["num"], sort=kwargs["sort"])
+
+    saves = []
+    monkeypatch.setattr(scanner_ble, "BleCube", create_cube)
+    monkeypatch.setattr(scanner_ble.UniversalBleScanner, "_scan", fake_scan)
+    monkeypatch.setattr(cache, "save", lambda: saves.append(len(cache)))
+
+    scanner = scanner_ble.UniversalBleScanner(cache=cache)
+    found = await scanner.scan_cached(2, sort="local_name", timeout=1.0)
+    assert len(found) == 2
+    assert addresses[0] in [info.device.address for info in found]
+    connected = [info for info in found if info.device.address == addresses[0]]
+    assert connected[0].interface.is_connect()
+    assert scan_args == [{"num": 1, "sort": "local_name", "timeout": 1.0}]
+    assert saves == [len(cache)]
+
+    # all cached cubes are connected without scanning
+    scan_args.clear()
+    monkeypatch.setattr(
+        scanner_ble, "BleCube", lambda address: SimulatedCube(address=address)
+    )
+    found = await scanner.scan_cached(2)
+    assert len(found) == 2
+    assert scan_args == []
+
+
+@pytest.mark.asyncio
+async def test_scan_cached_concurrency(tmp_path, monkeypatch):
+    cache = ScanCache(tmp_path / "cubes.json")
+    cache.update(await SimulatedScanner().scan(6))
+    in_progress = []
+    max_in_progress = []
+
+    class CountingCube(SimulatedCube):
+        async def connect(self) -> bool:
+            in_progress.append(self)
+            max_in_progress.append(len(in_progress))
+            await asyncio.sleep(0.05)
+            in_progress.remove(self)
+            return await super().connect()
+
+    monkeypatch.setattr(
+        scanner_ble, "BleCube", lambda address: CountingCube(address=address)
+    )
+    scanner = scanner_ble.UniversalBleScanner(cache=cache)
+    found = await scanner.scan_cached(6, max_concurrency=2)
+    assert len(found) == 6
+    assert max(max_in_progress) == 2
+
+    found = await scanner.scan_cached(6)
+    assert len(found) == 6
+    assert max(max_in_progress) == scanner.MAX_CONCURRENT_CONNECTIONS
+
+
+@pytest.mark.asyncio
+async def test_multiple_cubes_with_scan_cache(tmp_path, monkeypatch, caplog):
+    cache = ScanCache(tmp_path / "cubes.json")
+    cache.update(await SimulatedScanner().scan(2))
+
+    async def fail_scan(self, **kwargs):
+        raise AssertionError("scanned")
+
+    monkeypatch.setattr(
+        scanner_ble, "BleCube", lambda address: SimulatedCube(address=address)
+    )
+    monkeypatch.setattr(scanner_ble.UniversalBleScanner, "_scan", fail_scan)
+    async with MultipleToioCoreCubes(2, scan_cache=cache) as cubes:
+        assert len(cubes) == 2
+        assert all(cube.is_connect() for cube in cubes)
+        assert {cube.get_address() for cube in cubes} == {
+            x.address for x in cache.cubes()
+        }
+    assert "already connected" not in caplog.text
+
+    with pytest.raises(ValueError):
+        MultipleToioCoreCubes(2, scanner=SimulatedScanner, scan_cache=cache)
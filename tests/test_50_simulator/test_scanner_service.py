@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_scanner_service.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+import toio.scanner.service as service
+from toio.scanner import PresenceEvent, ScannerService
+from toio.toio_uuid import TOIO_UUID_SERVICE
+
+logger = getLogger(__name__)
+
+
+class FakeBleakScanner:
+    """Scanner whose advertisements are given by advertise()"""
+
+    instance = None
+
+    def __init__(self, detection_callback, backend=None):
+        self._callback = detection_callback
+        self.running = False
+        FakeBleakScanner.instance = self
+
+    async def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+
+    def advertise(self, address, name, rssi, service_uuid=str(TOIO_UUID_SERVICE)):
+        device = BLEDevice(address, name, None, rssi=rssi)
+        advertisement = AdvertisementData(
+            local_name=name,
+            manufacturer_data={},
+            service_data={},
+            service_uuids=[service_uuid],
+            tx_power=None,
+            rssi=rssi,
+            platform_data=(),
+        )
+        self._callback(device, advertisement)
+
+
+@pytest.mark.asyncio
+async def test_presence_tracking(monkeypatch):
+    monkeypatch.setattr(service, "BleakScanner", FakeBleakScanner)
+    events = []
+
+    def on_event(event: PresenceEvent):
+        events.append((event.type, event.cube.address))
+
+    async with ScannerService(lost_timeout=0.4, rssi_alpha=0.5) as scanner:
+        scanner.register_event_handler(on_event)
+        fake = FakeBleakScanner.instance
+        assert fake is not None and fake.running
+
+        waiter = asyncio.ensure_future(scanner.wait_for_cube(cube_id="B02"))
+        fake.advertise("00:00:00:00:00:01", "toio Core Cube-A01", -60)
+        fake.advertise("00:00:00:00:00:01", "toio Core Cube-A01", -40)
+        fake.advertise("00:00:00:00:00:02", "toio Core Cube-B02", -70)
+        fake.advertise(
+            "00:00:00:00:00:09",
+            "other device",
+            -30,
+            "0000180f-0000-1000-8000-00805f9b34fb",
+        )
+        presence = await asyncio.wait_for(waiter, 1.0)
+        assert presence is not None
+        assert presence.address == "00:00:00:00:00:02"
+
+        cube = scanner.get("00:00:00:00:00:01")
+        assert cube is not None
+        assert cube.rssi == pytest.approx(-50.0)
+        assert cube.last_rssi == -40
+        assert [x.address for x in scanner.cubes()] == [
+            "00:00:00:00:00:01",
+            "00:00:00:00:00:02",
+        ]
+        assert scanner.get("00:00:00:00:00:09") is None
+
+        await asyncio.sleep(0.3)
+        fake.advertise("00:00:00:00:00:01", "toio Core Cube-A01", -40)
+        await asyncio.sleep(0.3)
+        assert [x.address for x in scanner.cubes()] == ["00:00:00:00:00:01"]
+        fake.advertise("00:00:00:00:00:02", "toio Core Cube-B02", -70)
+        assert scanner.find(cube_id="B02") is not None
+    assert not fake.running
+    assert events == [
+        ("appeared", "00:00:00:00:00:01"),
+        ("appeared", "00:00:00:00:00:02"),
+        ("disappeared", "00:00:00:00:00:02"),
+        ("appeared", "00:00:00:00:00:02"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_filtered_service(monkeypatch):
+    monkeypatch.setattr(service, "BleakScanner", FakeBleakScanner)
+    async with ScannerService(address={"00:00:00:00:00:02"}) as scanner:
+        fake = FakeBleakScanner.instance
+        fake.advertise("00:00:00:00:00:01", "toio Core Cube-A01", -60)
+        fake.advertise("00:00:00:00:00:02", "toio Core Cube-31j", -60)
+        assert [x.address for x in scanner.cubes()] == ["00:00:00:00:00:02"]
+        assert scanner.cubes()[0].is_31j
+        assert await scanner.wait_for_cube(cube_id="A01", timeout=0.1) is None
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     test_simulated_cube.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from toio.cube import (
+    AccelerationDirection,
+    AccelerationPriority,
+    AccelerationRotation,
+    IdInformation,
+    Motor,
+    MultipleToioCoreCubes,
+    PositionId,
+    ResponseMotorControlTarget,
+    ToioCoreCube,
+)
+from toio.device_interface.simulator import SimulatedCube, SimulatedScanner
+from toio.position import CubeLocation, Point
+
+logger = getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_simulated_connect():
+    cube = ToioCoreCube(interface=SimulatedCube())
+    assert not cube.is_connect()
+    await cube.connect()
+    assert cube.is_connect()
+    assert cube.protocol_version is not None
+    assert cube.protocol_version.version == "2.4.0"
+    battery = await cube.api.battery.read()
+    assert battery is not None and battery.battery_level == 100
+    await cube.disconnect()
+    assert not cube.is_connect()
+
+
+@pytest.mark.asyncio
+async def test_simulated_motor_control_acceleration():
+    interface = SimulatedCube(location=CubeLocation.from_int(250, 250, 0))
+    async with ToioCoreCube(interface=interface) as cube:
+        await cube.api.motor.motor_control_acceleration(
+            translation=50,
+            acceleration=0,
+            rotation_velocity=0,
+            rotation_direction=AccelerationRotation.Positive,
+            cube_direction=AccelerationDirection.Forward,
+            priority=AccelerationPriority.TranslationalVelocity,
+            duration_ms=0,
+        )
+        assert interface.motor_speed == (50, 50)
+
+        await cube.api.motor.motor_control_acceleration(
+            translation=50,
+            acceleration=0,
+            rotation_velocity=0,
+            rotation_direction=AccelerationRotation.Positive,
+            cube_direction=AccelerationDirection.Backward,
+            priority=AccelerationPriority.TranslationalVelocity,
+            duration_ms=0,
+        )
+        assert interface.motor_speed == (-50, -50)
+
+        # turning clockwise on the spot
+        await cube.api.motor.motor_control_acceleration(
+            translation=0,
+            acceleration=0,
+            rotation_velocity=90,
+            rotation_direction=AccelerationRotation.Positive,
+            cube_direction=AccelerationDirection.Forward,
+            priority=AccelerationPriority.RotationalVelocity,
+            duration_ms=100,
+        )
+        left, right = interface.motor_speed
+        assert left > 0 and right == -left
+        await asyncio.sleep(0.3)
+        assert interface.motor_speed == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_simulated_motor_control_target():
+    interface = SimulatedCube(location=CubeLocation.from_int(250, 250, 0))
+    positions = []
+    responses = []
+
+    def id_handler(payload: bytearray):
+        id_info = IdInformation.is_my_data(payload)
+        if isinstance(id_info, PositionId):
+            positions.append(id_info)
+
+    def motor_handler(payload: bytearray):
+        response = Motor.is_my_data(payload)
+        if isinstance(response, ResponseMotorControlTarget):
+            responses.append(response)
+
+    async with ToioCoreCube(interface=interface) as cube:
+        await cube.api.id_information.register_notification_handler(id_handler)
+        await cube.api.motor.register_notification_handler(motor_handler)
+        await cube.api.motor.motor_control_target(
+            timeout=5, movement_type=0, speed=(80, 0), target=(300, 200, 90, 0)
+        )
+        for _ in range(50):
+            if responses:
+                break
+            await asyncio.sleep(0.1)
+
+    assert len(responses) == 1
+    assert responses[0].response_code.value == 0
+    assert len(positions) > 0
+    assert positions[-1].center.point.distance(Point(300, 200)) < 10
+    logger.info("arrived: %s", str(positions[-1]))
+
+
+@pytest.mark.asyncio
+async def test_simulated_scanner():
+    async with MultipleToioCoreCubes(
+        cubes=3, names=("a", "b", "c"), scanner=SimulatedScanner
+    ) as cubes:
+        assert len(cubes) == 3
+        for cube in cubes:
+            assert cube.is_connect()
+        assert cubes.named("a").name != cubes.named("b").name
+
+    found = await SimulatedScanner().scan_with_address({"00:11:22:33:44:55"})
+    assert len(found) == 1
+    assert found[0].device.address == "00:11:22:33:44:55"
@@ -13,6 +13,7 @@ from .coordinate_systems import (
 )
 from .cube import ToioCoreCube
 from .cube.api import ToioCoreCubeLowLevelAPI
+from .cube.api.base_class import CommandCache, PackedCommand, command_cache
 from .cube.api.battery import Battery, BatteryInformation, BatteryResponseType
 from .cube.api.button import Button, ButtonInformation, ButtonResponseType, ButtonState
 from .cube.api.configuration import (
@@ -36,6 +37,7 @@ from .cube.api.id_information import (
     IdInformationResponseType,
     PositionId,
     PositionIdMissed,
+    PositionIdRawData,
     StandardId,
     StandardIdMissed,
 )
@@ -68,11 +70,21 @@ from .cube.api.sensor import (
     SensorResponseType,
 )
 from .cube.api.sound import MidiNote, Note, Sound, SoundId
+from .cube.command_channel import CommandChannel
 from .cube.multi_cubes import MultipleToioCoreCubes
+from .cube.notification_buffer import NotificationBuffer, ReceivedNotification
+from .cube.notification_dispatcher import DispatchMode
 from .cube.notification_handler_info import (
     NotificationHandlerInfo,
     NotificationHandlerTypes,
 )
+from .cube.notification_stream import (
+    NotificationMessage,
+    NotificationStream,
+    OverflowPolicy,
+)
+from .cube.profile import CubeProfile
+from .cube.scheduler import CommandRecord, CommandScheduler
 from .position import (
     CoordinateSystemABC,
     CubeLocation,
@@ -82,7 +94,17 @@ from .position import (
     RelativeCubeLocation,
     ToioMat,
 )
-from .scanner import BLEScanner
+from .scanner import (
+    BLEScanner,
+    CachedCube,
+    CubePresence,
+    PresenceEvent,
+    RssiKey,
+    RssiPolicy,
+    RssiStatistics,
+    ScanCache,
+    ScannerService,
+)
 
 __all__ = [
     # .coordinate_system
@@ -90,13 +112,33 @@ __all__ = [
     "VisualProgrammingCoordinateSystem",
     # .cube
     "ToioCoreCube",
+    # .cube.command_channel
+    "CommandChannel",
     # .cube.multi_cubes
     "MultipleToioCoreCubes",
+    # .cube.notification_buffer
+    "NotificationBuffer",
+    "ReceivedNotification",
+    # .cube.notification_dispatcher
+    "DispatchMode",
     # .cube.notification_handler_info
     "NotificationHandlerInfo",
     "NotificationHandlerTypes",
+    # .cube.notification_stream
+    "NotificationMessage",
+    "NotificationStream",
+    "OverflowPolicy",
+    # .cube.profile
+    "CubeProfile",
+    # .cube.scheduler
+    "CommandScheduler",
+    "CommandRecord",
     # .cube.api
     "ToioCoreCubeLowLevelAPI",
+    # .cube.api.base_class
+    "PackedCommand",
+    "CommandCache",
+    "command_cache",
     # .cube.api.battery
     "BatteryResponseType",
     "BatteryInformation",
@@ -124,6 +166,7 @@ __all__ = [
     # .cube.api.id_information
     "IdInformationResponseType",
     "PositionId",
+    "PositionIdRawData",
     "StandardId",
     "PositionIdMissed",
     "StandardIdMissed",
@@ -172,4 +215,12 @@ __all__ = [
     "ToioMat",
     # .scanner
     "BLEScanner",
+    "CachedCube",
+    "ScanCache",
+    "CubePresence",
+    "PresenceEvent",
+    "ScannerService",
+    "RssiKey",
+    "RssiPolicy",
+    "RssiStatistics",
 ]
@@ -14,6 +14,7 @@ from uuid import UUID
 
 from typing_extensions import (
     Any,
+    Dict,
     Iterable,
     List,
     Optional,
@@ -34,6 +35,7 @@ from ..device_interface import (
 )
 from ..scanner import UniversalBleScanner
 from .api import ToioCoreCubeLowLevelAPI
+from .api.base_class import CommandCache, PackedCommand, command_cache
 from .api.battery import Battery, BatteryInformation, BatteryResponseType
 from .api.button import Button, ButtonInformation, ButtonResponseType, ButtonState
 from .api.configuration import (
@@ -57,6 +59,7 @@ from .api.id_information import (
     IdInformationResponseType,
     PositionId,
     PositionIdMissed,
+    PositionIdRawData,
     StandardId,
     StandardIdMissed,
 )
@@ -89,8 +92,14 @@ from .api.sensor import (
     SensorResponseType,
 )
 from .api.sound import MidiNote, Note, Sound, SoundId
+from .command_channel import CommandChannel
 from .multi_cubes import MultipleToioCoreCubes
+from .notification_buffer import NotificationBuffer, ReceivedNotification
+from .notification_dispatcher import DispatchMode
 from .notification_handler_info import NotificationHandlerInfo, NotificationHandlerTypes
+from .notification_stream import NotificationMessage, NotificationStream, OverflowPolicy
+from .profile import CubeProfile
+from .scheduler import CommandRecord, CommandScheduler
 
 CubeInitializer: TypeAlias = Union[CubeInterface, CubeInfo]
 
@@ -123,12 +132,20 @@ class ToioCoreCube(CubeInterface):
         api (ToioCoreCubeLowLevelAPI): API class
         protocol_version (Optional[ProtocolVersion]): protocol version of the cube
         max_retry_to_get_protocol_version (int): number of retries to get protocol version
+        protocol_version_timeout (float): timeout [s] to wait for
+            the protocol version response to each request
+        protocol_version_total_timeout (float): timeout [s] to get
+            the protocol version including the retries
+        cache_protocol_version (bool): if True, the protocol version is cached
+            and the cached one of the same BLE address is used without requesting it
 
     """
 
     SUPPORTED_MAJOR_VERSION: int = 2
     SUPPORTED_MINOR_VERSION: int = 4
     _LOCK: Optional[asyncio.Lock] = None
+    _PROTOCOL_VERSION_CACHE: Dict[str, ProtocolVersion] = {}
+    COMMAND_CHANNEL_FLUSH_TIMEOUT: float = 1.0
 
     @staticmethod
     def create(initializer: Union[CubeInitializer, Sequence]) -> ToioCoreCube:
@@ -201,9 +218,22 @@ class ToioCoreCube(CubeInterface):
         self.name = name
         self._scanner = scanner
         self._scanner_args = scanner_args
+        self._api: Optional[ToioCoreCubeLowLevelAPI] = None
 
         self.protocol_version: Optional[ProtocolVersion] = None
         self.max_retry_to_get_protocol_version: int = 10
+        self.protocol_version_timeout: float = 1.0
+        self.protocol_version_total_timeout: float = 3.0
+        self.cache_protocol_version: bool = False
+
+    @property
+    def api(self) -> ToioCoreCubeLowLevelAPI:
+        """
+        API class (created by connect())
+        """
+        if self._api is None:
+            raise AttributeError("api is created by connect()")
+        return self._api
 
     async def __aenter__(self):
         assert ToioCoreCube._LOCK is not None
@@ -225,23 +255,15 @@ class ToioCoreCube(CubeInterface):
 
     async def connect(self) -> bool:
         assert self.interface is not None
-        self.api = ToioCoreCubeLowLevelAPI(interface=self.interface, root_device=self)
-        connect_result = await self.interface.connect()
-        while not self.interface.is_connect():
-            await asyncio.sleep(0.1)
+        self._api = ToioCoreCubeLowLevelAPI(interface=self.interface, root_device=self)
+        if self.interface.is_connect():
+            # e.g. the cubes found by UniversalBleScanner.scan_cached()
+            connect_result = True
+        else:
+            connect_result = await self.interface.connect()
         if connect_result is True:
-            self.protocol_version = None
-            await self.api.configuration.request_protocol_version()
-            retry_count = 0
-            while (
-                self.protocol_version is None
-                and retry_count < self.max_retry_to_get_protocol_version
-            ):
-                retry_count += 1
-                received_data = await self.api.configuration._read()
-                if ProtocolVersion.is_myself(received_data):
-                    self.protocol_version = ProtocolVersion(received_data)
-                    await asyncio.sleep(0.1)
+            await self.interface.wait_connected()
+            self.protocol_version = await self._get_protocol_version()
             if self.protocol_version is not None:
                 if (
                     self.protocol_version._major != self.SUPPORTED_MAJOR_VERSION
@@ -257,9 +279,94 @@ class ToioCoreCube(CubeInterface):
                     )
         return connect_result
 
+    async def _get_protocol_version(self) -> Optional[ProtocolVersion]:
+        assert self.interface is not None
+        address = self.interface.get_address()
+        if self.cache_protocol_version and address is not None:
+            protocol_version = ToioCoreCube._PROTOCOL_VERSION_CACHE.get(address)
+            if protocol_version is not None:
+                return protocol_version
+
+        configuration = self.api.configuration
+        protocol_version = None
+        # the response may have been received before notification was enabled
+        received_data = await configuration._read()
+        if len(received_data) > 0 and ProtocolVersion.is_myself(received_data):
+            protocol_version = ProtocolVersion(received_data)
+        else:
+            # the notification is enabled once for all the retries,
+            # so that a late response to a retry is also received
+            await configuration._hold_root_notification_handler()
+            try:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.protocol_version_total_timeout
+                for _ in range(self.max_retry_to_get_protocol_version):
+                    remaining = deadline - loop.time()
+                    if remaining <= 0.0:
+                        break
+                    protocol_version = await configuration.get_protocol_version(
+                        timeout=min(self.protocol_version_timeout, remaining)
+                    )
+                    if protocol_version is not None:
+                        break
+            finally:
+                await configuration._release_root_notification_handler()
+
+        if (
+            self.cache_protocol_version
+            and protocol_version is not None
+            and address is not None
+        ):
+            ToioCoreCube._PROTOCOL_VERSION_CACHE[address] = protocol_version
+        return protocol_version
+
     async def disconnect(self) -> bool:
         assert self.interface is not None
-        return await self.interface.disconnect()
+        if self._api is None:
+            return await self.interface.disconnect()
+        await self._api.motor.disable_command_channel(
+            self.COMMAND_CHANNEL_FLUSH_TIMEOUT
+        )
+        try:
+            return await self.interface.disconnect()
+        finally:
+            # tasks of the handler functions in concurrent dispatch mode
+            for characteristic in self._api._characteristics:
+                await characteristic._close_handler_workers()
+
+    async def enable_motor_command_channel(
+        self, limit_rate: bool = True, timeout: Optional[float] = 1.0
+    ) -> CommandChannel:
+        """
+        Send motor commands through a latest-wins command channel
+
+        See Motor.enable_command_channel().
+        When `limit_rate` is True, the writes are limited to one per
+        current connection interval of the cube, so that unsent commands
+        are replaced by newer ones instead of waiting in the BLE stack.
+        If the connection interval can not be obtained, the rate is not limited.
+
+        Args:
+            limit_rate (bool): limit the rate of writes by the connection interval
+            timeout (Optional[float]): timeout [s] to get the connection interval
+
+        Returns:
+            CommandChannel: the channel
+        """
+        min_interval = 0.0
+        if limit_rate:
+            response = (
+                await self.api.configuration.get_current_connection_interval_value(
+                    timeout
+                )
+            )
+            if response is not None:
+                min_interval = response.interval.value_ms / 1000.0
+        return self.api.motor.enable_command_channel(min_interval)
+
+    def get_address(self) -> Optional[str]:
+        assert self.interface is not None
+        return self.interface.get_address()
 
     async def read(self, char_uuid: UUID) -> GattReadData:
         assert self.interface is not None
@@ -285,15 +392,55 @@ class ToioCoreCube(CubeInterface):
         assert self.interface is not None
         return self.interface.is_connect()
 
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """
+        wait until the cube is connected
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            bool: False if timed out
+        """
+        assert self.interface is not None
+        return await self.interface.wait_connected(timeout)
+
+    async def wait_disconnected(self, timeout: Optional[float] = None) -> bool:
+        """
+        wait until the cube is disconnected
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            bool: False if timed out
+        """
+        assert self.interface is not None
+        return await self.interface.wait_disconnected(timeout)
+
 
 __all__: Tuple[str, ...] = (
     "CubeInitializer",
     "ToioCoreCube",
     "NotificationHandlerInfo",
     "NotificationHandlerTypes",
+    "DispatchMode",
+    "NotificationBuffer",
+    "ReceivedNotification",
+    "NotificationMessage",
+    "NotificationStream",
+    "OverflowPolicy",
+    "CommandChannel",
+    "CubeProfile",
     "MultipleToioCoreCubes",
+    "CommandScheduler",
+    "CommandRecord",
     # .api
     "ToioCoreCubeLowLevelAPI",
+    # .api.base_class
+    "PackedCommand",
+    "CommandCache",
+    "command_cache",
     # .api.battery
     "BatteryResponseType",
     "BatteryInformation",
@@ -321,6 +468,7 @@ __all__: Tuple[str, ...] = (
     # .api.id_information
     "IdInformationResponseType",
     "PositionId",
+    "PositionIdRawData",
     "StandardId",
     "PositionIdMissed",
     "StandardIdMissed",
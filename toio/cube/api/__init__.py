@@ -9,7 +9,7 @@
 
 from __future__ import annotations
 
-from typing_extensions import TypeAlias, Union
+from typing_extensions import Tuple, TypeAlias, Union
 
 from ...device_interface import CubeInterface
 from ..notification_handler_info import NotificationReceivedDevice
@@ -62,6 +62,19 @@ class ToioCoreCubeLowLevelAPI:
         self.sensor = Sensor(interface, root_device)
         self.sound = Sound(interface, root_device)
 
+    @property
+    def _characteristics(self) -> Tuple[CubeApi, ...]:
+        return (
+            self.battery,
+            self.button,
+            self.configuration,
+            self.id_information,
+            self.indicator,
+            self.motor,
+            self.sensor,
+            self.sound,
+        )
+
     @property
     def version(self) -> str:
         DeprecationWarning(
@@ -11,10 +11,22 @@ from __future__ import annotations
 
 import asyncio
 import binascii
+import time
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict, deque
 from uuid import UUID
 
-from typing_extensions import Any, Dict, Optional, cast
+from typing_extensions import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
 from ...device_interface import (
     CubeInterface,
@@ -24,14 +36,18 @@ from ...device_interface import (
     GattWriteData,
 )
 from ...logger import get_toio_logger
+from ..notification_buffer import NotificationBuffer, ReceivedNotification
+from ..notification_dispatcher import (
+    DispatchMode,
+    HandlerCall,
+    HandlerWorker,
+    make_handler_call,
+)
 from ..notification_handler_info import (
-    CubeNotificationHandler,
-    CubeNotificationHandlerAsync,
-    CubeNotificationHandlerWithParameter,
-    CubeNotificationHandlerWithParameterAsync,
     NotificationHandlerInfo,
     NotificationHandlerTypes,
 )
+from ..notification_stream import NotificationStream, OverflowPolicy
 
 logger = get_toio_logger(__name__)
 
@@ -50,6 +66,140 @@ class CubeCommand(metaclass=ABCMeta):
         raise NotImplementedError()
 
 
+class PackedCommand(CubeCommand):
+    """
+    Immutable and hashable command whose byte representation is packed once
+
+    bytes() of PackedCommand returns the packed bytes without packing again.
+    Two PackedCommands are equal when their byte representations are equal.
+
+    >>> stop = PackedCommand(MotorControl(0, 0, None))
+    >>> await cubes.broadcast("motor", stop)
+    """
+
+    __slots__ = ("_data", "_command_type", "_hash")
+    _data: bytes
+    _command_type: Type[CubeCommand]
+    _hash: int
+
+    def __init__(self, command: CubeCommand):
+        """
+        Initialize PackedCommand
+
+        Args:
+            command (CubeCommand): command to be packed
+        """
+        if isinstance(command, PackedCommand):
+            data, command_type = command._data, command._command_type
+        else:
+            data, command_type = bytes(command), type(command)
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_command_type", command_type)
+        object.__setattr__(self, "_hash", hash(data))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PackedCommand is immutable")
+
+    @property
+    def command_type(self) -> Type[CubeCommand]:
+        """Class of the packed command"""
+        return self._command_type
+
+    def __bytes__(self) -> bytes:
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedCommand):
+            return self._data == other._data
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return "PackedCommand(%s: %s)" % (
+            self._command_type.__name__,
+            binascii.hexlify(self._data, " ").decode(),
+        )
+
+
+class CommandCache:
+    """
+    LRU cache of PackedCommand
+
+    Commands are keyed by the function (usually the class) creating the command
+    and its arguments, which must be hashable. Commands repeated often
+    (e.g. stop, turn off all, fixed colors and sounds) are packed only once.
+    Commands whose arguments keep changing (e.g. speeds in a control loop)
+    should not be cached, because almost every lookup misses.
+
+    >>> stop = command_cache.get(MotorControl, 0, 0, None)
+    >>> red = command_cache.get(TurningOnAndOff.from_int, 0, 255, 0, 0)
+    """
+
+    DEFAULT_MAXSIZE: int = 256
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Initialize CommandCache
+
+        Args:
+            maxsize (int): maximum number of cached commands
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0: %d" % maxsize)
+        self.maxsize = maxsize
+        self._cache: OrderedDict[Hashable, PackedCommand] = OrderedDict()
+        self.hits: int = 0
+        """Number of commands found in the cache"""
+        self.misses: int = 0
+        """Number of commands packed"""
+
+    def get(
+        self, factory: Callable[..., CubeCommand], *args: Hashable
+    ) -> PackedCommand:
+        """
+        Get the packed command created by factory(*args)
+
+        Args:
+            factory (Callable[..., CubeCommand]): class or function creating the command
+            *args (Hashable): arguments given to the factory
+
+        Returns:
+            PackedCommand: packed command
+        """
+        key = (factory, args)
+        packed = self._cache.get(key)
+        if packed is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return packed
+        packed = PackedCommand(factory(*args))
+        self.misses += 1
+        self._cache[key] = packed
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return packed
+
+    def clear(self) -> None:
+        """
+        Remove all cached commands
+        """
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+command_cache = CommandCache()
+"""Cache shared by the functions of characteristics"""
+
+
 class CubeResponse(metaclass=ABCMeta):
     @staticmethod
     @abstractmethod
@@ -85,6 +235,19 @@ class CubeCharacteristic(metaclass=ABCMeta):
         ] = {}
         self.notification_handler_is_registered = False
         self.handler_semaphore = asyncio.Semaphore(1)
+        self._dispatch_semaphore = asyncio.Semaphore(1)
+        self._handler_calls: Tuple[HandlerCall, ...] = ()
+        self._async_handler_calls: Tuple[HandlerCall, ...] = ()
+        self.notification_buffer: Optional[NotificationBuffer] = None
+        self._latest_decoded: Optional[
+            Tuple[ReceivedNotification, Optional[CubeResponse]]
+        ] = None
+        self._notification_streams: Tuple[NotificationStream, ...] = ()
+        self._response_waiters: Dict[int, Deque[asyncio.Future]] = {}
+        self._root_notification_handler_holds = 0
+        self.dispatch_mode: DispatchMode = "sequential"
+        self.max_pending_notifications = 16
+        self._handler_workers: Dict[NotificationHandlerTypes, HandlerWorker] = {}
 
     async def _read(self) -> GattReadData:
         """Raw interface to GATT for reading."""
@@ -120,22 +283,161 @@ class CubeCharacteristic(metaclass=ABCMeta):
     async def _root_notification_handler(
         self, _: GattCharacteristic, payload: bytearray
     ) -> None:
+        if self._response_waiters:
+            self._resolve_response_waiter(payload)
+        if self.notification_buffer is not None or self._notification_streams:
+            timestamp = time.monotonic()
+            if self.notification_buffer is not None:
+                self.notification_buffer.append(payload, timestamp)
+            for stream in self._notification_streams:
+                stream._put(timestamp, payload)
+        handler_calls = self._handler_calls
+        async_handler_calls = self._async_handler_calls
+        if not async_handler_calls:
+            for call in handler_calls:
+                call(payload)
+            return
+        async with self._dispatch_semaphore:
+            for call in handler_calls:
+                call(payload)
+            for call in async_handler_calls:
+                await call(payload)  # type: ignore[misc]
+
+    def _resolve_response_waiter(self, payload: bytearray) -> None:
+        if len(payload) == 0:
+            return
+        waiters = self._response_waiters.get(payload[0])
+        if waiters is None:
+            return
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(payload)
+                break
+        if not waiters:
+            del self._response_waiters[payload[0]]
+
+    async def _request(
+        self,
+        data: GattWriteData,
+        response_payload_id: int,
+        timeout: Optional[float] = None,
+    ) -> Optional[bytearray]:
+        """
+        Write data and wait for the notification of the response.
+
+        The response is the first notification whose payload id (the first byte)
+        is `response_payload_id` received after writing.
+        Requests waiting for the same payload id receive the responses
+        in the order of the requests.
+
+        Args:
+            data (GattWriteData): data to be written
+            response_payload_id (int): payload id of the response
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            Optional[bytearray]: payload of the response (None if timed out)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._response_waiters.setdefault(response_payload_id, deque()).append(future)
+        try:
+            if not self.notification_handler_is_registered:
+                async with self.handler_semaphore:
+                    await self._register_root_notification_handler()
+            await self._write(data)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._response_waiters.get(response_payload_id)
+            if waiters is not None:
+                if future in waiters:
+                    waiters.remove(future)
+                if not waiters:
+                    del self._response_waiters[response_payload_id]
+            async with self.handler_semaphore:
+                await self._unregister_root_notification_handler_if_unused()
+
+    def _compile_handler_calls(self) -> None:
+        # The table is replaced (not modified), so that handler functions
+        # can be registered and unregistered while dispatching.
+        # Sync calls (including the queues of the workers in concurrent mode)
+        # and async calls are separated, so that dispatching needs no branch.
+        calls: List[HandlerCall] = []
+        async_calls: List[HandlerCall] = []
+        workers: Dict[NotificationHandlerTypes, HandlerWorker] = {}
+        for func, handler_info in self.notification_handler_dict.items():
+            call = make_handler_call(func, handler_info)
+            if call is None:
+                continue
+            if self.dispatch_mode == "concurrent" and handler_info.is_async:
+                worker = self._handler_workers.pop(func, None)
+                if worker is None:
+                    worker = HandlerWorker(call, self.max_pending_notifications)
+                workers[func] = worker
+                calls.append(worker.put)
+            elif handler_info.is_async:
+                async_calls.append(call)
+            else:
+                calls.append(call)
+        self._stop_handler_workers()
+        self._handler_workers = workers
+        self._handler_calls = tuple(calls)
+        self._async_handler_calls = tuple(async_calls)
+
+    async def set_dispatch_mode(
+        self, mode: DispatchMode, max_pending: int = 16
+    ) -> bool:
+        """
+        Change how the notification handler functions are called.
+
+        In "sequential" mode (default), the sync handler functions are called
+        and then the async handler functions are awaited, each in order of
+        registration, and the next notification waits until all handler
+        functions return. So the latency of a notification
+        is the sum of the latencies of all handler functions.
+
+        In "concurrent" mode, notifications are not serialized.
+        Sync handler functions are called directly,
+        and each async handler function runs in its own task
+        with a queue of up to `max_pending` notifications. When the queue
+        is full, the oldest notification for the handler function is discarded.
+        Exceptions raised in async handler functions are logged.
+
+        Args:
+            mode (DispatchMode): "sequential" or "concurrent"
+            max_pending (int): queue depth of each async handler function
+
+        Returns:
+            bool:
+        """
+        if mode not in ("sequential", "concurrent"):
+            raise ValueError("unknown dispatch mode: %s" % mode)
+        if max_pending < 1:
+            raise ValueError("max_pending must be greater than 0: %d" % max_pending)
         async with self.handler_semaphore:
-            for func, handler_info in self.notification_handler_dict.items():
-                if handler_info.is_async:
-                    if handler_info.num_of_args == 1:
-                        func = cast(CubeNotificationHandlerAsync, func)
-                        await func(payload)
-                    elif handler_info.num_of_args == 2:
-                        func = cast(CubeNotificationHandlerWithParameterAsync, func)
-                        await func(payload, handler_info)
-                else:
-                    if handler_info.num_of_args == 1:
-                        func = cast(CubeNotificationHandler, func)
-                        func(payload)
-                    elif handler_info.num_of_args == 2:
-                        func = cast(CubeNotificationHandlerWithParameter, func)
-                        func(payload, handler_info)
+            self._stop_handler_workers()
+            self.dispatch_mode = mode
+            self.max_pending_notifications = max_pending
+            self._compile_handler_calls()
+        return True
+
+    async def join_notification_handlers(self) -> None:
+        """
+        Wait until all queued notifications are handled. (concurrent mode)
+        """
+        for worker in tuple(self._handler_workers.values()):
+            await worker.join()
+
+    def _stop_handler_workers(self) -> None:
+        for worker in self._handler_workers.values():
+            worker.stop()
+
+    async def _close_handler_workers(self) -> None:
+        for worker in tuple(self._handler_workers.values()):
+            await worker.close()
+        self._handler_workers = {}
 
     async def register_notification_handler(
         self, handler: NotificationHandlerTypes, misc: Any = None
@@ -180,11 +482,8 @@ class CubeCharacteristic(metaclass=ABCMeta):
                 func=handler, device=self.device, interface=self.interface, misc=misc
             )
             self.notification_handler_dict[handler] = handler_info
-            if not self.notification_handler_is_registered:
-                await self._register_notification_handler(
-                    self._root_notification_handler
-                )
-                self.notification_handler_is_registered = True
+            self._compile_handler_calls()
+            await self._register_root_notification_handler()
         return True
 
     async def unregister_notification_handler(
@@ -195,13 +494,133 @@ class CubeCharacteristic(metaclass=ABCMeta):
         async with self.handler_semaphore:
             if handler is None:
                 self.notification_handler_dict.clear()
+                self._compile_handler_calls()
                 return True
             if handler in self.notification_handler_dict:
                 self.notification_handler_dict.pop(handler)
-            if (
-                len(self.notification_handler_dict) == 0
-                and self.notification_handler_is_registered
-            ):
-                await self._unregister_notification_handler()
-                self.notification_handler_is_registered = False
+                self._compile_handler_calls()
+            await self._unregister_root_notification_handler_if_unused()
+        return True
+
+    async def _register_root_notification_handler(self) -> None:
+        if not self.notification_handler_is_registered:
+            await self._register_notification_handler(self._root_notification_handler)
+            self.notification_handler_is_registered = True
+
+    async def _hold_root_notification_handler(self) -> None:
+        """
+        Keep the root notification handler registered until
+        _release_root_notification_handler() is called
+        (e.g. to send requests repeatedly without enabling and disabling
+        the notification for each request)
+        """
+        async with self.handler_semaphore:
+            await self._register_root_notification_handler()
+            self._root_notification_handler_holds += 1
+
+    async def _release_root_notification_handler(self) -> None:
+        async with self.handler_semaphore:
+            self._root_notification_handler_holds -= 1
+            await self._unregister_root_notification_handler_if_unused()
+
+    async def _unregister_root_notification_handler_if_unused(self) -> None:
+        if (
+            len(self.notification_handler_dict) == 0
+            and self.notification_buffer is None
+            and len(self._notification_streams) == 0
+            and len(self._response_waiters) == 0
+            and self._root_notification_handler_holds == 0
+            and self.notification_handler_is_registered
+        ):
+            await self._unregister_notification_handler()
+            self.notification_handler_is_registered = False
+
+    async def enable_notification_buffer(self, capacity: int = 64) -> bool:
+        """
+        Keep received notifications in a ring buffer.
+
+        After calling this function, the notifications are stored in
+        `notification_buffer` with the received time, and the latest one
+        can be obtained by `latest()` without registering handler functions.
+
+        Args:
+            capacity (int): maximum number of notifications to be kept
+
+        Returns:
+            bool:
+        """
+        async with self.handler_semaphore:
+            self.notification_buffer = NotificationBuffer(capacity)
+            self._latest_decoded = None
+            await self._register_root_notification_handler()
         return True
+
+    async def disable_notification_buffer(self) -> bool:
+        """
+        Stop keeping received notifications.
+
+        Returns:
+            bool:
+        """
+        async with self.handler_semaphore:
+            self.notification_buffer = None
+            self._latest_decoded = None
+            await self._unregister_root_notification_handler_if_unused()
+        return True
+
+    def latest(self) -> Optional[CubeResponse]:
+        """
+        Get the latest notification as CubeResponse.
+
+        The notification buffer must be enabled by `enable_notification_buffer()`.
+        The payload is decoded by `is_my_data()` when this function is called
+        for the first time after receiving it.
+
+        Returns:
+            Optional[CubeResponse]: None if no notification is received
+        """
+        if self.notification_buffer is None:
+            raise RuntimeError("notification buffer is not enabled")
+        received = self.notification_buffer.latest()
+        if received is None:
+            return None
+        latest_decoded = self._latest_decoded
+        if latest_decoded is not None and latest_decoded[0] is received:
+            return latest_decoded[1]
+        decoded = self.is_my_data(received.payload)
+        self._latest_decoded = (received, decoded)
+        return decoded
+
+    def stream(
+        self, maxsize: int = 64, overflow: OverflowPolicy = "drop_oldest"
+    ) -> NotificationStream:
+        """
+        Get received notifications with 'async for'.
+
+        The notifications are put into a bounded queue without blocking
+        the notification handler, and decoded by `is_my_data()` when
+        `NotificationMessage.response` is accessed.
+
+        >>> async for msg in cube.api.sensor.stream(maxsize=16):
+        >>>     print(msg.timestamp, msg.response)
+
+        Args:
+            maxsize (int): maximum number of notifications in the queue
+            overflow (OverflowPolicy): "drop_oldest" or "drop_newest"
+
+        Returns:
+            NotificationStream:
+        """
+        return NotificationStream(self, maxsize, overflow)
+
+    async def _add_notification_stream(self, stream: NotificationStream) -> None:
+        async with self.handler_semaphore:
+            self._notification_streams = self._notification_streams + (stream,)
+            await self._register_root_notification_handler()
+
+    async def _remove_notification_stream(self, stream: NotificationStream) -> None:
+        async with self.handler_semaphore:
+            self._notification_streams = tuple(
+                x for x in self._notification_streams if x is not stream
+            )
+            await self._unregister_root_notification_handler_if_unused()
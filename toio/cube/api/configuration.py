@@ -11,7 +11,7 @@ import pprint
 import struct
 from enum import IntEnum
 
-from typing_extensions import Optional, TypeAlias, Union
+from typing_extensions import Dict, Optional, Type, TypeAlias, Union
 
 from ...device_interface import CubeInterface, GattReadData
 from ...logger import get_toio_logger
@@ -687,6 +687,23 @@ class Configuration(CubeCharacteristic):
         https://toio.github.io/toio-spec/en/docs/ble_configuration
     """
 
+    _RESPONSE_TYPES: Dict[Type[CubeCommand], Type[ConfigurationResponseType]] = {
+        RequestProtocolVersion: ProtocolVersion,
+        SetIdNotification: ResponseIdNotificationSettings,
+        SetIdMissedNotification: ResponseIdMissedNotificationSettings,
+        SetMagneticSensor: ResponseMagneticSensorSettings,
+        SetMotorSpeedInformationAcquisition: (
+            ResponseMotorSpeedInformationAcquisitionSettings
+        ),
+        SetPostureAngleDetection: ResponsePostureAngleDetectionSettings,
+        RequestConnectionInterval: ResponseConnectionIntervalRequest,
+        GetRequestedConnectionIntervalValue: ResponseGettingRequestedConnectionInterval,
+        GetCurrentConnectionIntervalValue: ResponseGettingCurrentConnectionInterval,
+    }
+    """
+    Response type of each command
+    """
+
     @staticmethod
     def is_my_data(payload: GattReadData) -> Optional[ConfigurationResponseType]:
         if ProtocolVersion.is_myself(payload):
@@ -729,6 +746,76 @@ class Configuration(CubeCharacteristic):
         command = RequestProtocolVersion()
         await self._write(bytes(command))
 
+    async def get_protocol_version(
+        self, timeout: Optional[float] = 1.0
+    ) -> Optional[ProtocolVersion]:
+        """
+        Send protocol version request command and wait for the response
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            Optional[ProtocolVersion]: None if timed out
+
+        References:
+            https://toio.github.io/toio-spec/en/docs/ble_configuration#requesting-the-ble-protocol-version
+        """
+        response = await self.request(RequestProtocolVersion(), timeout)
+        assert response is None or isinstance(response, ProtocolVersion)
+        return response
+
+    async def request(
+        self, command: CubeCommand, timeout: Optional[float] = 1.0
+    ) -> Optional[ConfigurationResponseType]:
+        """
+        Send a command and wait for the response
+
+        The response is matched to the command by the payload id.
+        Several requests can be outstanding at the same time
+        (e.g. awaited together by asyncio.gather()).
+        Requests with the same command receive the responses in the order
+        of the requests.
+
+        >>> await asyncio.gather(
+        >>>     cube.api.configuration.request(
+        >>>         SetIdNotification(100, NotificationCondition.Always)
+        >>>     ),
+        >>>     cube.api.configuration.request(
+        >>>         SetMagneticSensor(
+        >>>             MagneticSensorFunction.MagnetState,
+        >>>             100,
+        >>>             MagneticSensorCondition.Always,
+        >>>         )
+        >>>     ),
+        >>> )
+
+        Args:
+            command (CubeCommand): command which has a response
+                (RequestProtocolVersion, SetIdNotification, SetIdMissedNotification,
+                SetMagneticSensor, SetMotorSpeedInformationAcquisition,
+                SetPostureAngleDetection, RequestConnectionInterval,
+                GetRequestedConnectionIntervalValue, GetCurrentConnectionIntervalValue)
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            Optional[ConfigurationResponseType]: None if timed out
+
+        Exceptions:
+            ValueError: the command has no response
+        """
+        response_type = self._RESPONSE_TYPES.get(type(command))
+        if response_type is None:
+            raise ValueError("no response is defined: %s" % type(command).__name__)
+        payload = await self._request(
+            bytes(command),
+            response_type._payload_id,  # type: ignore[attr-defined]
+            timeout,
+        )
+        if payload is None:
+            return None
+        return response_type(payload)
+
     async def set_horizontal_detection_threshold(self, threshold: int) -> None:
         """
         Send horizontal detection threshold setting command
@@ -758,7 +845,7 @@ class Configuration(CubeCharacteristic):
         References:
             https://toio.github.io/toio-spec/en/docs/ble_configuration#collision-detection-threshold-settings
         """
-        command = SetHorizontalDetectionThreshold(threshold)
+        command = SetCollisionDetectionThreshold(threshold)
         await self._write(bytes(command))
 
     async def set_double_tap_detection_threshold(self, threshold: int) -> None:
@@ -912,6 +999,27 @@ class Configuration(CubeCharacteristic):
         command = GetRequestedConnectionIntervalValue()
         await self._write(bytes(command))
 
+    async def get_requested_connection_interval_value(
+        self, timeout: Optional[float] = 1.0
+    ) -> Optional[ResponseGettingRequestedConnectionInterval]:
+        """
+        Get requested connection interval value and wait for the response.
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            Optional[ResponseGettingRequestedConnectionInterval]: None if timed out
+
+        References:
+            https://toio.github.io/toio-spec/en/docs/ble_configuration#obtaining-the-requested-connection-interval-value-
+        """
+        response = await self.request(GetRequestedConnectionIntervalValue(), timeout)
+        assert response is None or isinstance(
+            response, ResponseGettingRequestedConnectionInterval
+        )
+        return response
+
     async def get_current_connection_interval(self) -> None:
         """
         Get current connection interval value.
@@ -922,3 +1030,24 @@ class Configuration(CubeCharacteristic):
         """
         command = GetCurrentConnectionIntervalValue()
         await self._write(bytes(command))
+
+    async def get_current_connection_interval_value(
+        self, timeout: Optional[float] = 1.0
+    ) -> Optional[ResponseGettingCurrentConnectionInterval]:
+        """
+        Get current connection interval value and wait for the response.
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            Optional[ResponseGettingCurrentConnectionInterval]: None if timed out
+
+        References:
+            https://toio.github.io/toio-spec/en/docs/ble_configuration#obtaining-the-actual-connection-interval-value-
+        """
+        response = await self.request(GetCurrentConnectionIntervalValue(), timeout)
+        assert response is None or isinstance(
+            response, ResponseGettingCurrentConnectionInterval
+        )
+        return response
@@ -9,8 +9,9 @@
 
 import pprint
 import struct
+from functools import cached_property
 
-from typing_extensions import Optional, Union
+from typing_extensions import Dict, NamedTuple, Optional, Type, Union
 
 from ...device_interface import CubeInterface, GattReadData
 from ...position import CubeLocation, Point
@@ -19,31 +20,82 @@ from ..api.base_class import CubeCharacteristic, CubeResponse
 from ..notification_handler_info import NotificationReceivedDevice
 
 
+class PositionIdRawData(NamedTuple):
+    """
+    Position id information as raw integer values
+
+    Compact form of PositionId which does not create CubeLocation and Point.
+    """
+
+    center_x: int
+    center_y: int
+    center_angle: int
+    sensor_x: int
+    sensor_y: int
+    sensor_angle: int
+
+
 class PositionId(CubeResponse):
     """
     Position id information response
 
+    Attributes:
+        center (CubeLocation): Location of the cube center
+        sensor (CubeLocation): Location of the id sensor
+        raw (PositionIdRawData): Raw values of the position id information
+
+    Note:
+        center and sensor are created when they are accessed first.
+
     References:
         https://toio.github.io/toio-spec/en/docs/ble_id#position-id
     """
 
     _payload_id = 0x01
     _converter = struct.Struct("<BHHHHHH")
+    _raw_converter = struct.Struct("<xHHHHHH")
 
     @staticmethod
     def is_myself(payload: GattReadData) -> bool:
         return payload[0] == PositionId._payload_id
 
-    def __init__(self, payload: GattReadData):
-        if PositionId.is_myself(payload):
-            _, cx, cy, ca, sx, sy, sa = self._converter.unpack_from(payload)
-            self.center = CubeLocation(point=Point(cx, cy), angle=ca)
-            self.sensor = CubeLocation(point=Point(sx, sy), angle=sa)
+    @staticmethod
+    def unpack(payload: GattReadData) -> PositionIdRawData:
+        """
+        Convert payload to PositionIdRawData without creating PositionId
+
+        Args:
+            payload (GattReadData): received data from the cube.
+
+        Returns:
+            PositionIdRawData: raw values of the position id information
+        """
+        if payload[0] == PositionId._payload_id:
+            return PositionIdRawData._make(
+                PositionId._raw_converter.unpack_from(payload)
+            )
         else:
             raise TypeError("wrong payload")
 
+    def __init__(self, payload: GattReadData):
+        self.raw = PositionId.unpack(payload)
+
+    @cached_property
+    def center(self) -> CubeLocation:
+        raw = self.raw
+        return CubeLocation(
+            point=Point(raw.center_x, raw.center_y), angle=raw.center_angle
+        )
+
+    @cached_property
+    def sensor(self) -> CubeLocation:
+        raw = self.raw
+        return CubeLocation(
+            point=Point(raw.sensor_x, raw.sensor_y), angle=raw.sensor_angle
+        )
+
     def __str__(self) -> str:
-        return pprint.pformat(vars(self))
+        return pprint.pformat({"center": self.center, "sensor": self.sensor})
 
 
 class StandardId(CubeResponse):
@@ -137,16 +189,18 @@ class IdInformation(CubeCharacteristic):
         https://toio.github.io/toio-spec/en/docs/ble_id
     """
 
+    _response_types: Dict[int, Type[IdInformationResponseType]] = {
+        PositionId._payload_id: PositionId,
+        StandardId._payload_id: StandardId,
+        PositionIdMissed._payload_id: PositionIdMissed,
+        StandardIdMissed._payload_id: StandardIdMissed,
+    }
+
     @staticmethod
     def is_my_data(payload: GattReadData) -> Optional[IdInformationResponseType]:
-        if PositionId.is_myself(payload):
-            return PositionId(payload)
-        elif StandardId.is_myself(payload):
-            return StandardId(payload)
-        elif PositionIdMissed.is_myself(payload):
-            return PositionIdMissed(payload)
-        elif StandardIdMissed.is_myself(payload):
-            return StandardIdMissed(payload)
+        response_type = IdInformation._response_types.get(payload[0])
+        if response_type is not None:
+            return response_type(payload)
         else:
             return None
 
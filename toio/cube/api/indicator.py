@@ -18,7 +18,7 @@ from ...device_interface import CubeInterface, GattReadData
 from ...logger import get_toio_logger
 from ...toio_uuid import ToioUuid
 from ...utility import clip
-from ..api.base_class import CubeCharacteristic, CubeCommand
+from ..api.base_class import CubeCharacteristic, CubeCommand, command_cache
 from ..notification_handler_info import NotificationReceivedDevice
 
 logger = get_toio_logger(__name__)
@@ -88,6 +88,10 @@ class TurningOnAndOff(CubeCommand):
     def __init__(self, param: IndicatorParam):
         self.param = param
 
+    @staticmethod
+    def from_int(duration_ms: int, r: int, g: int, b: int) -> TurningOnAndOff:
+        return TurningOnAndOff(IndicatorParam.from_int(duration_ms, r, g, b))
+
     def __bytes__(self) -> bytes:
         return self._converter.pack(self._payload_id, *self.param.flatten())
 
@@ -102,6 +106,7 @@ class RepeatedTurningOnAndOff(CubeCommand):
 
     _payload_id = 0x04
     _converter = struct.Struct("<BBB")
+    _param_converter = struct.Struct("<BBBBBB")
     REPEAT_INFINITE = 0
 
     def __init__(
@@ -113,14 +118,16 @@ class RepeatedTurningOnAndOff(CubeCommand):
         self.param_list = param_list
 
     def __bytes__(self) -> bytes:
-        byte_representation = self._converter.pack(
-            self._payload_id, self.repeat, len(self.param_list)
+        offset = self._converter.size
+        item_size = self._param_converter.size
+        buffer = bytearray(offset + item_size * len(self.param_list))
+        self._converter.pack_into(
+            buffer, 0, self._payload_id, self.repeat, len(self.param_list)
         )
         for param in self.param_list:
-            byte_representation = byte_representation + struct.pack(
-                "<BBBBBB", *param.flatten()
-            )
-        return byte_representation
+            self._param_converter.pack_into(buffer, offset, *param.flatten())
+            offset += item_size
+        return bytes(buffer)
 
 
 class TurnOffAll(CubeCommand):
@@ -222,7 +229,7 @@ class Indicator(CubeCharacteristic):
         References:
             https://toio.github.io/toio-spec/en/docs/ble_light#turn-off-all-indicators
         """
-        turn_off = TurnOffAll()
+        turn_off = command_cache.get(TurnOffAll)
         await self._write(bytes(turn_off))
 
     async def turn_off(self, indicator_id: int) -> None:
@@ -235,5 +242,5 @@ class Indicator(CubeCharacteristic):
         References:
             https://toio.github.io/toio-spec/en/docs/ble_light#turn-off-a-specific-indicator
         """
-        turn_off = TurnOff(indicator_id)
+        turn_off = command_cache.get(TurnOff, indicator_id)
         await self._write(bytes(turn_off))
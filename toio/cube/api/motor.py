@@ -9,19 +9,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import pprint
 import struct
 from dataclasses import dataclass
 from enum import Enum, IntEnum
 
-from typing_extensions import List, Optional, Sequence, TypeAlias, Union
+from typing_extensions import Hashable, List, Optional, Sequence, TypeAlias, Union
 
 from ...device_interface import CubeInterface, GattReadData
 from ...logger import get_toio_logger
 from ...position import CubeLocation, Point
 from ...toio_uuid import ToioUuid
 from ...utility import clip
-from ..api.base_class import CubeCharacteristic, CubeCommand, CubeResponse
+from ..api.base_class import (
+    CubeCharacteristic,
+    CubeCommand,
+    CubeResponse,
+    command_cache,
+)
+from ..command_channel import CommandChannel
 from ..notification_handler_info import NotificationReceivedDevice
 
 logger = get_toio_logger(__name__)
@@ -253,6 +260,7 @@ class MotorControlMultipleTargets(CubeCommand):
 
     _payload_id = 0x04
     _converter = struct.Struct("<BBBBBBBB")
+    _target_converter = struct.Struct("<HHH")
 
     def __init__(
         self,
@@ -269,7 +277,12 @@ class MotorControlMultipleTargets(CubeCommand):
         self.target_list = target_list
 
     def __bytes__(self) -> bytes:
-        header = self._converter.pack(
+        offset = self._converter.size
+        item_size = self._target_converter.size
+        buffer = bytearray(offset + item_size * len(self.target_list))
+        self._converter.pack_into(
+            buffer,
+            0,
             self._payload_id,
             0x00,
             self.timeout,
@@ -278,10 +291,10 @@ class MotorControlMultipleTargets(CubeCommand):
             0x00,
             int(self.mode),
         )
-        body = bytes()
         for target in self.target_list:
-            body = body + struct.pack("<HHH", *target.flatten())
-        return header + body
+            self._target_converter.pack_into(buffer, offset, *target.flatten())
+            offset += item_size
+        return bytes(buffer)
 
     def __str__(self) -> str:
         return pprint.pformat(vars(self))
@@ -489,6 +502,8 @@ class Motor(CubeCharacteristic):
         https://toio.github.io/toio-spec/en/docs/ble_motor
     """
 
+    _COMMAND_KIND = "motor"
+
     @staticmethod
     def is_my_data(payload: GattReadData) -> Optional[MotorResponseType]:
         if ResponseMotorControlTarget.is_myself(payload):
@@ -502,8 +517,74 @@ class Motor(CubeCharacteristic):
 
     def __init__(self, interface: CubeInterface, device: NotificationReceivedDevice):
         self.interface = interface
+        self._command_channel: Optional[CommandChannel] = None
         super().__init__(interface, ToioUuid.Motor.value, device)
 
+    @property
+    def command_channel(self) -> Optional[CommandChannel]:
+        """
+        Command channel (None: disabled)
+        """
+        return self._command_channel
+
+    def enable_command_channel(self, min_interval: float = 0.0) -> CommandChannel:
+        """
+        Send motor commands through a latest-wins command channel
+
+        While the channel is enabled, motor control functions return
+        without waiting for the write. A motor command replaces the unsent
+        motor command, so that the latest command always wins
+        (commands of multiple targets with WriteMode.Append are never
+        replaced, and are written in order).
+
+        Args:
+            min_interval (float): minimum interval [s] between writes
+                (e.g. the connection interval,
+                see ToioCoreCube.enable_motor_command_channel())
+
+        Returns:
+            CommandChannel: the channel
+        """
+        if self._command_channel is None:
+            self._command_channel = CommandChannel(
+                self._write_without_response, min_interval
+            )
+        else:
+            self._command_channel.min_interval = min_interval
+        return self._command_channel
+
+    async def disable_command_channel(self, timeout: Optional[float] = None) -> None:
+        """
+        Write the commands in the channel and disable the channel
+
+        Args:
+            timeout (Optional[float]): timeout [s] to write the commands
+                (None: wait forever). Commands not written by then are discarded.
+        """
+        if self._command_channel is not None:
+            channel = self._command_channel
+            self._command_channel = None
+            try:
+                await asyncio.wait_for(channel.flush(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "command channel is closed before all commands are written"
+                )
+            finally:
+                channel.close()
+
+    async def _write_command(self, command: CubeCommand) -> None:
+        if self._command_channel is None:
+            await self._write_without_response(bytes(command))
+            return
+        kind: Hashable = self._COMMAND_KIND
+        if (
+            isinstance(command, MotorControlMultipleTargets)
+            and command.mode == WriteMode.Append
+        ):
+            kind = object()
+        self._command_channel.put(kind, bytes(command))
+
     async def motor_control(
         self, left: int, right: int, duration_ms: Optional[int] = None
     ) -> None:
@@ -518,8 +599,12 @@ class Motor(CubeCharacteristic):
         References:
             https://toio.github.io/toio-spec/en/docs/ble_motor#motor-control
         """
-        motor = MotorControl(left, right, duration_ms)
-        await self._write_without_response(bytes(motor))
+        if left == 0 and right == 0:
+            # stop is repeated often, while speeds usually keep changing
+            motor: CubeCommand = command_cache.get(MotorControl, 0, 0, duration_ms)
+        else:
+            motor = MotorControl(left, right, duration_ms)
+        await self._write_command(motor)
 
     async def motor_control_target(
         self,
@@ -547,7 +632,7 @@ class Motor(CubeCharacteristic):
         if isinstance(target, Sequence):
             target = TargetPosition.from_int(*target)
         motor_target = MotorControlTarget(timeout, movement_type, speed, target)
-        await self._write_without_response(bytes(motor_target))
+        await self._write_command(motor_target)
 
     async def motor_control_multiple_targets(
         self,
@@ -585,7 +670,7 @@ class Motor(CubeCharacteristic):
         motor_target = MotorControlMultipleTargets(
             timeout, movement_type, speed, mode, targets
         )
-        await self._write_without_response(bytes(motor_target))
+        await self._write_command(motor_target)
 
     async def motor_control_acceleration(
         self,
@@ -627,4 +712,4 @@ class Motor(CubeCharacteristic):
             priority,
             duration_ms,
         )
-        await self._write_without_response(bytes(motor_acceleration))
+        await self._write_command(motor_acceleration)
@@ -17,7 +17,7 @@ from ...device_interface import CubeInterface, GattReadData
 from ...logger import get_toio_logger
 from ...toio_uuid import ToioUuid
 from ...utility import clip
-from ..api.base_class import CubeCharacteristic, CubeCommand
+from ..api.base_class import CubeCharacteristic, CubeCommand, command_cache
 from ..notification_handler_info import NotificationReceivedDevice
 
 logger = get_toio_logger(__name__)
@@ -242,16 +242,23 @@ class PlayMidi(CubeCommand):
 
     _payload_id = 0x03
     _converter = struct.Struct("<BBB")
+    _note_converter = struct.Struct("<BBB")
 
     def __init__(self, repeat: int, notes: Union[List[MidiNote], Tuple[MidiNote, ...]]):
         self.repeat = repeat
         self.notes = notes
 
     def __bytes__(self) -> bytes:
-        byte_data = self._converter.pack(self._payload_id, self.repeat, len(self.notes))
+        offset = self._converter.size
+        item_size = self._note_converter.size
+        buffer = bytearray(offset + item_size * len(self.notes))
+        self._converter.pack_into(
+            buffer, 0, self._payload_id, self.repeat, len(self.notes)
+        )
         for note in self.notes:
-            byte_data = byte_data + struct.pack("<BBB", *note.flatten())
-        return byte_data
+            self._note_converter.pack_into(buffer, offset, *note.flatten())
+            offset += item_size
+        return bytes(buffer)
 
 
 class Stop(CubeCommand):
@@ -292,7 +299,7 @@ class Sound(CubeCharacteristic):
             sound_id (SoundId): Sound ID
             volume (int): Volume
         """
-        sound_effect = PlaySoundEffect(sound_id, volume)
+        sound_effect = command_cache.get(PlaySoundEffect, sound_id, volume)
         await self._write(bytes(sound_effect))
 
     async def play_midi(
@@ -312,5 +319,5 @@ class Sound(CubeCharacteristic):
         """
         Send sound stop command
         """
-        stop = Stop()
+        stop = command_cache.get(Stop)
         await self._write(bytes(stop))
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     command_channel.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from __future__ import annotations
+
+import asyncio
+
+from typing_extensions import Awaitable, Callable, Dict, Hashable, Optional
+
+from ..device_interface import GattWriteData
+from ..logger import get_toio_logger
+
+logger = get_toio_logger(__name__)
+
+
+class CommandChannel:
+    """
+    Latest-wins channel of write commands
+
+    Commands are written by a task in the order they are put.
+    When a command is put while an unsent command of the same kind is
+    waiting, the waiting command is discarded (and `replaced` is incremented),
+    and the new command is written after the commands put before it,
+    so that stale commands are never piled up nor written after newer ones.
+
+    When `min_interval` is greater than 0, writes are started at least
+    `min_interval` second apart.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[GattWriteData], Awaitable[None]],
+        min_interval: float = 0.0,
+    ):
+        """
+        Initialize CommandChannel
+
+        Args:
+            write (Callable[[GattWriteData], Awaitable[None]]):
+                function to write a command
+            min_interval (float): minimum interval [s] between the starts of writes
+        """
+        if min_interval < 0.0:
+            raise ValueError("min_interval must not be negative: %f" % min_interval)
+        self._write = write
+        self.min_interval = min_interval
+        self._pending: Dict[Hashable, GattWriteData] = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_write: Optional[float] = None
+        self.sent: int = 0
+        """Number of written commands"""
+        self.replaced: int = 0
+        """Number of commands replaced before they were written"""
+
+    def put(self, kind: Hashable, data: GattWriteData) -> None:
+        """
+        Put a command to be written
+
+        Args:
+            kind (Hashable): kind of the command
+                (replaces the waiting command of the same kind)
+            data (GattWriteData): command
+        """
+        if self._pending.pop(kind, None) is not None:
+            self.replaced += 1
+        self._pending[kind] = data
+        self._idle.clear()
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def qsize(self) -> int:
+        """
+        Number of commands waiting to be written
+        """
+        return len(self._pending)
+
+    async def flush(self) -> None:
+        """
+        Wait until all commands put are written
+        """
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """
+        Stop writing
+
+        Commands waiting to be written are discarded.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
+        self._idle.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                if self._last_write is not None and self.min_interval > 0.0:
+                    wait = self._last_write + self.min_interval - loop.time()
+                    if wait > 0.0:
+                        await asyncio.sleep(wait)
+                kind = next(iter(self._pending))
+                data = self._pending.pop(kind)
+                self._last_write = loop.time()
+                try:
+                    await self._write(data)
+                    self.sent += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("failed to write a command")
+            self._idle.set()
@@ -14,25 +14,58 @@ import asyncio
 from typing_extensions import (
     TYPE_CHECKING,
     Any,
-    Awaitable,
     Dict,
     List,
     Optional,
     Sequence,
+    Tuple,
     Type,
     Union,
 )
 
-from ..device_interface import CubeInfo, ScannerInterface
+from ..device_interface import CubeInfo, GattWriteData, ScannerInterface
 from ..logger import get_toio_logger
 from ..scanner.ble import UniversalBleScanner
+from ..scanner.cache import ScanCache
 
 if TYPE_CHECKING:
     from ..cube import ToioCoreCube
+    from .api.base_class import CubeCharacteristic, CubeCommand
 
 logger = get_toio_logger(__name__)
 
 
+class _OperationPacer:
+    """
+    Keeps the interval between the starts of operations
+
+    The interval is halved (down to `min_interval`) when an operation
+    succeeds, and doubled (up to `max_interval`) when an operation fails.
+    """
+
+    def __init__(self, max_interval: float, min_interval: float):
+        self.max_interval = max_interval
+        self.min_interval = min(min_interval, max_interval)
+        self.interval = max_interval
+        self._next_start: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            if self._next_start is not None:
+                wait = self._next_start - loop.time()
+                if wait > 0.0:
+                    await asyncio.sleep(wait)
+            self._next_start = loop.time() + self.interval
+
+    def succeeded(self) -> None:
+        self.interval = max(self.min_interval, self.interval / 2.0)
+
+    def failed(self) -> None:
+        self.interval = min(self.max_interval, self.interval * 2.0)
+
+
 class MultipleToioCoreCubes:
     """
     Multiple cube control class
@@ -51,6 +84,8 @@ class MultipleToioCoreCubes:
     MultipleToioCoreCubes is an asynchronous context manager.
     When 'async with' is used, '__aenter__' handles the process up to connection,
     and '__aexit__' handles the disconnection.
+    If '__aenter__' fails to connect to any of the cubes, the connected cubes
+    are disconnected and ConnectionError is raised.
 
     Access to each cubes
 
@@ -83,6 +118,20 @@ class MultipleToioCoreCubes:
     """
 
     OPERATION_INTERVAL: float = 0.5
+    MIN_OPERATION_INTERVAL: float = 0.05
+    MAX_CONCURRENT_CONNECTIONS: int = 4
+    MAX_CONNECT_RETRY: int = 3
+    RETRY_BACKOFF: float = 0.5
+    MAX_RETRY_BACKOFF: float = 8.0
+    MAX_CONCURRENT_DISCONNECTIONS: int = 8
+    BROADCAST_CHARACTERISTICS: Tuple[str, ...] = (
+        "configuration",
+        "indicator",
+        "motor",
+        "sound",
+    )
+    WRITE_WITHOUT_RESPONSE_CHARACTERISTICS: Tuple[str, ...] = ("motor",)
+    DISCONNECT_TIMEOUT: float = 10.0
     _LOCK: Optional[asyncio.Lock] = None
 
     def __init__(
@@ -91,6 +140,7 @@ class MultipleToioCoreCubes:
         names: Optional[Sequence[str]] = None,
         scanner: Type[ScannerInterface] = UniversalBleScanner,
         scanner_args: Sequence[Any] = (),
+        scan_cache: Optional[ScanCache] = None,
     ):
         """
         Initialize MultipleCubes
@@ -100,7 +150,15 @@ class MultipleToioCoreCubes:
             names (Optional[Sequence[str]]): sequence of names of cubes
             scanner (Type[ScannerInterface]): scanner interface (default is UniversalBleScanner)
             scanner_args (Sequence[Any]): arguments given to the scanner.scan() function
+            scan_cache (Optional[ScanCache]): scan cache
+                (if specified, cubes are found by UniversalBleScanner.scan_cached())
+
+        Exceptions:
+            ValueError: scan_cache is specified for a scanner
+                other than UniversalBleScanner
         """
+        if scan_cache is not None and not issubclass(scanner, UniversalBleScanner):
+            raise ValueError("scan_cache requires UniversalBleScanner")
         if MultipleToioCoreCubes._LOCK is None:
             MultipleToioCoreCubes._LOCK = asyncio.Lock()
 
@@ -118,6 +176,7 @@ class MultipleToioCoreCubes:
         self._names = names
         self._scanner = scanner
         self._scanner_args = scanner_args
+        self._scan_cache = scan_cache
         self._cube_dict: Dict[str, ToioCoreCube] = {}
 
     def __getattr__(self, name: str) -> ToioCoreCube:
@@ -131,7 +190,12 @@ class MultipleToioCoreCubes:
         assert MultipleToioCoreCubes._LOCK is not None
         async with MultipleToioCoreCubes._LOCK:
             await self.scan()
-            await self.connect()
+            result_list = await self.connect()
+        if not all(result_list):
+            await self.disconnect()
+            raise ConnectionError(
+                "failed to connect to %d cube(s)" % result_list.count(False)
+            )
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -156,61 +220,234 @@ class MultipleToioCoreCubes:
 
         If MultipleCubes is initialized with integer number,
         this function performs to scan the number of cubes.
+        With `scan_cache`, the cubes in the cache are connected directly
+        before scanning (see UniversalBleScanner.scan_cached()).
         """
         from ..cube import ToioCoreCube
 
         if self._scanning_required and isinstance(self._cube_num, int):
-            device_list = await self._scanner().scan(
-                self._cube_num, *self._scanner_args
-            )
+            if self._scan_cache is not None:
+                assert issubclass(self._scanner, UniversalBleScanner)
+                device_list = await self._scanner(cache=self._scan_cache).scan_cached(
+                    self._cube_num, *self._scanner_args
+                )
+            else:
+                device_list = await self._scanner().scan(
+                    self._cube_num, *self._scanner_args
+                )
             self._cubes = ToioCoreCube.create_cubes(device_list)
             self._scanning_required = False
 
-    async def _wait_and_exec(self, wait: float, func: Awaitable):
-        await asyncio.sleep(wait)
-        return await func
-
-    async def connect(self):
+    async def connect(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_retry: Optional[int] = None,
+    ) -> List[bool]:
         """
         connect to multiple cubes
 
-        cubes are connected at MultipleToioCoreCubes.OPERATION_INTERVAL
-        second interval.
+        Up to `max_concurrency` cubes are connected at the same time.
+        The interval between the starts of connections begins at
+        MultipleToioCoreCubes.OPERATION_INTERVAL second, and is narrowed
+        down to MultipleToioCoreCubes.MIN_OPERATION_INTERVAL second while
+        connections succeed. It is widened again when a connection fails.
+
+        A cube which failed to connect is retried up to `max_retry` times
+        after waiting MultipleToioCoreCubes.RETRY_BACKOFF second
+        (doubled on each retry, up to MultipleToioCoreCubes.MAX_RETRY_BACKOFF).
+
+        Args:
+            max_concurrency (Optional[int]): maximum number of connections in progress
+                (default: MultipleToioCoreCubes.MAX_CONCURRENT_CONNECTIONS)
+            max_retry (Optional[int]): maximum number of retries of each cube
+                (default: MultipleToioCoreCubes.MAX_CONNECT_RETRY)
+
+        Returns:
+            List[bool]: result of each cube (True: connected)
         """
         self._assign_cubes()
 
-        connect_list = []
-        wait = 0
-        for cube in self._cubes:
-            connect_list.append(self._wait_and_exec(wait, cube.connect()))
-            wait += self.OPERATION_INTERVAL
-        result_list = await asyncio.gather(*connect_list)
-        while False in result_list:
-            logger.info("try to connect again")
-            for i, result in enumerate(result_list):
-                if result:
-                    del connect_list[i]
-            result_list = await asyncio.gather(*connect_list)
-
-    async def disconnect(self):
+        if max_concurrency is None:
+            max_concurrency = self.MAX_CONCURRENT_CONNECTIONS
+        if max_retry is None:
+            max_retry = self.MAX_CONNECT_RETRY
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        pacer = _OperationPacer(self.OPERATION_INTERVAL, self.MIN_OPERATION_INTERVAL)
+        return list(
+            await asyncio.gather(
+                *[
+                    self._connect_cube(cube, semaphore, pacer, max_retry)
+                    for cube in self._cubes
+                ]
+            )
+        )
+
+    async def _connect_cube(
+        self,
+        cube: ToioCoreCube,
+        semaphore: asyncio.Semaphore,
+        pacer: _OperationPacer,
+        max_retry: int,
+    ) -> bool:
+        for retry_count in range(max_retry + 1):
+            if retry_count > 0:
+                backoff = min(
+                    self.MAX_RETRY_BACKOFF,
+                    self.RETRY_BACKOFF * (2 ** (retry_count - 1)),
+                )
+                logger.info(
+                    "try to connect again (%d/%d) after %.2f sec",
+                    retry_count,
+                    max_retry,
+                    backoff,
+                )
+                await asyncio.sleep(backoff)
+            async with semaphore:
+                await pacer.wait()
+                try:
+                    result = await cube.connect()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("connection failed: %s", repr(e))
+                    result = False
+            if result:
+                pacer.succeeded()
+                return True
+            pacer.failed()
+        logger.error("failed to connect: %s", cube.name)
+        return False
+
+    async def disconnect(
+        self,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[bool]:
         """
         disconnect to multiple cubes
 
-        cubes are disconnected at MultipleToioCoreCubes.OPERATION_INTERVAL
-        second interval.
+        Up to `max_concurrency` cubes are disconnected at the same time.
+        Disconnections which are not completed within `timeout` second
+        are cancelled and reported as False.
+
+        Args:
+            max_concurrency (Optional[int]): maximum number of disconnections
+                in progress
+                (default: MultipleToioCoreCubes.MAX_CONCURRENT_DISCONNECTIONS)
+            timeout (Optional[float]): deadline of all disconnections [s]
+                (default: MultipleToioCoreCubes.DISCONNECT_TIMEOUT)
+
+        Returns:
+            List[bool]: result of each cube (True: disconnected)
+        """
+        if len(self._cubes) == 0:
+            return []
+        if max_concurrency is None:
+            max_concurrency = self.MAX_CONCURRENT_DISCONNECTIONS
+        if timeout is None:
+            timeout = self.DISCONNECT_TIMEOUT
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        tasks = [
+            asyncio.ensure_future(self._disconnect_cube(cube, semaphore))
+            for cube in self._cubes
+        ]
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logger.warning("disconnection timed out: %d cube(s)", len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return [False if task.cancelled() else task.result() for task in tasks]
+
+    async def _disconnect_cube(
+        self, cube: ToioCoreCube, semaphore: asyncio.Semaphore
+    ) -> bool:
+        async with semaphore:
+            try:
+                return await cube.disconnect()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("disconnection failed: %s", repr(e))
+                return False
+
+    async def broadcast(
+        self,
+        characteristic: str,
+        command: Union[CubeCommand, GattWriteData],
+        response: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[Optional[Exception]]:
+        """
+        write the same command to all cubes
+
+        The command is serialized only once, and the same data is written
+        to all cubes concurrently, so that the cubes receive it at
+        almost the same time.
+
+        >>> async with MultipleToioCoreCubes(4) as cubes:
+        >>>     await cubes.broadcast("indicator", TurningOnAndOff(IndicatorParam(...)))
+        >>>     await cubes.broadcast("sound", PlaySoundEffect(SoundId.Enter, 255))
+        >>>     await cubes.broadcast("motor", MotorControl(50, -50, None))
+
+        Args:
+            characteristic (str): name of the characteristic in ToioCoreCube.api
+                ("configuration", "indicator", "motor" or "sound")
+            command (Union[CubeCommand, GattWriteData]): command,
+                or its byte representation
+            response (Optional[bool]): write with response or not
+                (None: without response for "motor", with response for the others,
+                the same as the functions of each characteristic)
+            max_concurrency (Optional[int]): maximum number of writes in progress
+                (None: all cubes at once)
+
+        Returns:
+            List[Optional[Exception]]: error of each cube (None: written)
+
+        Exceptions:
+            ValueError: the characteristic is not writable
         """
-        disconnect_list = []
-        wait = 0.0
-        for cube in self._cubes:
-            disconnect_list.append(self._wait_and_exec(wait, cube.disconnect()))
-            wait += self.OPERATION_INTERVAL
-        result_list = await asyncio.gather(*disconnect_list)
-        while False in result_list:
-            logger.info("try to disconnect again")
-            for i, result in enumerate(result_list):
-                if result:
-                    del disconnect_list[i]
-            result_list = await asyncio.gather(*disconnect_list)
+        if characteristic not in self.BROADCAST_CHARACTERISTICS:
+            raise ValueError("'%s' is not writable" % characteristic)
+        if response is None:
+            response = characteristic not in self.WRITE_WITHOUT_RESPONSE_CHARACTERISTICS
+        if isinstance(command, (bytes, bytearray, memoryview)):
+            data: GattWriteData = command
+        else:
+            data = bytes(command)
+        if max_concurrency is None:
+            max_concurrency = len(self._cubes)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        return list(
+            await asyncio.gather(
+                *[
+                    self._write_cube(
+                        getattr(cube.api, characteristic), data, response, semaphore
+                    )
+                    for cube in self._cubes
+                ]
+            )
+        )
+
+    @staticmethod
+    async def _write_cube(
+        char: CubeCharacteristic,
+        data: GattWriteData,
+        response: bool,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Exception]:
+        async with semaphore:
+            try:
+                if response:
+                    await char._write(data)
+                else:
+                    await char._write_without_response(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("broadcast failed: %s", repr(e))
+                return e
+        return None
 
     def named(self, name: str) -> ToioCoreCube:
         """
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     notification_buffer.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from __future__ import annotations
+
+import time
+
+from typing_extensions import Iterator, List, NamedTuple, Optional
+
+
+class ReceivedNotification(NamedTuple):
+    """
+    Raw notification payload and the time it was received
+    """
+
+    timestamp: float
+    """time.monotonic() when the notification was received"""
+    payload: bytearray
+    """raw payload"""
+
+
+class NotificationBuffer:
+    """
+    Fixed-capacity ring buffer of received notifications
+
+    The buffer keeps the last `capacity` notifications.
+    When the buffer is full, the oldest notification is overwritten.
+    The slots are allocated when the buffer is created.
+
+    The latest notification is kept in a single attribute,
+    so it can be read from another thread without lock.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity (int): maximum number of notifications to be kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be greater than 0: %d" % capacity)
+        self._capacity = capacity
+        self._slots: List[Optional[ReceivedNotification]] = [None] * capacity
+        self._count = 0
+        self._latest: Optional[ReceivedNotification] = None
+
+    @property
+    def capacity(self) -> int:
+        """
+        Maximum number of notifications to be kept
+        """
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """
+        Total number of notifications appended to the buffer
+        """
+        return self._count
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+    def append(self, payload: bytearray, timestamp: Optional[float] = None) -> None:
+        """
+        Append a notification
+
+        Args:
+            payload (bytearray): raw payload
+            timestamp (Optional[float]): received time (default: time.monotonic())
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        received = ReceivedNotification(timestamp, payload)
+        self._slots[self._count % self._capacity] = received
+        self._count += 1
+        self._latest = received
+
+    def latest(self) -> Optional[ReceivedNotification]:
+        """
+        Get the latest notification
+
+        Returns:
+            Optional[ReceivedNotification]: None if no notification is received
+        """
+        return self._latest
+
+    def snapshot(self) -> List[ReceivedNotification]:
+        """
+        Get the notifications in the buffer (oldest first)
+        """
+        count = self._count
+        num = min(count, self._capacity)
+        result: List[ReceivedNotification] = []
+        for n in range(count - num, count):
+            received = self._slots[n % self._capacity]
+            if received is not None:
+                result.append(received)
+        return result
+
+    def __iter__(self) -> Iterator[ReceivedNotification]:
+        return iter(self.snapshot())
+
+    def since(self, timestamp: float) -> List[ReceivedNotification]:
+        """
+        Get the notifications received at or after the timestamp (oldest first)
+
+        Args:
+            timestamp (float): time in time.monotonic()
+        """
+        return [x for x in self.snapshot() if x.timestamp >= timestamp]
+
+    def window(
+        self, seconds: float, now: Optional[float] = None
+    ) -> List[ReceivedNotification]:
+        """
+        Get the notifications received in the last `seconds` seconds (oldest first)
+
+        Args:
+            seconds (float): length of the time window
+            now (Optional[float]): end of the time window (default: time.monotonic())
+        """
+        if now is None:
+            now = time.monotonic()
+        return [x for x in self.since(now - seconds) if x.timestamp <= now]
+
+    def clear(self) -> None:
+        """
+        Remove all notifications
+        """
+        self._slots = [None] * self._capacity
+        self._count = 0
+        self._latest = None
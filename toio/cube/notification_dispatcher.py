@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     notification_dispatcher.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from __future__ import annotations
+
+import asyncio
+
+from typing_extensions import (
+    Awaitable,
+    Callable,
+    Literal,
+    Optional,
+    TypeAlias,
+    cast,
+)
+
+from ..logger import get_toio_logger
+from .notification_handler_info import (
+    CubeNotificationHandlerWithParameter,
+    NotificationHandlerInfo,
+    NotificationHandlerTypes,
+)
+
+logger = get_toio_logger(__name__)
+
+DispatchMode: TypeAlias = Literal["sequential", "concurrent"]
+"""
+How the notification handler functions of a characteristic are called
+
+- "sequential": all handler functions are awaited in order for each notification
+  (the next notification waits until all handler functions return)
+- "concurrent": each async handler function runs in its own task and
+  receives notifications from its own bounded queue
+"""
+
+HandlerCall: TypeAlias = Callable[[bytearray], Optional[Awaitable[None]]]
+"""
+Notification handler function adapted to take only the payload
+
+Returns an awaitable if the handler function is async.
+"""
+
+
+def make_handler_call(
+    func: NotificationHandlerTypes, handler_info: NotificationHandlerInfo
+) -> Optional[HandlerCall]:
+    """
+    Make HandlerCall of a notification handler function
+
+    Returns None if the handler function takes neither 1 nor 2 arguments.
+    """
+    if handler_info.num_of_args == 1:
+        return cast(HandlerCall, func)
+    elif handler_info.num_of_args == 2:
+        func_with_info = cast(CubeNotificationHandlerWithParameter, func)
+        return lambda payload: func_with_info(payload, handler_info)
+    else:
+        return None
+
+
+class HandlerWorker:
+    """
+    Task which calls one async notification handler function
+
+    Notifications are queued up to `max_pending`.
+    When the queue is full, the oldest notification is discarded
+    and `dropped` is incremented.
+    The handler function receives notifications in the received order.
+    """
+
+    def __init__(self, call: HandlerCall, max_pending: int):
+        if max_pending < 1:
+            raise ValueError("max_pending must be greater than 0: %d" % max_pending)
+        self._call = call
+        self._queue: asyncio.Queue[bytearray] = asyncio.Queue(max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped: int = 0
+        """Number of discarded notifications"""
+
+    def put(self, payload: bytearray) -> None:
+        if self._queue.full():
+            self.dropped += 1
+            self._queue.get_nowait()
+            self._queue.task_done()
+        self._queue.put_nowait(payload)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def join(self) -> None:
+        """
+        Wait until all queued notifications are handled
+        """
+        await self._queue.join()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def close(self) -> None:
+        """
+        Stop the task and wait until it finishes
+        """
+        task = self._task
+        self.stop()
+        if task is not None:
+            await asyncio.wait((task,))
+
+    async def _run(self) -> None:
+        while True:
+            payload = await self._queue.get()
+            try:
+                await cast(Awaitable[None], self._call(payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("notification handler raised an exception")
+            finally:
+                self._queue.task_done()
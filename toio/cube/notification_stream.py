@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     notification_stream.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from __future__ import annotations
+
+import asyncio
+
+from typing_extensions import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Literal,
+    Optional,
+    TypeAlias,
+)
+
+if TYPE_CHECKING:
+    from .api.base_class import CubeCharacteristic
+
+OverflowPolicy: TypeAlias = Literal["drop_oldest", "drop_newest"]
+"""
+What to do when a notification is received while the stream is full
+
+- "drop_oldest": the oldest notification in the stream is discarded
+- "drop_newest": the received notification is discarded
+"""
+
+
+class NotificationMessage:
+    """
+    Notification received by NotificationStream
+
+    Attributes:
+        timestamp (float): time.monotonic() when the notification was received
+        payload (bytearray): raw payload
+    """
+
+    __slots__ = ("timestamp", "payload", "_decoder", "_response", "_is_decoded")
+
+    def __init__(
+        self,
+        timestamp: float,
+        payload: bytearray,
+        decoder: Callable[[bytearray], Any],
+    ):
+        self.timestamp = timestamp
+        self.payload = payload
+        self._decoder = decoder
+        self._response: Any = None
+        self._is_decoded = False
+
+    @property
+    def response(self) -> Any:
+        """
+        Payload decoded by is_my_data() of the characteristic
+
+        The payload is decoded when this property is accessed first.
+        """
+        if not self._is_decoded:
+            self._response = self._decoder(self.payload)
+            self._is_decoded = True
+        return self._response
+
+    def __str__(self) -> str:
+        return "%f: %s" % (self.timestamp, str(self.response))
+
+
+class NotificationStream:
+    """
+    Bounded stream of notifications of a characteristic
+
+    The stream is fed by the notification handler of the characteristic
+    and never blocks it. When the stream is full, a notification is
+    discarded according to the overflow policy and `dropped` is incremented.
+
+    The stream receives notifications while it is open.
+    It is opened by 'async with' or when 'async for' starts.
+
+    >>> async with cube.api.sensor.stream(maxsize=16) as stream:
+    >>>     async for msg in stream:
+    >>>         print(msg.response)
+
+    >>> async for msg in cube.api.id_information.stream():
+    >>>     print(msg.response)
+    """
+
+    def __init__(
+        self,
+        characteristic: CubeCharacteristic,
+        maxsize: int = 64,
+        overflow: OverflowPolicy = "drop_oldest",
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0: %d" % maxsize)
+        if overflow not in ("drop_oldest", "drop_newest"):
+            raise ValueError("unknown overflow policy: %s" % overflow)
+        self._characteristic = characteristic
+        self._queue: asyncio.Queue[NotificationMessage] = asyncio.Queue(maxsize)
+        self._overflow = overflow
+        self._is_open = False
+        self.dropped: int = 0
+        """Number of discarded notifications"""
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    def qsize(self) -> int:
+        """
+        Number of notifications in the stream
+        """
+        return self._queue.qsize()
+
+    def _put(self, timestamp: float, payload: bytearray) -> None:
+        message = NotificationMessage(
+            timestamp, payload, self._characteristic.is_my_data
+        )
+        if self._queue.full():
+            self.dropped += 1
+            if self._overflow == "drop_newest":
+                return
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def open(self) -> None:
+        """
+        Start receiving notifications
+        """
+        if not self._is_open:
+            await self._characteristic._add_notification_stream(self)
+            self._is_open = True
+
+    async def close(self) -> None:
+        """
+        Stop receiving notifications
+
+        Notifications already in the stream can still be obtained by get().
+        """
+        if self._is_open:
+            self._is_open = False
+            await self._characteristic._remove_notification_stream(self)
+
+    async def get(self, timeout: Optional[float] = None) -> NotificationMessage:
+        """
+        Get the oldest notification in the stream
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            NotificationMessage:
+        """
+        if timeout is None:
+            return await self._queue.get()
+        else:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+
+    async def __aenter__(self) -> NotificationStream:
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[NotificationMessage]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[NotificationMessage]:
+        opened_here = not self._is_open
+        if opened_here:
+            await self.open()
+        try:
+            while True:
+                yield await self._queue.get()
+        finally:
+            if opened_here:
+                await self.close()
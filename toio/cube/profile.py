@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     profile.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from typing_extensions import (
+    TYPE_CHECKING,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..logger import get_toio_logger
+from .api.base_class import CubeCommand
+from .api.configuration import (
+    Configuration,
+    MagneticSensorCondition,
+    MagneticSensorFunction,
+    MotorSpeedInformationAcquisitionState,
+    NotificationCondition,
+    PostureAngleDetectionCondition,
+    PostureAngleDetectionType,
+    RequestConnectionInterval,
+    SetCollisionDetectionThreshold,
+    SetDoubleTapDetectionTimeInterval,
+    SetHorizontalDetectionThreshold,
+    SetIdMissedNotification,
+    SetIdNotification,
+    SetMagneticSensor,
+    SetMotorSpeedInformationAcquisition,
+    SetPostureAngleDetection,
+)
+
+if TYPE_CHECKING:
+    from . import ToioCoreCube
+
+logger = get_toio_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CubeProfile:
+    """
+    Configuration of a cube applied at once
+
+    Settings which are None are not changed.
+
+    >>> profile = CubeProfile(
+    >>>     id_notification_interval_ms=50,
+    >>>     id_notification_condition=NotificationCondition.Always,
+    >>>     motor_speed_information_acquisition=(
+    >>>         MotorSpeedInformationAcquisitionState.Enable
+    >>>     ),
+    >>> )
+    >>> async with MultipleToioCoreCubes(4) as cubes:
+    >>>     result_list = await profile.apply(cubes)
+    """
+
+    id_notification_interval_ms: Optional[int] = None
+    """Notification interval of ID notification [ms]"""
+    id_notification_condition: NotificationCondition = NotificationCondition.Always
+    """Notification condition of ID notification"""
+    id_missed_sensitivity_ms: Optional[int] = None
+    """Sensitivity of ID missed notification [ms]"""
+    magnetic_sensor_function: Optional[MagneticSensorFunction] = None
+    """Function of magnetic sensor"""
+    magnetic_sensor_interval_ms: int = 100
+    """Notification interval of magnetic sensor [ms]"""
+    magnetic_sensor_condition: MagneticSensorCondition = MagneticSensorCondition.Always
+    """Notification condition of magnetic sensor"""
+    posture_angle_detection_type: Optional[PostureAngleDetectionType] = None
+    """Type of posture angle detection"""
+    posture_angle_detection_interval_ms: int = 100
+    """Notification interval of posture angle detection [ms]"""
+    posture_angle_detection_condition: PostureAngleDetectionCondition = (
+        PostureAngleDetectionCondition.Always
+    )
+    """Notification condition of posture angle detection"""
+    motor_speed_information_acquisition: Optional[
+        MotorSpeedInformationAcquisitionState
+    ] = None
+    """State of motor speed information acquisition"""
+    connection_interval: Optional[Tuple[int, int]] = None
+    """Minimum and maximum connection interval (see RequestConnectionInterval)"""
+    horizontal_detection_threshold: Optional[int] = None
+    """Horizontal detection threshold (1 - 45)"""
+    collision_detection_threshold: Optional[int] = None
+    """Collision detection threshold (1 - 10)"""
+    double_tap_detection_time_interval: Optional[int] = None
+    """Double-tap detection time interval (1 - 7)"""
+
+    def commands(self) -> List[CubeCommand]:
+        """
+        Get configuration commands of this profile
+
+        The connection interval request is the last command,
+        because the connection may be changed by it.
+
+        Returns:
+            List[CubeCommand]: commands in the order to be sent
+        """
+        commands: List[CubeCommand] = []
+        if self.horizontal_detection_threshold is not None:
+            commands.append(
+                SetHorizontalDetectionThreshold(self.horizontal_detection_threshold)
+            )
+        if self.collision_detection_threshold is not None:
+            commands.append(
+                SetCollisionDetectionThreshold(self.collision_detection_threshold)
+            )
+        if self.double_tap_detection_time_interval is not None:
+            commands.append(
+                SetDoubleTapDetectionTimeInterval(
+                    self.double_tap_detection_time_interval
+                )
+            )
+        if self.id_notification_interval_ms is not None:
+            commands.append(
+                SetIdNotification(
+                    self.id_notification_interval_ms, self.id_notification_condition
+                )
+            )
+        if self.id_missed_sensitivity_ms is not None:
+            commands.append(SetIdMissedNotification(self.id_missed_sensitivity_ms))
+        if self.magnetic_sensor_function is not None:
+            commands.append(
+                SetMagneticSensor(
+                    self.magnetic_sensor_function,
+                    self.magnetic_sensor_interval_ms,
+                    self.magnetic_sensor_condition,
+                )
+            )
+        if self.posture_angle_detection_type is not None:
+            commands.append(
+                SetPostureAngleDetection(
+                    self.posture_angle_detection_type,
+                    self.posture_angle_detection_interval_ms,
+                    self.posture_angle_detection_condition,
+                )
+            )
+        if self.motor_speed_information_acquisition is not None:
+            commands.append(
+                SetMotorSpeedInformationAcquisition(
+                    self.motor_speed_information_acquisition
+                )
+            )
+        if self.connection_interval is not None:
+            commands.append(RequestConnectionInterval(*self.connection_interval))
+        return commands
+
+    async def apply(
+        self,
+        target: Union[ToioCoreCube, Iterable[ToioCoreCube]],
+        timeout: Optional[float] = 1.0,
+        max_concurrency: Optional[int] = None,
+    ) -> List[bool]:
+        """
+        Apply this profile to a cube or cubes
+
+        The commands are sent to each cube without waiting for the responses
+        of the previous commands, and the responses are verified.
+        Cubes are configured concurrently.
+
+        Args:
+            target (Union[ToioCoreCube, Iterable[ToioCoreCube]]): a cube,
+                or cubes (e.g. MultipleToioCoreCubes)
+            timeout (Optional[float]): timeout [s] to wait for each response
+            max_concurrency (Optional[int]): maximum number of cubes configured
+                at the same time (None: no limit)
+
+        Returns:
+            List[bool]: result of each cube (True: all commands are accepted)
+        """
+        from . import ToioCoreCube
+
+        if isinstance(target, ToioCoreCube):
+            cubes = [target]
+        else:
+            cubes = list(target)
+        commands = self.commands()
+        semaphore = asyncio.Semaphore(
+            len(cubes) if max_concurrency is None else max(1, max_concurrency)
+        )
+
+        async def apply_to_cube(cube: ToioCoreCube) -> bool:
+            async with semaphore:
+                return await self._apply_commands(
+                    cube.api.configuration, commands, timeout
+                )
+
+        return list(await asyncio.gather(*[apply_to_cube(cube) for cube in cubes]))
+
+    @staticmethod
+    async def _apply_commands(
+        configuration: Configuration,
+        commands: List[CubeCommand],
+        timeout: Optional[float],
+    ) -> bool:
+        async def send(command: CubeCommand) -> bool:
+            if type(command) not in Configuration._RESPONSE_TYPES:
+                # no response is defined: rely on the write response
+                await configuration._write(bytes(command))
+                return True
+            response = await configuration.request(command, timeout)
+            if response is None:
+                logger.warning("no response: %s", type(command).__name__)
+                return False
+            result = getattr(response, "result", True)
+            if not result:
+                logger.warning("command failed: %s", type(command).__name__)
+            return result
+
+        result_list = await asyncio.gather(
+            *[send(command) for command in commands], return_exceptions=True
+        )
+        for result in result_list:
+            if isinstance(result, BaseException):
+                logger.warning("command failed: %s", repr(result))
+        return all(result is True for result in result_list)
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     scheduler.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Time-synchronized command scheduler
+
+Writes commands to multiple cubes at the scheduled time offsets,
+and records when each command is actually written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from itertools import groupby
+
+from typing_extensions import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from ..device_interface import GattWriteData
+from ..logger import get_toio_logger
+from .api.base_class import CubeCharacteristic, CubeCommand, PackedCommand
+from .api.configuration import (
+    GetCurrentConnectionIntervalValue,
+    GetRequestedConnectionIntervalValue,
+    RequestConnectionInterval,
+    RequestProtocolVersion,
+    SetCollisionDetectionThreshold,
+    SetDoubleTapDetectionTimeInterval,
+    SetHorizontalDetectionThreshold,
+    SetIdMissedNotification,
+    SetIdNotification,
+    SetMagneticSensor,
+    SetMotorSpeedInformationAcquisition,
+    SetPostureAngleDetection,
+)
+from .api.indicator import (
+    RepeatedTurningOnAndOff,
+    TurningOnAndOff,
+    TurnOff,
+    TurnOffAll,
+)
+from .api.motor import (
+    MotorControl,
+    MotorControlAcceleration,
+    MotorControlMultipleTargets,
+    MotorControlTarget,
+)
+from .api.sensor import (
+    RequestMagneticSensor,
+    RequestMotionDetection,
+    RequestPostureAngleDetection,
+)
+from .api.sound import PlayMidi, PlaySoundEffect, Stop
+from .multi_cubes import MultipleToioCoreCubes
+
+if TYPE_CHECKING:
+    from ..cube import ToioCoreCube
+
+logger = get_toio_logger(__name__)
+
+CubeSpecifier = Union[int, str, "ToioCoreCube"]
+
+
+class CommandRecord(NamedTuple):
+    """
+    Result of a scheduled command
+
+    All times are seconds from the start of CommandScheduler.run().
+
+    Attributes:
+        t_offset (float): scheduled time
+        cube (ToioCoreCube): the cube
+        data (bytes): written data
+        sent (Optional[float]): time when writing started (None: not written)
+        completed (Optional[float]): time when writing completed (None: not completed)
+        error (Optional[Exception]): error of writing (None: written)
+    """
+
+    t_offset: float
+    cube: ToioCoreCube
+    data: bytes
+    sent: Optional[float]
+    completed: Optional[float]
+    error: Optional[Exception]
+
+    @property
+    def lateness(self) -> Optional[float]:
+        """
+        Delay [s] of the start of writing from the scheduled time
+        """
+        if self.sent is None:
+            return None
+        return self.sent - self.t_offset
+
+
+class _Entry(NamedTuple):
+    order: int
+    t_offset: float
+    cube: ToioCoreCube
+    char: CubeCharacteristic
+    data: bytes
+    response: bool
+
+
+class CommandScheduler:
+    """
+    Scheduler to write commands to multiple cubes at given times
+
+    All commands are serialized when they are added. run() sleeps until
+    shortly before each scheduled time, and waits for the rest of the time
+    by yielding to the event loop, measured by the event loop clock.
+    Commands scheduled at the same time are written concurrently.
+    Commands to the same cube are written in the order of their schedule.
+    The characteristic to write a command to is looked up from
+    COMMAND_CHARACTERISTICS by the command class (or its base classes).
+    For other commands, the characteristic must be given to add().
+
+    >>> async with MultipleToioCoreCubes(2) as cubes:
+    >>>     scheduler = CommandScheduler(cubes)
+    >>>     scheduler.extend([
+    >>>         (0.0, 0, TurningOnAndOff(IndicatorParam(...))),
+    >>>         (0.0, 1, TurningOnAndOff(IndicatorParam(...))),
+    >>>         (0.5, 0, MotorControl(50, -50, 200)),
+    >>>         (0.5, 1, MotorControl(-50, 50, 200)),
+    >>>     ])
+    >>>     records = await scheduler.run()
+    >>>     skew = max(r.sent for r in records[:2]) - min(r.sent for r in records[:2])
+    """
+
+    DEFAULT_SPIN_TIME: float = 0.002
+    WRITABLE_CHARACTERISTICS: Tuple[str, ...] = (
+        "configuration",
+        "indicator",
+        "motor",
+        "sensor",
+        "sound",
+    )
+    COMMAND_CHARACTERISTICS: Dict[Type[CubeCommand], str] = {
+        RequestProtocolVersion: "configuration",
+        SetHorizontalDetectionThreshold: "configuration",
+        SetCollisionDetectionThreshold: "configuration",
+        SetDoubleTapDetectionTimeInterval: "configuration",
+        SetIdNotification: "configuration",
+        SetIdMissedNotification: "configuration",
+        SetMagneticSensor: "configuration",
+        SetMotorSpeedInformationAcquisition: "configuration",
+        SetPostureAngleDetection: "configuration",
+        RequestConnectionInterval: "configuration",
+        GetRequestedConnectionIntervalValue: "configuration",
+        GetCurrentConnectionIntervalValue: "configuration",
+        TurningOnAndOff: "indicator",
+        RepeatedTurningOnAndOff: "indicator",
+        TurnOffAll: "indicator",
+        TurnOff: "indicator",
+        MotorControl: "motor",
+        MotorControlTarget: "motor",
+        MotorControlMultipleTargets: "motor",
+        MotorControlAcceleration: "motor",
+        RequestMotionDetection: "sensor",
+        RequestPostureAngleDetection: "sensor",
+        RequestMagneticSensor: "sensor",
+        PlaySoundEffect: "sound",
+        PlayMidi: "sound",
+        Stop: "sound",
+    }
+
+    def __init__(
+        self,
+        cubes: Union[MultipleToioCoreCubes, Sequence[ToioCoreCube]],
+        spin_time: float = DEFAULT_SPIN_TIME,
+    ):
+        """
+        Initialize CommandScheduler
+
+        Args:
+            cubes (Union[MultipleToioCoreCubes, Sequence[ToioCoreCube]]):
+                cubes to be controlled
+            spin_time (float): time [s] before each scheduled time to stop sleeping
+                and wait by yielding to the event loop
+        """
+        if spin_time < 0.0:
+            raise ValueError("spin_time must not be negative: %f" % spin_time)
+        self._cubes = cubes
+        self.spin_time = spin_time
+        self._entries: List[_Entry] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _resolve_cube(self, cube: CubeSpecifier) -> ToioCoreCube:
+        if isinstance(cube, int):
+            return self._cubes[cube]
+        if isinstance(cube, str):
+            if not isinstance(self._cubes, MultipleToioCoreCubes):
+                raise ValueError("cubes are not named: '%s'" % cube)
+            return self._cubes.named(cube)
+        return cube
+
+    @classmethod
+    def _characteristic_of(cls, command: Union[CubeCommand, GattWriteData]) -> str:
+        if isinstance(command, (bytes, bytearray, memoryview)):
+            raise ValueError("characteristic is required to write raw data")
+        command_type = (
+            command.command_type
+            if isinstance(command, PackedCommand)
+            else type(command)
+        )
+        for base in command_type.__mro__:
+            characteristic = cls.COMMAND_CHARACTERISTICS.get(base)
+            if characteristic is not None:
+                return characteristic
+        raise ValueError(
+            "characteristic is required to write %s" % command_type.__name__
+        )
+
+    def add(
+        self,
+        t_offset: float,
+        cube: CubeSpecifier,
+        command: Union[CubeCommand, GattWriteData],
+        characteristic: Optional[str] = None,
+    ) -> None:
+        """
+        Add a command to the schedule
+
+        Args:
+            t_offset (float): time [s] from the start of run()
+            cube (CubeSpecifier): the cube (index, name or ToioCoreCube)
+            command (Union[CubeCommand, GattWriteData]): command,
+                or its byte representation
+            characteristic (Optional[str]): name of the characteristic
+                in ToioCoreCube.api
+                (None: looked up from COMMAND_CHARACTERISTICS by the command class)
+
+        Exceptions:
+            ValueError: the characteristic is not writable, or is not specified
+                for a command which is not in COMMAND_CHARACTERISTICS
+        """
+        if t_offset < 0.0:
+            raise ValueError("t_offset must not be negative: %f" % t_offset)
+        if characteristic is None:
+            characteristic = self._characteristic_of(command)
+        if characteristic not in self.WRITABLE_CHARACTERISTICS:
+            raise ValueError("'%s' is not writable" % characteristic)
+        target = self._resolve_cube(cube)
+        self._entries.append(
+            _Entry(
+                order=len(self._entries),
+                t_offset=t_offset,
+                cube=target,
+                char=getattr(target.api, characteristic),
+                data=bytes(command),
+                response=characteristic
+                not in MultipleToioCoreCubes.WRITE_WITHOUT_RESPONSE_CHARACTERISTICS,
+            )
+        )
+
+    def extend(
+        self,
+        timeline: Iterable[
+            Tuple[float, CubeSpecifier, Union[CubeCommand, GattWriteData]]
+        ],
+    ) -> None:
+        """
+        Add commands to the schedule
+
+        Args:
+            timeline (Iterable[Tuple[float, CubeSpecifier, CubeCommand]]):
+                tuples of (t_offset, cube, command)
+        """
+        for t_offset, cube, command in timeline:
+            self.add(t_offset, cube, command)
+
+    def clear(self) -> None:
+        """
+        Remove all commands from the schedule
+        """
+        self._entries.clear()
+
+    async def run(self, start_delay: float = 0.0) -> List[CommandRecord]:
+        """
+        Write the scheduled commands
+
+        Args:
+            start_delay (float): time [s] from calling this function to the start
+
+        Returns:
+            List[CommandRecord]: result of each command in the order of addition
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time() + start_delay
+        records: List[Optional[CommandRecord]] = [None] * len(self._entries)
+        locks: Dict[int, asyncio.Lock] = {}
+        tasks: List[asyncio.Task] = []
+        schedule = sorted(self._entries, key=lambda x: x.t_offset)
+        try:
+            for t_offset, group in groupby(schedule, key=lambda x: x.t_offset):
+                await self._wait_until(loop, start + t_offset)
+                for entry in group:
+                    lock = locks.setdefault(id(entry.cube), asyncio.Lock())
+                    tasks.append(
+                        asyncio.ensure_future(
+                            self._write(loop, start, entry, lock, records)
+                        )
+                    )
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return [
+            (
+                record
+                if record is not None
+                else CommandRecord(
+                    entry.t_offset, entry.cube, entry.data, None, None, None
+                )
+            )
+            for entry, record in zip(self._entries, records)
+        ]
+
+    async def _wait_until(self, loop: asyncio.AbstractEventLoop, when: float) -> None:
+        remaining = when - loop.time() - self.spin_time
+        if remaining > 0.0:
+            await asyncio.sleep(remaining)
+        while loop.time() < when:
+            await asyncio.sleep(0)
+
+    @staticmethod
+    async def _write(
+        loop: asyncio.AbstractEventLoop,
+        start: float,
+        entry: _Entry,
+        lock: asyncio.Lock,
+        records: List[Optional[CommandRecord]],
+    ) -> None:
+        async with lock:
+            sent = loop.time() - start
+            error: Optional[Exception] = None
+            try:
+                if entry.response:
+                    await entry.char._write(entry.data)
+                else:
+                    await entry.char._write_without_response(entry.data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("scheduled command failed: %s", repr(e))
+                error = e
+            records[entry.order] = CommandRecord(
+                entry.t_offset,
+                entry.cube,
+                entry.data,
+                sent,
+                loop.time() - start,
+                error,
+            )
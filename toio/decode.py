@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     decode.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Batch decoder for recorded notifications
+
+Decode many raw payloads of one response type at once into a NumPy
+structured array. The layouts of the structured arrays are made from the
+struct.Struct layouts of the CubeResponse classes.
+
+Note:
+    This module requires NumPy, which is installed with the "numpy" extra
+    (pip install toio.py[numpy])
+
+>>> from toio.decode import batch
+>>> from toio.cube import PositionId
+>>> records = batch(PositionId, payloads)
+>>> records["center_x"], records["center_y"], records["center_angle"]
+"""
+
+from __future__ import annotations
+
+import re
+import struct
+
+from typing_extensions import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("toio.decode requires NumPy (pip install toio.py[numpy])") from e
+
+from .cube.api.base_class import CubeResponse
+from .cube.api.id_information import PositionId, StandardId
+from .cube.api.motor import ResponseMotorSpeed
+from .cube.api.sensor import (
+    MagneticSensorData,
+    MotionDetectionData,
+    PostureAngleEulerData,
+    PostureAngleHighPrecisionEulerData,
+    PostureAngleQuaternionsData,
+    PostureDataType,
+)
+
+
+class _Layout(NamedTuple):
+    names: Tuple[str, ...]
+    match: Dict[str, int]
+
+
+_LAYOUTS: Dict[Type[CubeResponse], _Layout] = {
+    PositionId: _Layout(
+        (
+            "payload_id",
+            "center_x",
+            "center_y",
+            "center_angle",
+            "sensor_x",
+            "sensor_y",
+            "sensor_angle",
+        ),
+        {"payload_id": PositionId._payload_id},
+    ),
+    StandardId: _Layout(
+        ("payload_id", "value", "angle"),
+        {"payload_id": StandardId._payload_id},
+    ),
+    MotionDetectionData: _Layout(
+        ("payload_id", "horizontal", "collision", "double_tap", "posture", "shake"),
+        {"payload_id": MotionDetectionData._payload_id},
+    ),
+    PostureAngleEulerData: _Layout(
+        ("payload_id", "data_type", "roll", "pitch", "yaw"),
+        {
+            "payload_id": PostureAngleEulerData._payload_id,
+            "data_type": PostureDataType.Euler,
+        },
+    ),
+    PostureAngleQuaternionsData: _Layout(
+        ("payload_id", "data_type", "w", "x", "y", "z"),
+        {
+            "payload_id": PostureAngleQuaternionsData._payload_id,
+            "data_type": PostureDataType.Quaternions,
+        },
+    ),
+    PostureAngleHighPrecisionEulerData: _Layout(
+        ("payload_id", "data_type", "roll", "pitch", "yaw"),
+        {
+            "payload_id": PostureAngleHighPrecisionEulerData._payload_id,
+            "data_type": PostureDataType.HighPrecisionEuler,
+        },
+    ),
+    MagneticSensorData: _Layout(
+        ("payload_id", "state", "strength", "x", "y", "z"),
+        {"payload_id": MagneticSensorData._payload_id},
+    ),
+    ResponseMotorSpeed: _Layout(
+        ("payload_id", "left", "right"),
+        {"payload_id": ResponseMotorSpeed._payload_id},
+    ),
+}
+
+_FORMAT_CHARS = {
+    "b": "i1",
+    "B": "u1",
+    "?": "?",
+    "h": "i2",
+    "H": "u2",
+    "i": "i4",
+    "I": "u4",
+    "l": "i4",
+    "L": "u4",
+    "q": "i8",
+    "Q": "u8",
+    "e": "f2",
+    "f": "f4",
+    "d": "f8",
+}
+
+BatchPayloads = Union[Sequence[Union[bytes, bytearray, memoryview]], bytes, bytearray]
+
+
+def _struct_to_dtype(converter: struct.Struct, names: Sequence[str]) -> np.dtype:
+    fmt = converter.format
+    if fmt[0] not in "<>!=":
+        raise ValueError("byte order must be specified: %s" % fmt)
+    byte_order = ">" if fmt[0] in ">!" else "<"
+    formats: List[str] = []
+    offsets: List[int] = []
+    offset = 0
+    for count_str, char in re.findall(r"(\d*)([a-zA-Z?])", fmt[1:]):
+        count = int(count_str) if count_str else 1
+        if char == "x":
+            offset += count
+            continue
+        if char not in _FORMAT_CHARS:
+            raise ValueError("unsupported format character: %s" % char)
+        for _ in range(count):
+            formats.append(byte_order + _FORMAT_CHARS[char])
+            offsets.append(offset)
+            offset += struct.calcsize(fmt[0] + char)
+    if len(formats) != len(names):
+        raise ValueError("number of names does not match to the format: %s" % fmt)
+    return np.dtype(
+        {
+            "names": list(names),
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": converter.size,
+        }
+    )
+
+
+def dtype(response_type: Type[CubeResponse]) -> np.dtype:
+    """
+    Get the NumPy dtype of the structured array returned by batch()
+
+    Args:
+        response_type (Type[CubeResponse]): response class (e.g. PositionId)
+
+    Returns:
+        np.dtype: structured dtype made from response_type._converter
+    """
+    layout = _LAYOUTS.get(response_type)
+    if layout is None:
+        raise ValueError("unsupported response type: %s" % response_type.__name__)
+    return _struct_to_dtype(
+        response_type._converter, layout.names  # type: ignore[attr-defined]
+    )
+
+
+def batch(
+    response_type: Type[CubeResponse],
+    payloads: BatchPayloads,
+    offsets: Optional[Sequence[int]] = None,
+    return_index: bool = False,
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Decode many payloads of one response type at once
+
+    Payloads can be given as a sequence of payloads,
+    or as a single concatenated buffer with the offset of each payload.
+    Payloads which are not response_type (e.g. PositionIdMissed in the
+    notifications of id information) or are too short are skipped.
+
+    Supported response types:
+        PositionId, StandardId, MotionDetectionData, PostureAngleEulerData,
+        PostureAngleQuaternionsData, PostureAngleHighPrecisionEulerData,
+        MagneticSensorData, ResponseMotorSpeed
+
+    Args:
+        response_type (Type[CubeResponse]): response class (e.g. PositionId)
+        payloads (BatchPayloads): sequence of payloads, or concatenated payloads
+        offsets (Optional[Sequence[int]]): offset of each payload
+            in the concatenated payloads (strictly increasing)
+        return_index (bool): if True, indices of the decoded payloads are also returned
+
+    Returns:
+        np.ndarray: structured array of the decoded payloads
+        (and indices of the decoded payloads in the given payloads
+        if return_index is True)
+
+    Exceptions:
+        ValueError: offsets are missing, given for a sequence of payloads,
+            or not strictly increasing within the concatenated payloads
+    """
+    record_dtype = dtype(response_type)
+    record_size = record_dtype.itemsize
+
+    if offsets is None:
+        if isinstance(payloads, (bytes, bytearray)):
+            raise ValueError("offsets are required for concatenated payloads")
+        lengths = np.fromiter(map(len, payloads), dtype=np.intp, count=len(payloads))
+        buffer = np.frombuffer(b"".join(payloads), dtype=np.uint8)
+        starts = np.zeros(len(lengths), dtype=np.intp)
+        np.cumsum(lengths[:-1], out=starts[1:])
+    else:
+        if not isinstance(payloads, (bytes, bytearray, memoryview)):
+            raise ValueError("concatenated payloads are required for offsets")
+        buffer = np.frombuffer(payloads, dtype=np.uint8)
+        starts = np.asarray(offsets, dtype=np.intp)
+        if len(starts) > 0 and (
+            starts[0] < 0 or starts[-1] >= len(buffer) or np.any(np.diff(starts) <= 0)
+        ):
+            raise ValueError("offsets must be strictly increasing within the payloads")
+        lengths = np.diff(np.append(starts, len(buffer)))
+
+    index = np.flatnonzero(lengths >= record_size)
+    # strided view in which a record starts at every byte of the buffer
+    # (no copy), from which the records are gathered by the start offsets
+    windows = np.ndarray(
+        shape=(max(0, len(buffer) - record_size + 1),),
+        dtype=np.dtype((np.void, record_size)),
+        buffer=buffer,
+        strides=(1,),
+    )
+    records = windows[starts[index]].view(record_dtype)
+
+    mask = np.ones(len(records), dtype=bool)
+    for name, value in _LAYOUTS[response_type].match.items():
+        mask &= records[name] == value
+    records = records[mask]
+    if return_index:
+        return records, index[mask]
+    else:
+        return records
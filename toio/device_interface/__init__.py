@@ -17,6 +17,7 @@ The abstract base classes defined are as follows:
 
 """
 
+import asyncio
 from abc import ABCMeta, abstractmethod
 from typing import List, Set
 from uuid import UUID
@@ -25,6 +26,7 @@ from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 from typing_extensions import (
+    AsyncIterator,
     Awaitable,
     Callable,
     Literal,
@@ -95,6 +97,72 @@ class CubeInterface(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def get_address(self) -> Optional[str]:
+        """
+        get BLE address of the cube
+
+        Returns:
+            Optional[str]: None if the address is not available
+        """
+        return None
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """
+        wait until the cube is connected
+
+        This implementation polls is_connect().
+        Subclasses can override it to wait for the connection event.
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            bool: False if timed out
+        """
+        return await self._poll_connection_state(True, timeout)
+
+    async def wait_disconnected(self, timeout: Optional[float] = None) -> bool:
+        """
+        wait until the cube is disconnected
+
+        This implementation polls is_connect().
+        Subclasses can override it to wait for the disconnection event.
+
+        Args:
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            bool: False if timed out
+        """
+        return await self._poll_connection_state(False, timeout)
+
+    async def _poll_connection_state(
+        self, connected: bool, timeout: Optional[float]
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while self.is_connect() != connected:
+            if deadline is not None and loop.time() >= deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+
+async def wait_for_event(event: asyncio.Event, timeout: Optional[float]) -> bool:
+    """
+    wait for the event with timeout
+
+    Returns:
+        bool: False if timed out
+    """
+    if event.is_set():
+        return True
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
 
 CubeDevice = BLEDevice
 CubeAdvertisement = AdvertisementData
@@ -131,3 +199,47 @@ class ScannerInterface(metaclass=ABCMeta):
     @abstractmethod
     async def scan(self, *args, **kwargs) -> List[CubeInfo]:
         raise NotImplementedError()
+
+    async def discover(
+        self,
+        num: Optional[int] = None,
+        cube_id: Optional[Set[str]] = None,
+        address: Optional[Set[str]] = None,
+        timeout: Optional[float] = DEFAULT_SCAN_TIMEOUT,
+        rssi_updates: bool = False,
+    ) -> AsyncIterator[CubeInfo]:
+        """
+        Yield cubes as they are discovered
+
+        Each cube is yielded once when it is found first.
+        When `rssi_updates` is True, the cube is yielded again
+        with the new advertisement data when its RSSI changes.
+
+        The discovery ends when `num` cubes (or all cubes specified by
+        `address`) are found, `timeout` expires, or the caller stops iterating.
+
+        This implementation yields the result of _scan().
+        Subclasses can override it to yield cubes while scanning.
+
+        >>> async for info in scanner.discover(num=2):
+        >>>     await ToioCoreCube.create(info).connect()
+
+        Args:
+            num (Optional[int]): number of cubes to be found (None: no limit)
+            cube_id (Optional[Set[str]]): set of cube id to be found
+            address (Optional[Set[str]]): set of BLE address to be found
+            timeout (Optional[float]): scan timeout [s]
+                (None: until the caller stops iterating)
+            rssi_updates (bool): yield the cube again when its RSSI changes
+
+        Yields:
+            CubeInfo: found cube
+        """
+        cube_info_list = await self._scan(
+            num=num,
+            cube_id=cube_id,
+            address=address,
+            timeout=timeout if timeout is not None else DEFAULT_SCAN_TIMEOUT,
+        )
+        for info in cube_info_list:
+            yield info
@@ -12,8 +12,9 @@ BLE device interface
 
 import asyncio
 import platform
+import re
 import sys
-from typing import Dict, List, Optional, Set, Type, Union
+from typing import AsyncIterator, Dict, List, Optional, Pattern, Set, Type, Union
 from uuid import UUID
 
 from bleak import BleakClient, BleakScanner
@@ -32,9 +33,11 @@ from ..device_interface import (
     GattWriteData,
     ScannerInterface,
     SortKey,
+    wait_for_event,
 )
 from ..logger import get_toio_logger
 from ..toio_uuid import TOIO_UUID_SERVICE
+from .rssi import RssiPolicy, RssiStatistics
 
 RSSI_UNKNOWN = -65535
 
@@ -59,20 +62,126 @@ def _get_platform_scanner_backend() -> Optional[Type[BaseBleakScanner]]:
         return None
 
 
+TOIO_UUID_SERVICE_STR = str(TOIO_UUID_SERVICE)
+
+
+def is_toio_cube_advertisement(advertisement: AdvertisementData) -> bool:
+    """
+    Check whether the advertisement contains the toio Core Cube service
+
+    The service UUIDs are compared as strings
+    (bleak gives them as lower case 128-bit UUID strings).
+    """
+    return TOIO_UUID_SERVICE_STR in advertisement.service_uuids
+
+
+def is_31j(device: BLEDevice) -> bool:
+    """
+    Check whether the cube has the wrong name "31j"
+
+    Ref: https://support.toio.io/s/article/15855
+    """
+    return device.name is not None and "31j" in device.name
+
+
+class CubeFilter:
+    """
+    Condition of cubes to be found by scanning
+
+    The addresses are normalized to upper case, and the cube ids are
+    compiled into one pattern in advance, so that match() can be called
+    for every advertisement.
+
+    Attributes:
+        address (Optional[FrozenSet[str]]): BLE addresses in upper case
+            (None: any address)
+        cube_id (Optional[FrozenSet[str]]): cube ids (None: any name)
+    """
+
+    def __init__(
+        self, cube_id: Optional[Set[str]] = None, address: Optional[Set[str]] = None
+    ):
+        self.address = (
+            None if address is None else frozenset(x.upper() for x in address)
+        )
+        self.cube_id = None if cube_id is None else frozenset(cube_id)
+        self._name_pattern: Optional[Pattern[str]] = None
+        if self.cube_id:
+            self._name_pattern = re.compile(
+                "|".join(
+                    re.escape(x) for x in sorted(self.cube_id, key=len, reverse=True)
+                )
+            )
+
+    @property
+    def target_count(self) -> Optional[int]:
+        """
+        Number of cubes specified by address or cube id (None: not specified)
+        """
+        if self.address is not None:
+            return len(self.address)
+        elif self.cube_id is not None:
+            return len(self.cube_id)
+        else:
+            return None
+
+    def match(self, device: BLEDevice) -> bool:
+        if self.address is not None:
+            return device.address.upper() in self.address
+        elif self.cube_id is not None:
+            return (
+                self._name_pattern is not None
+                and device.name is not None
+                and self._name_pattern.search(device.name) is not None
+            )
+        else:
+            return True
+
+
 class BleCube(CubeInterface):
     """
     Cube interface for internal BLE interface.
+
+    BleakClient is created when it is needed first (usually by connect()),
+    so that creating BleCube for each scanned cube is cheap.
     """
 
+    DISCONNECT_TIMEOUT: float = 5.0
+
     def __init__(self, device: Union[CubeDevice, str]):
         self.connected: bool = False
+        self._connected_event = asyncio.Event()
+        self._disconnected_event = asyncio.Event()
+        self._disconnected_event.set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._target: Union[CubeDevice, str] = device
+        self._client: Optional[BleakClient] = None
+
+    @property
+    def device(self) -> BleakClient:
+        """
+        BleakClient of the cube (created when it is accessed first)
+        """
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> BleakClient:
+        device = self._target
         if platform.system() == "Windows":
             from bleak.backends.winrt.scanner import _RawAdvData
+
             if isinstance(device, CubeDevice):
                 if device.details.adv is None:
-                    device.details = _RawAdvData(device.details.scan, device.details.scan)
+                    device.details = _RawAdvData(
+                        device.details.scan, device.details.scan
+                    )
                     logger.info("copy scan to adv")
-        self.device = BleakClient(device, backend=_get_platform_client_backend_type())
+        return BleakClient(
+            device,
+            disconnected_callback=self._on_disconnected,
+            backend=_get_platform_client_backend_type(),
+        )
 
     async def __aenter__(self):
         await self.connect()
@@ -81,11 +190,27 @@ class BleCube(CubeInterface):
     async def __aexit__(self, exc_type, exc, tb):
         await self.disconnect()
 
+    def _on_disconnected(self, _: BleakClient) -> None:
+        # disconnected_callback may be called from another thread
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._set_disconnected)
+
+    def _set_connected(self) -> None:
+        self._disconnected_event.clear()
+        self._connected_event.set()
+
+    def _set_disconnected(self) -> None:
+        self.connected = False
+        self._connected_event.clear()
+        self._disconnected_event.set()
+
     async def connect(self) -> bool:
         if not self.connected:
+            self._loop = asyncio.get_running_loop()
             self.connected = await self.device.connect()
-            while not self.device.is_connected:
-                await asyncio.sleep(0.1)
+            if self.connected:
+                self._set_connected()
         else:
             logger.warning("already connected")
         return self.connected
@@ -93,8 +218,11 @@ class BleCube(CubeInterface):
     async def disconnect(self) -> bool:
         if self.connected:
             await self.device.disconnect()
-            while self.device.is_connected:
-                await asyncio.sleep(0.1)
+            if not self.device.is_connected:
+                self._set_disconnected()
+            if not await self.wait_disconnected(self.DISCONNECT_TIMEOUT):
+                logger.warning("disconnection timed out")
+                return False
         else:
             logger.warning("already disconnected")
         return True
@@ -116,7 +244,21 @@ class BleCube(CubeInterface):
         return True
 
     def is_connect(self) -> bool:
-        return self.device.is_connected
+        return self._client is not None and self._client.is_connected
+
+    def get_address(self) -> Optional[str]:
+        if self._client is not None:
+            return self._client.address
+        elif isinstance(self._target, CubeDevice):
+            return self._target.address
+        else:
+            return self._target
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return await wait_for_event(self._connected_event, timeout)
+
+    async def wait_disconnected(self, timeout: Optional[float] = None) -> bool:
+        return await wait_for_event(self._disconnected_event, timeout)
 
 
 class BaseBleScanner(ScannerInterface):
@@ -125,7 +267,8 @@ class BaseBleScanner(ScannerInterface):
     """
 
     def __init__(self):
-        pass
+        self.rssi_statistics: Dict[str, RssiStatistics] = {}
+        """RSSI statistics of the cubes found by the latest scan (keyed by address)"""
 
     async def _scan(
         self,
@@ -134,16 +277,26 @@ class BaseBleScanner(ScannerInterface):
         address: Optional[Set[str]] = None,
         sort: SortKey = None,
         timeout: float = DEFAULT_SCAN_TIMEOUT,
+        rssi_policy: Optional[RssiPolicy] = None,
     ) -> List[CubeInfo]:
         """Scan toio Core Cubes.
         Argument 'num', 'cube_id', and 'address' is exclusive.
 
+        RSSI of every advertisement of the found cubes is collected into
+        `rssi_statistics` while scanning. Sorting by "rssi" uses the median
+        of the collected RSSI instead of the RSSI of the latest advertisement.
+
         Args:
             num (Optional[int], optional): Number of cubes to be found. Defaults to None.
             cube_id (Optional[set[str]], optional): Set of cube id to be found. Defaults to None.
             address (Optional[set[str]], optional): Set of cube BLE address to be found. Defaults to None.
             sort (SortKey, optional): Key to sort results. Defaults to None (no sort).
             timeout (float, optional): Scan timeout. Defaults to DEFAULT_SCAN_TIMEOUT.
+            rssi_policy (Optional[RssiPolicy], optional):
+                Cubes not satisfying the policy are excluded,
+                and sorting by "rssi" uses the value of the policy. Defaults to None.
+                When 'cube_id' or 'address' is specified, scanning continues until
+                every found cube has `rssi_policy.min_samples` samples.
 
         Returns:
             list[CubeInfo]: List of found cubes
@@ -167,48 +320,51 @@ class BaseBleScanner(ScannerInterface):
                 "warning: scanner: Specifying cube_id '31j' is NOT recommended"
             )
 
+        cube_filter = CubeFilter(cube_id=cube_id, address=address)
+        target_count = cube_filter.target_count
+        rssi_statistics: Dict[str, RssiStatistics] = {}
+        self.rssi_statistics = rssi_statistics
+        min_samples = 1 if rssi_policy is None else rssi_policy.min_samples
+
+        def is_target_met() -> bool:
+            if target_count is None or len(found_cubes) < target_count:
+                return False
+            return min_samples <= 1 or all(
+                x.count >= min_samples for x in rssi_statistics.values()
+            )
+
         # detection callback
         def check_condition(device: BLEDevice, advertisement: AdvertisementData):
-            service_uuids = map(UUID, advertisement.service_uuids)
-            if TOIO_UUID_SERVICE in service_uuids:
-                nonlocal w31j
-                nonlocal condition_met
-                nonlocal found_cubes
-                if not w31j and device.name is not None and "31j" in device.name:
-                    logger.warning(
-                        "warning: scanner: cube_id '31j' is found. Why not turn all cubes off and back again?"
-                    )
-                    w31j = True
-
-                if address is not None:
-                    address_list = [x.upper() for x in address]
-                    if device.address in address_list:
-                        found_cubes[device.address] = CubeInfo(
-                            name=device.name,
-                            device=device,
-                            interface=BleCube(device),
-                            advertisement=advertisement,
-                        )
-                    if len(found_cubes) >= len(address):
-                        condition_met.set()
-                elif cube_id is not None and device.name is not None:
-                    for id_str in cube_id:
-                        if id_str in device.name:
-                            found_cubes[device.address] = CubeInfo(
-                                name=device.name,
-                                device=device,
-                                interface=BleCube(device),
-                                advertisement=advertisement,
-                            )
-                    if len(found_cubes) >= len(cube_id):
-                        condition_met.set()
-                else:
-                    found_cubes[device.address] = CubeInfo(
-                        name=device.name,
-                        device=device,
-                        interface=BleCube(device),
-                        advertisement=advertisement,
-                    )
+            if not is_toio_cube_advertisement(advertisement):
+                return
+            info = found_cubes.get(device.address)
+            if info is not None:
+                # known cube: keep the interface and update the advertisement
+                found_cubes[device.address] = info._replace(advertisement=advertisement)
+                rssi_statistics[device.address].add(advertisement.rssi)
+                if min_samples > 1 and is_target_met():
+                    condition_met.set()
+                return
+
+            nonlocal w31j
+            if not w31j and is_31j(device):
+                logger.warning(
+                    "warning: scanner: cube_id '31j' is found. "
+                    "Why not turn all cubes off and back again?"
+                )
+                w31j = True
+
+            if cube_filter.match(device):
+                found_cubes[device.address] = CubeInfo(
+                    name=device.name,
+                    device=device,
+                    interface=BleCube(device),
+                    advertisement=advertisement,
+                )
+                rssi_statistics[device.address] = RssiStatistics()
+                rssi_statistics[device.address].add(advertisement.rssi)
+            if is_target_met():
+                condition_met.set()
 
         # scan ble devices
         async with BleakScanner(
@@ -226,13 +382,23 @@ class BaseBleScanner(ScannerInterface):
 
         # get the list of cubes
         toio_cubes = list(found_cubes.values())
+        if rssi_policy is not None:
+            toio_cubes = [
+                info
+                for info in toio_cubes
+                if rssi_policy.accepts(rssi_statistics.get(info.device.address))
+            ]
+        sort_policy = rssi_policy if rssi_policy is not None else RssiPolicy()
 
         # sort
         if sort is not None and len(toio_cubes) >= 2:
             if sort == "rssi":
 
-                def rssi(info: CubeInfo) -> int:
-                    if info.advertisement.rssi is not None:
+                def rssi(info: CubeInfo) -> float:
+                    value = sort_policy.value(rssi_statistics.get(info.device.address))
+                    if value is not None:
+                        return value
+                    elif info.advertisement.rssi is not None:
                         return info.advertisement.rssi
                     else:
                         return RSSI_UNKNOWN
@@ -254,3 +420,87 @@ class BaseBleScanner(ScannerInterface):
 
     async def scan(self, *args, **kwargs) -> List[CubeInfo]:
         return await self._scan(*args, **kwargs)
+
+    async def discover(
+        self,
+        num: Optional[int] = None,
+        cube_id: Optional[Set[str]] = None,
+        address: Optional[Set[str]] = None,
+        timeout: Optional[float] = DEFAULT_SCAN_TIMEOUT,
+        rssi_updates: bool = False,
+    ) -> AsyncIterator[CubeInfo]:
+        """Yield toio Core Cubes as they are discovered.
+        Argument 'cube_id' and 'address' is exclusive.
+
+        Each cube is yielded when its first advertisement is received,
+        so that the caller can connect to it while scanning continues.
+        When `rssi_updates` is True, the cube is yielded again with the same
+        interface and the new advertisement data when its RSSI changes.
+        After `num` cubes are found, other cubes are ignored.
+
+        Scanning stops when the discovery ends or the generator is closed.
+
+        Args:
+            num (Optional[int], optional): Number of cubes to be found.
+                Defaults to None (no limit).
+            cube_id (Optional[set[str]], optional): Set of cube id to be found.
+                Defaults to None.
+            address (Optional[set[str]], optional): Set of cube BLE address
+                to be found. Defaults to None.
+            timeout (Optional[float], optional): Scan timeout.
+                Defaults to DEFAULT_SCAN_TIMEOUT.
+                None means scanning until the caller stops iterating.
+            rssi_updates (bool, optional): Yield cubes again when RSSI changes.
+                Defaults to False.
+
+        Yields:
+            CubeInfo: found cube
+        """
+        queue: asyncio.Queue[CubeInfo] = asyncio.Queue()
+        found_cubes: Dict[str, CubeInfo] = {}
+        cube_filter = CubeFilter(cube_id=cube_id, address=address)
+        limit = num
+        if limit is None and cube_filter.address is not None:
+            limit = len(cube_filter.address)
+
+        # detection callback
+        def on_detection(device: BLEDevice, advertisement: AdvertisementData):
+            if not is_toio_cube_advertisement(advertisement):
+                return
+            info = found_cubes.get(device.address)
+            if info is None:
+                if limit is not None and len(found_cubes) >= limit:
+                    return
+                if not cube_filter.match(device):
+                    return
+                info = CubeInfo(
+                    name=device.name,
+                    device=device,
+                    interface=BleCube(device),
+                    advertisement=advertisement,
+                )
+                found_cubes[device.address] = info
+                queue.put_nowait(info)
+            elif rssi_updates and advertisement.rssi != info.advertisement.rssi:
+                info = info._replace(advertisement=advertisement)
+                found_cubes[device.address] = info
+                queue.put_nowait(info)
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        yielded = 0
+        async with BleakScanner(
+            detection_callback=on_detection,
+            backend=_get_platform_scanner_backend(),
+        ):
+            while rssi_updates or limit is None or yielded < limit:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0.0:
+                    break
+                try:
+                    info = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    logger.debug(f"scanner: timeout {timeout} sec")
+                    break
+                yield info
+                yielded += 1
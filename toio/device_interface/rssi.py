@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     rssi.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+RSSI statistics
+
+Rolling statistics of RSSI collected while scanning,
+and policies to select cubes by them.
+"""
+
+import statistics
+from collections import deque
+from dataclasses import dataclass
+
+from typing_extensions import (
+    Deque,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeAlias,
+)
+
+from . import CubeInfo
+
+
+class RssiStatistics:
+    """
+    Rolling statistics of RSSI of a device
+
+    Attributes:
+        count (int): number of RSSI samples added
+        latest (Optional[int]): latest RSSI
+        ewma (Optional[float]): exponentially weighted moving average of RSSI
+    """
+
+    DEFAULT_WINDOW: int = 10
+    DEFAULT_ALPHA: float = 0.3
+
+    __slots__ = ("_window", "_alpha", "count", "latest", "ewma")
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA):
+        """
+        Initialize RssiStatistics
+
+        Args:
+            window (int): number of latest samples used for the median
+            alpha (float): weight of the latest sample in the moving average (0.0 - 1.0)
+        """
+        if window < 1:
+            raise ValueError("window must be greater than 0: %d" % window)
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0.0, 1.0]: %f" % alpha)
+        self._window: Deque[int] = deque(maxlen=window)
+        self._alpha = alpha
+        self.count: int = 0
+        self.latest: Optional[int] = None
+        self.ewma: Optional[float] = None
+
+    def add(self, rssi: Optional[int]) -> None:
+        """
+        Add an RSSI sample (None is ignored)
+        """
+        if rssi is None:
+            return
+        self._window.append(rssi)
+        self.count += 1
+        self.latest = rssi
+        if self.ewma is None:
+            self.ewma = float(rssi)
+        else:
+            self.ewma += self._alpha * (rssi - self.ewma)
+
+    @property
+    def median(self) -> Optional[float]:
+        """
+        Median of the latest samples (None: no sample)
+        """
+        if len(self._window) == 0:
+            return None
+        return float(statistics.median(self._window))
+
+    @property
+    def samples(self) -> Tuple[int, ...]:
+        """
+        Latest samples (oldest first)
+        """
+        return tuple(self._window)
+
+    def __str__(self) -> str:
+        return "rssi: median=%s ewma=%s count=%d" % (
+            self.median,
+            self.ewma,
+            self.count,
+        )
+
+
+RssiKey: TypeAlias = Literal["median", "ewma", "latest"]
+
+
+@dataclass(frozen=True)
+class RssiPolicy:
+    """
+    Policy to select cubes by RSSI statistics
+
+    >>> # strongest 4 cubes which are found at least 3 times, stronger than -75dBm
+    >>> policy = RssiPolicy(min_rssi=-75, min_samples=3)
+    >>> cube_info_list = await scanner.scan(4, rssi_policy=policy)
+    """
+
+    key: RssiKey = "median"
+    """Value compared to select and sort cubes"""
+    min_rssi: Optional[float] = None
+    """Cubes weaker than this value are excluded (None: no limit)"""
+    min_samples: int = 1
+    """Cubes with fewer RSSI samples are excluded as unstable"""
+
+    def value(self, stats: Optional[RssiStatistics]) -> Optional[float]:
+        """
+        Get the value compared by this policy
+
+        Returns:
+            Optional[float]: None if no sample
+        """
+        if stats is None:
+            return None
+        if self.key == "median":
+            return stats.median
+        elif self.key == "ewma":
+            return stats.ewma
+        else:
+            return None if stats.latest is None else float(stats.latest)
+
+    def accepts(self, stats: Optional[RssiStatistics]) -> bool:
+        """
+        Check whether a cube satisfies this policy
+        """
+        if stats is None or stats.count < self.min_samples:
+            return False
+        value = self.value(stats)
+        if value is None:
+            return False
+        return self.min_rssi is None or value >= self.min_rssi
+
+    def select(
+        self,
+        cube_info_list: Iterable[CubeInfo],
+        rssi_statistics: Mapping[str, RssiStatistics],
+        num: Optional[int] = None,
+    ) -> List[CubeInfo]:
+        """
+        Select cubes satisfying this policy, strongest first
+
+        Args:
+            cube_info_list (Iterable[CubeInfo]): cubes to be selected
+            rssi_statistics (Mapping[str, RssiStatistics]):
+                statistics keyed by BLE address
+            num (Optional[int]): maximum number of cubes (None: no limit)
+
+        Returns:
+            List[CubeInfo]: selected cubes
+        """
+        selected = [
+            info
+            for info in cube_info_list
+            if self.accepts(rssi_statistics.get(info.device.address))
+        ]
+        selected.sort(
+            key=lambda info: self.value(rssi_statistics[info.device.address]) or 0.0,
+            reverse=True,
+        )
+        if num is not None:
+            return selected[:num]
+        return selected
@@ -0,0 +1,742 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     simulator.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Simulated device interface (for testing without cubes)
+
+SimulatedCube answers the GATT characteristics of toio Core Cube in-process.
+It runs simplified motor / ID / sensor / battery state machines and emits
+notifications periodically, so it can be used with ToioCoreCube and
+MultipleToioCoreCubes instead of BleCube.
+
+>>> cube = ToioCoreCube(interface=SimulatedCube())
+>>> async with MultipleToioCoreCubes(30, scanner=SimulatedScanner) as cubes:
+>>>     ...
+"""
+
+import asyncio
+import inspect
+import math
+import struct
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from ..device_interface import (
+    DEFAULT_SCAN_TIMEOUT,
+    AdvertisementData,
+    BLEDevice,
+    CubeInfo,
+    CubeInterface,
+    GattNotificationHandler,
+    GattReadData,
+    GattWriteData,
+    ScannerInterface,
+    SortKey,
+    wait_for_event,
+)
+from ..logger import get_toio_logger
+from ..position import STAY_CURRENT, CubeLocation, MatRect, Point, ToioMat
+from ..toio_uuid import TOIO_UUID_SERVICE, ToioUuid
+
+logger = get_toio_logger(__name__)
+
+SIMULATED_PROTOCOL_VERSION = "2.4.0"
+
+MOTOR_SPEED_TO_MAT_UNIT = 3.2
+"""Mat units per second moved by the motor speed value 1 (approximate)"""
+WHEEL_TREAD = 19.5
+"""Distance between the wheels in mat units (approximate)"""
+MOTOR_MIN_SPEED = 8
+"""Motor speed values less than this do not move the cube"""
+TARGET_TOLERANCE = 8.0
+"""Distance in mat units at which a target is regarded as reached"""
+ANGLE_TOLERANCE = 5.0
+"""Angle in degrees at which a target angle is regarded as reached"""
+BATTERY_NOTIFICATION_INTERVAL = 5.0
+"""Battery level notification interval [s]"""
+
+
+class SimulatedCharacteristic:
+    """
+    Characteristic object given to notification handlers by SimulatedCube
+    """
+
+    def __init__(self, uuid: UUID):
+        self.uuid = str(uuid)
+
+    def __str__(self) -> str:
+        return self.uuid
+
+
+class _MotorTarget:
+    def __init__(self, x: int, y: int, angle: int, rotation_option: int):
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.rotation_option = rotation_option
+
+
+class SimulatedCube(CubeInterface):
+    """
+    Simulated cube interface for testing without cubes.
+
+    The cube moves on a virtual mat according to the motor control commands
+    and notifies the position ID, motor speed, sensor and battery information
+    in the same format as toio Core Cube.
+
+    Args:
+        name (str): local name of the simulated cube
+        address (str): BLE address of the simulated cube
+        location (Optional[CubeLocation]): initial location on the mat
+            (None: center of the mat)
+        mat (MatRect): mat on which the cube is placed
+        battery_level (int): initial battery level
+        tick (float): interval of the state machine update and notifications [s]
+        rssi (int): RSSI reported by SimulatedScanner
+        connect_latency (float): time taken by connect() [s]
+        connect_failures (int): number of connect() calls to fail with TimeoutError
+        disconnect_latency (float): time taken by disconnect() [s]
+    """
+
+    def __init__(
+        self,
+        name: str = "toio Core Cube-Sim",
+        address: str = "00:00:00:00:00:00",
+        location: Optional[CubeLocation] = None,
+        mat: MatRect = ToioMat.ToioCollectionMatRing,
+        battery_level: int = 100,
+        tick: float = 0.01,
+        rssi: int = -50,
+        connect_latency: float = 0.0,
+        connect_failures: int = 0,
+        disconnect_latency: float = 0.0,
+    ):
+        self.name = name
+        self.address = address
+        self.mat = mat
+        self.tick = tick
+        self.rssi = rssi
+        self.connect_latency = connect_latency
+        self.connect_failures = connect_failures
+        self.disconnect_latency = disconnect_latency
+        self.connected: bool = False
+        self.notification_count: int = 0
+        self._connected_event = asyncio.Event()
+        self._disconnected_event = asyncio.Event()
+        self._disconnected_event.set()
+
+        if location is None:
+            center = mat.center()
+            location = CubeLocation(point=center, angle=0)
+        self._x: float = float(location.point.x)
+        self._y: float = float(location.point.y)
+        self._angle: float = float(location.angle)
+        self.on_mat: bool = location.point in mat
+
+        self.battery_level = battery_level
+        self.button_pressed = False
+
+        self._handlers: Dict[UUID, GattNotificationHandler] = {}
+        self._characteristics: Dict[UUID, SimulatedCharacteristic] = {
+            x.value: SimulatedCharacteristic(x.value) for x in ToioUuid
+        }
+        self._values: Dict[UUID, bytearray] = {}
+        self._pending_tasks: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        # motor state
+        self._left: int = 0
+        self._right: int = 0
+        self._motor_deadline: Optional[float] = None
+        self._targets: List[_MotorTarget] = []
+        self._target_request: Optional[Tuple[int, int]] = None
+        self._target_speed: int = 0
+        self._target_deadline: Optional[float] = None
+        self._target_start_angle: float = 0.0
+        self._last_motor_speed: Tuple[int, int] = (0, 0)
+
+        # configuration state
+        self.horizontal_detection_threshold: int = 45
+        self.collision_detection_threshold: int = 7
+        self.double_tap_detection_time_interval: int = 5
+        self.id_notification_interval: float = 0.0
+        self.id_notification_condition: int = 0x00
+        self.id_missed_sensitivity: float = 0.0
+        self.magnetic_sensor_function: int = 0x00
+        self.magnetic_sensor_interval: float = 0.0
+        self.posture_angle_type: int = 0x00
+        self.posture_angle_interval: float = 0.0
+        self.motor_speed_enabled: bool = False
+        self.connection_interval: Tuple[int, int] = (0xFFFF, 0xFFFF)
+
+        # notification timing
+        self._last_id_time: float = 0.0
+        self._last_id_payload: Optional[bytes] = None
+        self._last_off_mat_time: Optional[float] = None
+        self._id_missed_notified: bool = False
+        self._last_posture_time: float = 0.0
+        self._last_magnetic_time: float = 0.0
+        self._last_battery_time: float = 0.0
+        self._last_update: float = 0.0
+
+        self._values[ToioUuid.Battery.value] = bytearray((battery_level,))
+        self._values[ToioUuid.Button.value] = bytearray((0x01, 0x00))
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+
+    async def connect(self) -> bool:
+        if self.connect_latency > 0.0:
+            await asyncio.sleep(self.connect_latency)
+        if self.connect_failures > 0:
+            self.connect_failures -= 1
+            raise asyncio.TimeoutError("simulated connection failure")
+        if not self.connected:
+            self.connected = True
+            self._disconnected_event.clear()
+            self._connected_event.set()
+            now = time.monotonic()
+            self._last_update = now
+            self._last_battery_time = now
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            logger.warning("already connected")
+        return self.connected
+
+    async def disconnect(self) -> bool:
+        if self.disconnect_latency > 0.0:
+            await asyncio.sleep(self.disconnect_latency)
+        if self.connected:
+            self.connected = False
+            self._connected_event.clear()
+            self._disconnected_event.set()
+            if self._task is not None:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+                self._task = None
+            self._handlers.clear()
+        else:
+            logger.warning("already disconnected")
+        return True
+
+    async def read(self, char_uuid: UUID) -> GattReadData:
+        return bytearray(self._values.get(char_uuid, b""))
+
+    async def write(
+        self, char_uuid: UUID, data: GattWriteData, response: bool = False
+    ) -> None:
+        payload = bytes(data)
+        if len(payload) == 0:
+            return
+        if char_uuid == ToioUuid.Motor.value:
+            self._write_motor(payload)
+        elif char_uuid == ToioUuid.Config.value:
+            self._write_configuration(payload)
+        elif char_uuid == ToioUuid.Sensor.value:
+            self._write_sensor(payload)
+
+    async def register_notification_handler(
+        self, char_uuid: UUID, notification_handler: GattNotificationHandler
+    ) -> bool:
+        self._handlers[char_uuid] = notification_handler
+        return True
+
+    async def unregister_notification_handler(self, char_uuid: UUID) -> bool:
+        self._handlers.pop(char_uuid, None)
+        return True
+
+    def is_connect(self) -> bool:
+        return self.connected
+
+    def get_address(self) -> Optional[str]:
+        return self.address
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return await wait_for_event(self._connected_event, timeout)
+
+    async def wait_disconnected(self, timeout: Optional[float] = None) -> bool:
+        return await wait_for_event(self._disconnected_event, timeout)
+
+    # operations to the simulated cube from tests
+
+    def place(self, location: CubeLocation) -> None:
+        """
+        Place the cube on the mat at the specified location
+        """
+        self._x = float(location.point.x)
+        self._y = float(location.point.y)
+        self._angle = float(location.angle)
+        self.on_mat = location.point in self.mat
+
+    def lift(self) -> None:
+        """
+        Lift the cube from the mat
+        """
+        self.on_mat = False
+
+    def press_button(self) -> None:
+        """
+        Press the button of the cube
+        """
+        self.button_pressed = True
+        self.notify(ToioUuid.Button.value, bytes((0x01, 0x80)))
+
+    def release_button(self) -> None:
+        """
+        Release the button of the cube
+        """
+        self.button_pressed = False
+        self.notify(ToioUuid.Button.value, bytes((0x01, 0x00)))
+
+    @property
+    def location(self) -> CubeLocation:
+        """
+        Current location of the cube
+        """
+        return CubeLocation(
+            point=Point(round(self._x), round(self._y)), angle=round(self._angle) % 360
+        )
+
+    @property
+    def motor_speed(self) -> Tuple[int, int]:
+        """
+        Current motor speed (left, right)
+        """
+        return self._left, self._right
+
+    def notify(self, char_uuid: UUID, payload: bytes) -> None:
+        """
+        Send notification to the registered handler
+        """
+        data = bytearray(payload)
+        self._values[char_uuid] = data
+        handler = self._handlers.get(char_uuid)
+        if handler is None or not self.connected:
+            return
+        self.notification_count += 1
+        result = handler(self._characteristics[char_uuid], data)  # type: ignore
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._pending_tasks.add(task)
+            task.add_done_callback(self._pending_tasks.discard)
+
+    # state machine
+
+    async def _run(self) -> None:
+        while self.connected:
+            await asyncio.sleep(self.tick)
+            now = time.monotonic()
+            dt = now - self._last_update
+            self._last_update = now
+            self._update_motor(now, dt)
+            self._update_id(now)
+            self._update_motor_speed()
+            self._update_sensor(now)
+            self._update_battery(now)
+
+    def _update_motor(self, now: float, dt: float) -> None:
+        if self._motor_deadline is not None and now >= self._motor_deadline:
+            self._left = self._right = 0
+            self._motor_deadline = None
+        if self._target_request is not None:
+            self._drive_to_target(now)
+        left = self._left if abs(self._left) >= MOTOR_MIN_SPEED else 0
+        right = self._right if abs(self._right) >= MOTOR_MIN_SPEED else 0
+        if left == 0 and right == 0:
+            return
+        v_left = left * MOTOR_SPEED_TO_MAT_UNIT
+        v_right = right * MOTOR_SPEED_TO_MAT_UNIT
+        velocity = (v_left + v_right) / 2
+        omega = (v_left - v_right) / WHEEL_TREAD
+        rad = math.radians(self._angle)
+        self._x += velocity * math.cos(rad) * dt
+        self._y += velocity * math.sin(rad) * dt
+        self._angle = (self._angle + math.degrees(omega * dt)) % 360
+        self.on_mat = self.location.point in self.mat
+
+    def _finish_target(self, code: int) -> None:
+        assert self._target_request is not None
+        payload_id, request_id = self._target_request
+        self._target_request = None
+        self._targets = []
+        self._left = self._right = 0
+        self.notify(ToioUuid.Motor.value, bytes((payload_id, request_id, code)))
+
+    def _drive_to_target(self, now: float) -> None:
+        if not self.on_mat:
+            self._finish_target(0x02)
+            return
+        if self._target_deadline is not None and now >= self._target_deadline:
+            self._finish_target(0x01)
+            return
+        target = self._targets[0]
+        tx = self._x if target.x == STAY_CURRENT else target.x
+        ty = self._y if target.y == STAY_CURRENT else target.y
+        dx = tx - self._x
+        dy = ty - self._y
+        if math.hypot(dx, dy) > TARGET_TOLERANCE:
+            heading = math.degrees(math.atan2(dy, dx))
+            self._steer(heading, self._target_speed)
+            return
+        target_angle = self._target_angle(target)
+        if target_angle is not None:
+            diff = (target_angle - self._angle + 180) % 360 - 180
+            if abs(diff) > ANGLE_TOLERANCE:
+                speed = max(MOTOR_MIN_SPEED, self._target_speed // 2)
+                self._left, self._right = (
+                    (speed, -speed) if diff > 0 else (-speed, speed)
+                )
+                return
+        self._targets.pop(0)
+        self._target_start_angle = self._angle
+        if len(self._targets) == 0:
+            self._finish_target(0x00)
+
+    def _target_angle(self, target: _MotorTarget) -> Optional[float]:
+        option = target.rotation_option
+        if option in (0, 1, 2):
+            return float(target.angle)
+        elif option == 3:
+            return self._target_start_angle + target.angle
+        elif option == 4:
+            return self._target_start_angle - target.angle
+        elif option == 6:
+            return self._target_start_angle
+        else:
+            return None
+
+    def _steer(self, heading: float, speed: int) -> None:
+        diff = (heading - self._angle + 180) % 360 - 180
+        if abs(diff) > 90:
+            half = max(MOTOR_MIN_SPEED, speed // 2)
+            self._left, self._right = (half, -half) if diff > 0 else (-half, half)
+        else:
+            turn = diff / 90
+            self._left = round(speed * min(1.0, 1 + turn))
+            self._right = round(speed * min(1.0, 1 - turn))
+
+    def _update_id(self, now: float) -> None:
+        if not self.on_mat:
+            if self._last_off_mat_time is None:
+                self._last_off_mat_time = now
+            if (
+                not self._id_missed_notified
+                and now - self._last_off_mat_time >= self.id_missed_sensitivity
+            ):
+                self._id_missed_notified = True
+                self._last_id_payload = None
+                self.notify(ToioUuid.Id.value, bytes((0x03,)))
+            return
+        self._last_off_mat_time = None
+        self._id_missed_notified = False
+        if now - self._last_id_time < self.id_notification_interval:
+            return
+        x, y, angle = self.location.flatten()
+        payload = struct.pack("<BHHHHHH", 0x01, x, y, angle, x, y, angle)
+        if self.id_notification_condition == 0x01 and payload == self._last_id_payload:
+            return
+        self._last_id_time = now
+        self._last_id_payload = payload
+        self.notify(ToioUuid.Id.value, payload)
+
+    def _update_motor_speed(self) -> None:
+        if not self.motor_speed_enabled:
+            return
+        speed = (
+            min(abs(self._left), 255) if abs(self._left) >= MOTOR_MIN_SPEED else 0,
+            min(abs(self._right), 255) if abs(self._right) >= MOTOR_MIN_SPEED else 0,
+        )
+        if speed != self._last_motor_speed:
+            self._last_motor_speed = speed
+            self.notify(ToioUuid.Motor.value, bytes((0xE0,) + speed))
+
+    def _update_sensor(self, now: float) -> None:
+        if self.posture_angle_type != 0x00 and self.posture_angle_interval > 0:
+            if now - self._last_posture_time >= self.posture_angle_interval:
+                self._last_posture_time = now
+                self.notify(
+                    ToioUuid.Sensor.value,
+                    self._posture_angle_payload(self.posture_angle_type),
+                )
+        if self.magnetic_sensor_function != 0x00 and self.magnetic_sensor_interval > 0:
+            if now - self._last_magnetic_time >= self.magnetic_sensor_interval:
+                self._last_magnetic_time = now
+                self.notify(ToioUuid.Sensor.value, self._magnetic_sensor_payload())
+
+    def _update_battery(self, now: float) -> None:
+        if now - self._last_battery_time >= BATTERY_NOTIFICATION_INTERVAL:
+            self._last_battery_time = now
+            self.notify(ToioUuid.Battery.value, bytes((self.battery_level,)))
+
+    # payloads
+
+    def _motion_payload(self) -> bytes:
+        # horizontal, no collision, no double tap, top posture, no shake
+        return bytes((0x01, 0x01, 0x00, 0x00, 0x01, 0x00))
+
+    def _posture_angle_payload(self, data_type: int) -> bytes:
+        yaw = round(self._angle) % 360
+        if data_type == 0x02:
+            half = math.radians(yaw) / 2
+            return struct.pack(
+                "<BBffff", 0x03, 0x02, math.cos(half), 0.0, 0.0, math.sin(half)
+            )
+        elif data_type == 0x03:
+            return struct.pack("<BBfff", 0x03, 0x03, 0.0, 0.0, float(yaw))
+        else:
+            return struct.pack("<BBhhh", 0x03, 0x01, 0, 0, yaw)
+
+    def _magnetic_sensor_payload(self) -> bytes:
+        # no magnet is detected
+        return struct.pack("<BBBbbb", 0x02, 0x00, 0x00, 0, 0, 0)
+
+    # command handling
+
+    def _write_motor(self, payload: bytes) -> None:
+        payload_id = payload[0]
+        if payload_id in (0x01, 0x02) and len(payload) >= 7:
+            self._target_request = None
+            self._left = payload[3] if payload[2] == 0x01 else -payload[3]
+            self._right = payload[6] if payload[5] == 0x01 else -payload[6]
+            duration = payload[7] if payload_id == 0x02 and len(payload) >= 8 else 0
+            if duration > 0:
+                self._motor_deadline = time.monotonic() + duration / 100
+            else:
+                self._motor_deadline = None
+        elif payload_id == 0x03 and len(payload) >= 13:
+            (_, request_id, timeout, _, speed, _, _, x, y, angle) = struct.unpack_from(
+                "<BBBBBBBHHH", payload
+            )
+            target = _MotorTarget(x, y, angle & 0x1FFF, angle >> 13)
+            self._start_target(0x83, request_id, timeout, speed, [target], False)
+        elif payload_id == 0x04 and len(payload) >= 8:
+            (_, request_id, timeout, _, speed, _, _, mode) = struct.unpack_from(
+                "<BBBBBBBB", payload
+            )
+            targets = [
+                _MotorTarget(x, y, angle & 0x1FFF, angle >> 13)
+                for x, y, angle in struct.iter_unpack("<HHH", payload[8:])
+            ]
+            self._start_target(0x84, request_id, timeout, speed, targets, mode == 1)
+        elif payload_id == 0x05 and len(payload) >= struct.calcsize("<BBBHBBBB"):
+            (_, translation, _, rotation, r_dir, c_dir, _, duration) = (
+                struct.unpack_from("<BBBHBBBB", payload)
+            )
+            self._target_request = None
+            forward = -translation if c_dir == 1 else translation
+            turn = rotation * math.radians(1) * WHEEL_TREAD / MOTOR_SPEED_TO_MAT_UNIT
+            turn = -turn if r_dir == 1 else turn
+            self._left = round(forward + turn / 2)
+            self._right = round(forward - turn / 2)
+            if duration > 0:
+                self._motor_deadline = time.monotonic() + duration / 100
+            else:
+                self._motor_deadline = None
+
+    def _start_target(
+        self,
+        payload_id: int,
+        request_id: int,
+        timeout: int,
+        speed: int,
+        targets: List[_MotorTarget],
+        append: bool,
+    ) -> None:
+        if self._target_request is not None:
+            if append and self._target_request[0] == payload_id:
+                self._targets.extend(targets)
+                return
+            self._finish_target(0x05)
+        self._motor_deadline = None
+        self._targets = targets
+        self._target_request = (payload_id, request_id)
+        self._target_speed = max(speed, MOTOR_MIN_SPEED)
+        self._target_start_angle = self._angle
+        timeout_s = 10 if timeout == 0 else timeout
+        self._target_deadline = time.monotonic() + timeout_s
+        if len(self._targets) == 0:
+            self._finish_target(0x03)
+
+    def _write_configuration(self, payload: bytes) -> None:
+        payload_id = payload[0]
+        response: Optional[bytes] = None
+        if payload_id == 0x01:
+            version = SIMULATED_PROTOCOL_VERSION.encode("UTF-8")
+            response = bytes((0x81, 0x00)) + version
+        elif payload_id == 0x05 and len(payload) >= 3:
+            self.horizontal_detection_threshold = payload[2]
+        elif payload_id == 0x06 and len(payload) >= 3:
+            self.collision_detection_threshold = payload[2]
+        elif payload_id == 0x17 and len(payload) >= 3:
+            self.double_tap_detection_time_interval = payload[2]
+        elif payload_id == 0x18 and len(payload) >= 4:
+            self.id_notification_interval = payload[2] / 100
+            self.id_notification_condition = payload[3]
+            response = bytes((0x98, 0x00, 0x00))
+        elif payload_id == 0x19 and len(payload) >= 3:
+            self.id_missed_sensitivity = payload[2] / 100
+            response = bytes((0x99, 0x00, 0x00))
+        elif payload_id == 0x1B and len(payload) >= 5:
+            self.magnetic_sensor_function = payload[2]
+            self.magnetic_sensor_interval = payload[3] * 0.02
+            response = bytes((0x9B, 0x00, 0x00))
+        elif payload_id == 0x1C and len(payload) >= 3:
+            self.motor_speed_enabled = payload[2] == 0x01
+            response = bytes((0x9C, 0x00, 0x00))
+        elif payload_id == 0x1D and len(payload) >= 5:
+            self.posture_angle_type = payload[2]
+            self.posture_angle_interval = payload[3] / 100
+            response = bytes((0x9D, 0x00, 0x00))
+        elif payload_id == 0x30 and len(payload) >= 6:
+            _, _, min_interval, max_interval = struct.unpack_from("<BBHH", payload)
+            self.connection_interval = (min_interval, max_interval)
+            response = bytes((0xB0, 0x00, 0x00))
+        elif payload_id == 0x31:
+            response = struct.pack("<BBHH", 0xB1, 0x00, *self.connection_interval)
+        elif payload_id == 0x32:
+            min_interval, max_interval = self.connection_interval
+            current = 0x0C if min_interval == 0xFFFF else min_interval
+            if max_interval != 0xFFFF:
+                current = max(current, min(max_interval, 0x0C))
+            response = struct.pack("<BBH", 0xB2, 0x00, current)
+        if response is not None:
+            self.notify(ToioUuid.Config.value, response)
+
+    def _write_sensor(self, payload: bytes) -> None:
+        payload_id = payload[0]
+        if payload_id == 0x81:
+            self.notify(ToioUuid.Sensor.value, self._motion_payload())
+        elif payload_id == 0x82:
+            self.notify(ToioUuid.Sensor.value, self._magnetic_sensor_payload())
+        elif payload_id == 0x83 and len(payload) >= 2:
+            self.notify(ToioUuid.Sensor.value, self._posture_angle_payload(payload[1]))
+
+
+class SimulatedScanner(ScannerInterface):
+    """
+    Scanner which "finds" simulated cubes.
+
+    Every requested cube is found immediately.
+    The keyword arguments given to the constructor are passed to SimulatedCube.
+    """
+
+    _CUBE_COUNT: int = 0
+
+    def __init__(self, **cube_args: Any):
+        self._cube_args = cube_args
+
+    def _create_cube_info(
+        self, cube_id: Optional[str] = None, address: Optional[str] = None
+    ) -> CubeInfo:
+        number = SimulatedScanner._CUBE_COUNT
+        SimulatedScanner._CUBE_COUNT += 1
+        if cube_id is None:
+            cube_id = "S%02X" % (number & 0xFF)
+        if address is None:
+            address = "00:00:00:00:%02X:%02X" % ((number >> 8) & 0xFF, number & 0xFF)
+        name = "toio Core Cube-" + cube_id
+        rssi = -40 - (number % 50)
+        cube_args = dict(self._cube_args)
+        cube_args.setdefault("rssi", rssi)
+        interface = SimulatedCube(name=name, address=address, **cube_args)
+        device = BLEDevice(address, name, None, rssi=interface.rssi)
+        advertisement = AdvertisementData(
+            local_name=name,
+            manufacturer_data={},
+            service_data={},
+            service_uuids=[str(TOIO_UUID_SERVICE)],
+            tx_power=None,
+            rssi=interface.rssi,
+            platform_data=(),
+        )
+        return CubeInfo(
+            name=name, device=device, interface=interface, advertisement=advertisement
+        )
+
+    async def _scan(
+        self,
+        num: Optional[int] = None,
+        cube_id: Optional[Set[str]] = None,
+        address: Optional[Set[str]] = None,
+        sort: SortKey = None,
+        timeout: float = DEFAULT_SCAN_TIMEOUT,
+    ) -> List[CubeInfo]:
+        if address is not None:
+            found = [self._create_cube_info(address=x.upper()) for x in address]
+        elif cube_id is not None:
+            found = [self._create_cube_info(cube_id=x) for x in cube_id]
+        else:
+            found = [self._create_cube_info() for _ in range(num or 1)]
+
+        if sort == "rssi":
+            found.sort(key=lambda info: info.advertisement.rssi, reverse=True)
+        elif sort == "local_name":
+            found.sort(key=lambda info: info.name or "")
+        if num is not None and len(found) > num:
+            return found[:num]
+        else:
+            return found
+
+    async def scan(  # type: ignore
+        self, num: int, sort: SortKey = "rssi", timeout: float = DEFAULT_SCAN_TIMEOUT
+    ) -> List[CubeInfo]:
+        """Scan the specified number of simulated cubes.
+
+        Args:
+            num (int): Number of cubes to be found.
+            sort (SortKey, optional): Key to sort results. Defaults to "rssi".
+            timeout (float, optional): Not used.
+
+        Returns:
+            List[CubeInfo]: List of found cubes.
+        """
+        return await self._scan(num=num, sort=sort, timeout=timeout)
+
+    async def scan_with_id(
+        self,
+        cube_id: Set[str],
+        sort: SortKey = "rssi",
+        timeout: float = DEFAULT_SCAN_TIMEOUT,
+    ) -> List[CubeInfo]:
+        """Scan simulated cubes with specified id.
+
+        Args:
+            cube_id (set[str]): Set of cube id to be found.
+            sort (SortKey, optional): Key to sort results. Defaults to "rssi".
+            timeout (float, optional): Not used.
+
+        Returns:
+            List[CubeInfo]: List of found cubes.
+        """
+        return await self._scan(cube_id=cube_id, sort=sort, timeout=timeout)
+
+    async def scan_with_address(
+        self,
+        address: Set[str],
+        sort: SortKey = "rssi",
+        timeout: float = DEFAULT_SCAN_TIMEOUT,
+    ) -> List[CubeInfo]:
+        """Scan simulated cubes with specified BLE address.
+
+        Args:
+            address (set[str]): Set of BLE address to be found.
+            sort (SortKey, optional): Key to sort results. Defaults to "rssi".
+            timeout (float, optional): Not used.
+
+        Returns:
+            List[CubeInfo]: List of found cubes.
+        """
+        return await self._scan(address=address, sort=sort, timeout=timeout)
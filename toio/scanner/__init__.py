@@ -9,8 +9,21 @@
 
 from typing_extensions import Tuple
 
+from ..device_interface.rssi import RssiKey, RssiPolicy, RssiStatistics
 from .ble import UniversalBleScanner
+from .cache import CachedCube, ScanCache
+from .service import CubePresence, PresenceEvent, ScannerService
 
 BLEScanner = UniversalBleScanner()
 
-__all__: Tuple[str, ...] = ("BLEScanner",)
+__all__: Tuple[str, ...] = (
+    "BLEScanner",
+    "CachedCube",
+    "ScanCache",
+    "CubePresence",
+    "PresenceEvent",
+    "ScannerService",
+    "RssiKey",
+    "RssiPolicy",
+    "RssiStatistics",
+)
@@ -12,14 +12,17 @@ BLE scanner (including specific functions for each supported OS)
 Scan toio Core Cubes with internal BLE interface.
 """
 
+import asyncio
 import functools
 import platform
 
-from typing_extensions import Any, List, NamedTuple, Optional, Set
+from typing_extensions import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Set
 
 from ..device_interface import DEFAULT_SCAN_TIMEOUT, CubeInfo, ScannerInterface, SortKey
-from ..device_interface.ble import BaseBleScanner
+from ..device_interface.ble import RSSI_UNKNOWN, BaseBleScanner, BleCube
+from ..device_interface.rssi import RssiPolicy, RssiStatistics
 from ..logger import get_toio_logger
+from .cache import CachedCube, ScanCache
 
 logger = get_toio_logger(__name__)
 
@@ -46,6 +49,21 @@ def async_platform_specified(param: PlatformParam = PlatformParam("UNKNOWN", Non
 
 
 class UniversalBleScanner(ScannerInterface):
+    CACHED_CONNECT_TIMEOUT: float = 3.0
+    MAX_CONCURRENT_CONNECTIONS: int = 4
+
+    def __init__(self, cache: Optional[ScanCache] = None):
+        """
+        Initialize UniversalBleScanner
+
+        Args:
+            cache (Optional[ScanCache]): cache to record found cubes
+                (None: not recorded)
+        """
+        self.cache = cache
+        self.rssi_statistics: Dict[str, RssiStatistics] = {}
+        """RSSI statistics of the cubes found by the latest scan (keyed by address)"""
+
     async def _scan(
         self,
         num: Optional[int] = None,
@@ -53,14 +71,28 @@ class UniversalBleScanner(ScannerInterface):
         address: Optional[Set[str]] = None,
         sort: SortKey = None,
         timeout: float = DEFAULT_SCAN_TIMEOUT,
+        rssi_policy: Optional[RssiPolicy] = None,
     ) -> List[CubeInfo]:
         scanner = BaseBleScanner()
-        return await scanner._scan(
-            num=num, cube_id=cube_id, address=address, sort=sort, timeout=timeout
+        found = await scanner._scan(
+            num=num,
+            cube_id=cube_id,
+            address=address,
+            sort=sort,
+            timeout=timeout,
+            rssi_policy=rssi_policy,
         )
+        self.rssi_statistics = scanner.rssi_statistics
+        if self.cache is not None:
+            self.cache.update(found)
+        return found
 
     async def scan(  # type: ignore
-        self, num: int, sort: SortKey = "rssi", timeout: float = DEFAULT_SCAN_TIMEOUT
+        self,
+        num: int,
+        sort: SortKey = "rssi",
+        timeout: float = DEFAULT_SCAN_TIMEOUT,
+        rssi_policy: Optional[RssiPolicy] = None,
     ) -> List[CubeInfo]:
         """Scan the specified number of toio Core Cubes.
 
@@ -68,21 +100,32 @@ class UniversalBleScanner(ScannerInterface):
         In the case of a timeout, the number of elements in the returned list
         is the number of cubes found at the time of the timeout.
 
+        When `rssi_policy` is specified, the cubes not satisfying the policy
+        are excluded. For example, the strongest 4 cubes which are found at
+        least 3 times and stronger than -75dBm are selected by:
+
+        >>> await scanner.scan(4, rssi_policy=RssiPolicy(min_rssi=-75, min_samples=3))
+
         Args:
             num (int): Number of cubes to be found.
             sort (SortKey, optional): Key to sort results. Defaults to "rssi".
             timeout (float, optional): Scan timeout. Defaults to DEFAULT_SCAN_TIMEOUT.
+            rssi_policy (Optional[RssiPolicy], optional):
+                Policy to select cubes by RSSI. Defaults to None.
 
         Returns:
             List[Tuple[BLEDevice, AdvertisementData]]: List of found cubes.
         """
-        return await self._scan(num=num, sort=sort, timeout=timeout)
+        return await self._scan(
+            num=num, sort=sort, timeout=timeout, rssi_policy=rssi_policy
+        )
 
     async def scan_with_id(
         self,
         cube_id: Set[str],
         sort: SortKey = "rssi",
         timeout: float = DEFAULT_SCAN_TIMEOUT,
+        rssi_policy: Optional[RssiPolicy] = None,
     ) -> List[CubeInfo]:
         """Scan toio Core Cubes with specified id.
 
@@ -94,17 +137,22 @@ class UniversalBleScanner(ScannerInterface):
             cube_id (set[str]): Set of cube id to be found.
             sort (SortKey, optional): Key to sort results. Defaults to "rssi".
             timeout (float, optional): Scan timeout. Defaults to DEFAULT_SCAN_TIMEOUT.
+            rssi_policy (Optional[RssiPolicy], optional):
+                Policy to select cubes by RSSI. Defaults to None.
 
         Returns:
             List[Tuple[BLEDevice, AdvertisementData]]: List of found cubes.
         """
-        return await self._scan(cube_id=cube_id, sort=sort, timeout=timeout)
+        return await self._scan(
+            cube_id=cube_id, sort=sort, timeout=timeout, rssi_policy=rssi_policy
+        )
 
     async def scan_with_address(
         self,
         address: Set[str],
         sort: SortKey = "rssi",
         timeout: float = DEFAULT_SCAN_TIMEOUT,
+        rssi_policy: Optional[RssiPolicy] = None,
     ) -> List[CubeInfo]:
         """Scan toio Core Cubes with specified BLE address.
 
@@ -116,11 +164,158 @@ class UniversalBleScanner(ScannerInterface):
             address (set[str]): Set of BLE address to be found.
             sort (SortKey, optional): Key to sort results. Defaults to "rssi".
             timeout (float, optional): Scan timeout. Defaults to DEFAULT_SCAN_TIMEOUT.
+            rssi_policy (Optional[RssiPolicy], optional):
+                Policy to select cubes by RSSI. Defaults to None.
 
         Returns:
             List[Tuple[BLEDevice, AdvertisementData]]: List of found cubes.
         """
-        return await self._scan(address=address, sort=sort, timeout=timeout)
+        return await self._scan(
+            address=address, sort=sort, timeout=timeout, rssi_policy=rssi_policy
+        )
+
+    async def discover(
+        self,
+        num: Optional[int] = None,
+        cube_id: Optional[Set[str]] = None,
+        address: Optional[Set[str]] = None,
+        timeout: Optional[float] = DEFAULT_SCAN_TIMEOUT,
+        rssi_updates: bool = False,
+    ) -> AsyncIterator[CubeInfo]:
+        """Yield toio Core Cubes as they are discovered.
+
+        Each cube is yielded as soon as it is found, so that connecting to
+        the cube can be started while scanning continues.
+
+        >>> async for info in UniversalBleScanner().discover(num=2):
+        >>>     cube = ToioCoreCube.create(info)
+        >>>     await cube.connect()
+
+        Args:
+            num (Optional[int], optional): Number of cubes to be found.
+                Defaults to None (no limit).
+            cube_id (Optional[set[str]], optional): Set of cube id to be found.
+                Defaults to None.
+            address (Optional[set[str]], optional): Set of BLE address to be found.
+                Defaults to None.
+            timeout (Optional[float], optional): Scan timeout.
+                Defaults to DEFAULT_SCAN_TIMEOUT.
+                None means scanning until the caller stops iterating.
+            rssi_updates (bool, optional): Yield cubes again when RSSI changes.
+                Defaults to False.
+
+        Yields:
+            CubeInfo: found cube
+        """
+        scanner = BaseBleScanner()
+        discovered: Set[str] = set()
+        try:
+            async for info in scanner.discover(
+                num=num,
+                cube_id=cube_id,
+                address=address,
+                timeout=timeout,
+                rssi_updates=rssi_updates,
+            ):
+                if self.cache is not None and info.device.address not in discovered:
+                    discovered.add(info.device.address)
+                    self.cache.update((info,), save=False)
+                yield info
+        finally:
+            if self.cache is not None:
+                self.cache.flush()
+
+    async def scan_cached(
+        self,
+        num: int,
+        sort: SortKey = "rssi",
+        timeout: float = DEFAULT_SCAN_TIMEOUT,
+        connect_timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[CubeInfo]:
+        """Find toio Core Cubes recorded in the scan cache, and scan the rest.
+
+        Up to `num` cubes in the cache (newest first) are connected directly
+        by BLE address without waiting for the scan timeout.
+        Up to `max_concurrency` cubes are connected at the same time.
+        Only when some of them can not be connected, the remaining number of
+        cubes are scanned.
+
+        The interfaces of the cubes found in the cache are already connected.
+        ToioCoreCube.connect() can be called for them as usual
+        (it does not connect the interface again).
+
+        Without the cache, this function works as scan().
+
+        Args:
+            num (int): Number of cubes to be found.
+            sort (SortKey, optional): Key to sort results. Defaults to "rssi".
+            timeout (float, optional): Scan timeout. Defaults to DEFAULT_SCAN_TIMEOUT.
+            connect_timeout (Optional[float], optional):
+                Timeout of each direct connection.
+                Defaults to UniversalBleScanner.CACHED_CONNECT_TIMEOUT.
+            max_concurrency (Optional[int], optional):
+                Maximum number of direct connections in progress.
+                Defaults to UniversalBleScanner.MAX_CONCURRENT_CONNECTIONS.
+
+        Returns:
+            List[CubeInfo]: List of found cubes.
+        """
+        if self.cache is None:
+            return await self.scan(num, sort, timeout)
+        if connect_timeout is None:
+            connect_timeout = self.CACHED_CONNECT_TIMEOUT
+        if max_concurrency is None:
+            max_concurrency = self.MAX_CONCURRENT_CONNECTIONS
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        candidates = self.cache.cubes()[:num]
+        result_list = await asyncio.gather(
+            *[
+                self._connect_cached(cube, connect_timeout, semaphore)
+                for cube in candidates
+            ]
+        )
+        found = [info for info in result_list if info is not None]
+        logger.info("scan cache: %d/%d cube(s) connected", len(found), num)
+        self.cache.update(found, save=False)
+        if len(found) < num:
+            found_addresses = {info.device.address.upper() for info in found}
+            scanned = await self._scan(num=num - len(found), sort=sort, timeout=timeout)
+            found += [
+                info
+                for info in scanned
+                if info.device.address.upper() not in found_addresses
+            ]
+
+        if sort == "rssi":
+
+            def rssi(info: CubeInfo) -> int:
+                if info.advertisement.rssi is not None:
+                    return info.advertisement.rssi
+                else:
+                    return RSSI_UNKNOWN
+
+            found.sort(key=rssi, reverse=True)
+        elif sort == "local_name":
+            found.sort(key=lambda info: info.name or "")
+        self.cache.flush()
+        return found[:num]
+
+    async def _connect_cached(
+        self, cube: CachedCube, timeout: float, semaphore: asyncio.Semaphore
+    ) -> Optional[CubeInfo]:
+        interface = BleCube(cube.address)
+        try:
+            async with semaphore:
+                connected = await asyncio.wait_for(interface.connect(), timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("scan cache: %s is not connected: %s", cube.address, repr(e))
+            connected = False
+        if not connected:
+            return None
+        return cube.to_cube_info(interface)
 
     @async_platform_specified(PlatformParam("Windows", []))
     async def scan_registered_cubes(
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     cache.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Scan cache
+
+Keeps the cubes found by scanning in a JSON file,
+so that known cubes can be connected without scanning again.
+"""
+
+import json
+import os
+import time
+
+from typing_extensions import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from ..device_interface import (
+    AdvertisementData,
+    BLEDevice,
+    CubeInfo,
+    CubeInterface,
+)
+from ..logger import get_toio_logger
+from ..toio_uuid import TOIO_UUID_SERVICE
+
+logger = get_toio_logger(__name__)
+
+SCAN_CACHE_VERSION = 1
+
+
+class CachedCube(NamedTuple):
+    """
+    Cube recorded in ScanCache
+
+    Attributes:
+        address (str): BLE address (upper case)
+        name (Optional[str]): local name
+        rssi (Optional[int]): RSSI when the cube was found last
+        last_seen (float): time.time() when the cube was found last
+    """
+
+    address: str
+    name: Optional[str]
+    rssi: Optional[int]
+    last_seen: float
+
+    def to_cube_info(self, interface: CubeInterface) -> CubeInfo:
+        """
+        Create CubeInfo of this cube
+
+        The advertisement data is reconstructed from the recorded values.
+        """
+        rssi = self.rssi if self.rssi is not None else -127
+        device = BLEDevice(self.address, self.name, None, rssi=rssi)
+        advertisement = AdvertisementData(
+            local_name=self.name,
+            manufacturer_data={},
+            service_data={},
+            service_uuids=[str(TOIO_UUID_SERVICE)],
+            tx_power=None,
+            rssi=rssi,
+            platform_data=(),
+        )
+        return CubeInfo(
+            name=self.name,
+            device=device,
+            interface=interface,
+            advertisement=advertisement,
+        )
+
+
+class ScanCache:
+    """
+    Cache of found cubes keyed by BLE address
+
+    The cache is loaded from `path` when it is created,
+    and saved to `path` when it is updated (updates with `save=False`
+    are saved together by flush() or the next save).
+    A missing or broken file is treated as an empty cache.
+
+    >>> scanner = UniversalBleScanner(cache=ScanCache("cubes.json"))
+    >>> cube_info_list = await scanner.scan_cached(2)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], max_age: Optional[float] = None):
+        """
+        Initialize ScanCache
+
+        Args:
+            path (Union[str, os.PathLike]): path of the JSON file
+            max_age (Optional[float]): cubes not found for max_age second
+                are ignored (None: no limit)
+        """
+        self.path = path
+        self.max_age = max_age
+        self._cubes: Dict[str, CachedCube] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._cubes)
+
+    def __contains__(self, address: str) -> bool:
+        return address.upper() in self._cubes
+
+    def load(self) -> None:
+        """
+        Load the cache from the file
+        """
+        self._cubes = {}
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != SCAN_CACHE_VERSION:
+                logger.warning("scan cache: unknown version: %s", data.get("version"))
+                return
+            for address, value in data["cubes"].items():
+                address = address.upper()
+                self._cubes[address] = CachedCube(
+                    address=address,
+                    name=value.get("name"),
+                    rssi=value.get("rssi"),
+                    last_seen=float(value["last_seen"]),
+                )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("scan cache: failed to load %s: %s", self.path, repr(e))
+            self._cubes = {}
+
+    def save(self) -> None:
+        """
+        Save the cache to the file
+
+        The file is replaced at once, so that it is never left half written.
+        """
+        data = {
+            "version": SCAN_CACHE_VERSION,
+            "cubes": {
+                cube.address: {
+                    "name": cube.name,
+                    "rssi": cube.rssi,
+                    "last_seen": cube.last_seen,
+                }
+                for cube in self._cubes.values()
+            },
+        }
+        tmp_path = str(self.path) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def flush(self) -> None:
+        """
+        Save the cache if it has updates not saved yet
+        """
+        if self._dirty:
+            self.save()
+
+    def get(self, address: str) -> Optional[CachedCube]:
+        """
+        Get the cube specified by BLE address
+
+        Returns:
+            Optional[CachedCube]: None if the cube is not cached or too old
+        """
+        cube = self._cubes.get(address.upper())
+        if cube is None or self._is_expired(cube, time.time()):
+            return None
+        return cube
+
+    def cubes(self) -> List[CachedCube]:
+        """
+        Get cached cubes
+
+        Returns:
+            List[CachedCube]: cubes in order of last seen (newest first)
+        """
+        now = time.time()
+        found = [x for x in self._cubes.values() if not self._is_expired(x, now)]
+        found.sort(key=lambda x: x.last_seen, reverse=True)
+        return found
+
+    def update(self, cube_info_list: Iterable[CubeInfo], save: bool = True) -> None:
+        """
+        Record found cubes and save the cache
+
+        Args:
+            cube_info_list (Iterable[CubeInfo]): found cubes
+            save (bool): save the cache now (False: saved later by flush())
+        """
+        now = time.time()
+        for info in cube_info_list:
+            address = info.device.address.upper()
+            rssi = info.advertisement.rssi
+            cached = self._cubes.get(address)
+            if rssi is None and cached is not None:
+                rssi = cached.rssi
+            self._cubes[address] = CachedCube(
+                address=address,
+                name=info.name if info.name is not None else info.device.name,
+                rssi=rssi,
+                last_seen=now,
+            )
+            self._dirty = True
+        if save:
+            self.flush()
+
+    def remove(self, address: str) -> None:
+        """
+        Remove the cube specified by BLE address and save the cache
+        """
+        if self._cubes.pop(address.upper(), None) is not None:
+            self.save()
+
+    def clear(self) -> None:
+        """
+        Remove all cubes and save the cache
+        """
+        self._cubes = {}
+        self.save()
+
+    def _is_expired(self, cube: CachedCube, now: float) -> bool:
+        return self.max_age is not None and now - cube.last_seen > self.max_age
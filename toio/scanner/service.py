@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#     service.py
+#
+#     Copyright 2024 Sony Interactive Entertainment Inc.
+#
+# ************************************************************
+"""
+Background scanner service
+
+Keeps scanning toio Core Cubes and tracks which cubes are in range.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from bleak import BleakScanner
+from typing_extensions import (
+    Callable,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+    TypeAlias,
+)
+
+from ..device_interface import AdvertisementData, BLEDevice, CubeInfo
+from ..device_interface.ble import (
+    BleCube,
+    CubeFilter,
+    _get_platform_scanner_backend,
+    is_31j,
+    is_toio_cube_advertisement,
+)
+from ..logger import get_toio_logger
+
+logger = get_toio_logger(__name__)
+
+
+class CubePresence:
+    """
+    State of a cube tracked by ScannerService
+
+    Attributes:
+        address (str): BLE address
+        name (Optional[str]): local name
+        rssi (float): exponentially weighted moving average of RSSI
+        last_rssi (Optional[int]): RSSI of the latest advertisement
+        first_seen (float): time.monotonic() when the cube appeared
+        last_seen (float): time.monotonic() when the latest advertisement was received
+        is_31j (bool): True if the cube has the wrong name "31j"
+        present (bool): True while the cube is in range
+    """
+
+    __slots__ = (
+        "address",
+        "name",
+        "rssi",
+        "last_rssi",
+        "first_seen",
+        "last_seen",
+        "is_31j",
+        "present",
+        "device",
+        "advertisement",
+    )
+
+    def __init__(self, device: BLEDevice, advertisement: AdvertisementData, now: float):
+        self.address: str = device.address
+        self.name: Optional[str] = device.name
+        self.last_rssi: Optional[int] = advertisement.rssi
+        self.rssi: float = float(advertisement.rssi or 0)
+        self.first_seen: float = now
+        self.last_seen: float = now
+        self.is_31j: bool = is_31j(device)
+        self.present: bool = True
+        self.device: BLEDevice = device
+        self.advertisement: AdvertisementData = advertisement
+
+    def _update(
+        self,
+        device: BLEDevice,
+        advertisement: AdvertisementData,
+        now: float,
+        alpha: float,
+    ) -> None:
+        if device.name is not None:
+            self.name = device.name
+            self.is_31j = is_31j(device)
+        if advertisement.rssi is not None:
+            if self.last_rssi is None:
+                self.rssi = float(advertisement.rssi)
+            else:
+                self.rssi += alpha * (advertisement.rssi - self.rssi)
+            self.last_rssi = advertisement.rssi
+        self.last_seen = now
+        self.device = device
+        self.advertisement = advertisement
+
+    def to_cube_info(self) -> CubeInfo:
+        """
+        Create CubeInfo to connect to the cube
+
+        A new interface is created for each call.
+        """
+        return CubeInfo(
+            name=self.name,
+            device=self.device,
+            interface=BleCube(self.device),
+            advertisement=self.advertisement,
+        )
+
+    def __str__(self) -> str:
+        return "%s (%s): rssi=%.1f present=%s" % (
+            self.name,
+            self.address,
+            self.rssi,
+            self.present,
+        )
+
+
+PresenceEventType: TypeAlias = Literal["appeared", "disappeared"]
+
+
+class PresenceEvent(NamedTuple):
+    """
+    Event notified by ScannerService
+
+    Attributes:
+        type (PresenceEventType): "appeared" or "disappeared"
+        cube (CubePresence): the cube
+    """
+
+    type: PresenceEventType
+    cube: CubePresence
+
+
+PresenceEventHandler: TypeAlias = Callable[[PresenceEvent], None]
+
+
+class ScannerService:
+    """
+    Scanner which runs in the background and tracks cubes in range
+
+    A cube appears when its first advertisement is received, and
+    disappears when no advertisement is received for `lost_timeout` second.
+    Event handlers are called on each appearance and disappearance.
+
+    >>> async with ScannerService() as service:
+    >>>     presence = await service.wait_for_cube(cube_id="A1b")
+    >>>     if presence is not None:
+    >>>         cube = ToioCoreCube.create(presence.to_cube_info())
+    """
+
+    DEFAULT_LOST_TIMEOUT: float = 5.0
+    DEFAULT_RSSI_ALPHA: float = 0.3
+
+    def __init__(
+        self,
+        cube_id: Optional[Set[str]] = None,
+        address: Optional[Set[str]] = None,
+        lost_timeout: float = DEFAULT_LOST_TIMEOUT,
+        rssi_alpha: float = DEFAULT_RSSI_ALPHA,
+    ):
+        """
+        Initialize ScannerService
+
+        Args:
+            cube_id (Optional[Set[str]]): set of cube id to be tracked (None: all cubes)
+            address (Optional[Set[str]]): set of BLE address to be tracked
+                (None: all cubes)
+            lost_timeout (float): time [s] until a silent cube is treated as disappeared
+            rssi_alpha (float): weight of the latest RSSI in the moving average
+                (0.0 - 1.0)
+        """
+        if not 0.0 < rssi_alpha <= 1.0:
+            raise ValueError("rssi_alpha must be in (0.0, 1.0]: %f" % rssi_alpha)
+        self.cube_filter = CubeFilter(cube_id=cube_id, address=address)
+        self.lost_timeout = lost_timeout
+        self.rssi_alpha = rssi_alpha
+        self._cubes: Dict[str, CubePresence] = {}
+        self._event_handlers: List[PresenceEventHandler] = []
+        self._changed = asyncio.Event()
+        self._scanner: Optional[BleakScanner] = None
+        self._watchdog: Optional[asyncio.Task] = None
+        self._w31j = False
+
+    async def __aenter__(self) -> ScannerService:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._scanner is not None
+
+    async def start(self) -> None:
+        """
+        Start scanning
+        """
+        if self._scanner is not None:
+            return
+        scanner = BleakScanner(
+            detection_callback=self._on_detection,
+            backend=_get_platform_scanner_backend(),
+        )
+        await scanner.start()
+        self._scanner = scanner
+        self._watchdog = asyncio.ensure_future(self._watch_lost_cubes())
+
+    async def stop(self) -> None:
+        """
+        Stop scanning
+
+        The tracked cubes are kept. Cubes in range are not reported as
+        disappeared until scanning is started again.
+        """
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+        if self._scanner is not None:
+            scanner = self._scanner
+            self._scanner = None
+            await scanner.stop()
+
+    def register_event_handler(self, handler: PresenceEventHandler) -> None:
+        """
+        Register a function called on appearance and disappearance of cubes
+        """
+        self._event_handlers.append(handler)
+
+    def unregister_event_handler(self, handler: PresenceEventHandler) -> None:
+        """
+        Unregister an event handler function
+        """
+        if handler in self._event_handlers:
+            self._event_handlers.remove(handler)
+
+    def cubes(self) -> List[CubePresence]:
+        """
+        Get cubes in range
+
+        Returns:
+            List[CubePresence]: cubes in order of RSSI (strongest first)
+        """
+        present = [x for x in self._cubes.values() if x.present]
+        present.sort(key=lambda x: x.rssi, reverse=True)
+        return present
+
+    def get(self, address: str) -> Optional[CubePresence]:
+        """
+        Get the cube specified by BLE address
+
+        Returns:
+            Optional[CubePresence]: None if the cube has never been found
+        """
+        return self._cubes.get(address.upper())
+
+    def find(
+        self, cube_id: Optional[str] = None, address: Optional[str] = None
+    ) -> Optional[CubePresence]:
+        """
+        Find a cube in range
+
+        Args:
+            cube_id (Optional[str]): cube id included in the local name
+            address (Optional[str]): BLE address
+
+        Returns:
+            Optional[CubePresence]: the cube with the strongest RSSI, or None
+        """
+        for cube in self.cubes():
+            if address is not None and cube.address != address.upper():
+                continue
+            if cube_id is not None and (cube.name is None or cube_id not in cube.name):
+                continue
+            return cube
+        return None
+
+    async def wait_for_cube(
+        self,
+        cube_id: Optional[str] = None,
+        address: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[CubePresence]:
+        """
+        Wait until a cube is in range
+
+        If the cube is already in range, this function returns immediately.
+
+        Args:
+            cube_id (Optional[str]): cube id included in the local name
+            address (Optional[str]): BLE address
+            timeout (Optional[float]): timeout [s] (None: wait forever)
+
+        Returns:
+            Optional[CubePresence]: None if timed out
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            cube = self.find(cube_id, address)
+            if cube is not None:
+                return cube
+            self._changed.clear()
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0.0:
+                return None
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    def _on_detection(
+        self, device: BLEDevice, advertisement: AdvertisementData
+    ) -> None:
+        if not is_toio_cube_advertisement(advertisement):
+            return
+        now = time.monotonic()
+        address = device.address.upper()
+        cube = self._cubes.get(address)
+        if cube is None:
+            if not self.cube_filter.match(device):
+                return
+            cube = CubePresence(device, advertisement, now)
+            cube.address = address
+            self._cubes[address] = cube
+            self._emit(PresenceEvent("appeared", cube))
+        else:
+            cube._update(device, advertisement, now, self.rssi_alpha)
+            if not cube.present:
+                cube.present = True
+                cube.first_seen = now
+                self._emit(PresenceEvent("appeared", cube))
+        if cube.is_31j and not self._w31j:
+            logger.warning(
+                "warning: scanner: cube_id '31j' is found. "
+                "Why not turn all cubes off and back again?"
+            )
+            self._w31j = True
+
+    def _check_lost_cubes(self, now: float) -> None:
+        for cube in self._cubes.values():
+            if cube.present and now - cube.last_seen > self.lost_timeout:
+                cube.present = False
+                self._emit(PresenceEvent("disappeared", cube))
+
+    async def _watch_lost_cubes(self) -> None:
+        interval = max(0.05, self.lost_timeout / 4)
+        while True:
+            await asyncio.sleep(interval)
+            self._check_lost_cubes(time.monotonic())
+
+    def _emit(self, event: PresenceEvent) -> None:
+        logger.debug("scanner service: %s: %s", event.type, str(event.cube))
+        self._changed.set()
+        for handler in tuple(self._event_handlers):
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("presence event handler raised an exception")